@@ -0,0 +1,30 @@
+"""
+One item inserted near the front of a long ordered list: positional zip vs. list_diff="align".
+
+    PYTHONPATH=. python benchmarks/bench_alignment.py
+"""
+import time
+
+from pydiction import Contains, Matcher
+
+N = 100_000
+EXPECTED = [{"id": i, "name": f"item-{i}", "tags": ["a", "b"]} for i in range(N)]
+ACTUAL = EXPECTED[:10] + [{"id": "new", "name": "new", "tags": []}] + EXPECTED[10:]
+EXPECTED_OPERATORS = [Contains({"id": i}) for i in range(N)]
+
+
+def timed(label, matcher, expected):
+    start = time.perf_counter()
+    errors = matcher.match(ACTUAL, expected, [])
+    print(f"{label:<30} {(time.perf_counter() - start) * 1e3:8.2f} ms, {len(errors)} errors")
+
+
+def main():
+    timed("zip", Matcher(), EXPECTED)
+    timed("align", Matcher(list_diff="align"), EXPECTED)
+    timed("zip (operators)", Matcher(), EXPECTED_OPERATORS)
+    timed("align (operators)", Matcher(list_diff="align"), EXPECTED_OPERATORS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Re-validating an unchanged fixture: Matcher.match vs. a warm MatchCache, for the value and for the file.
+
+    PYTHONPATH=. python benchmarks/bench_cache.py
+"""
+import json
+import os
+import tempfile
+import time
+
+from pydiction import ANY_NOT_NONE, Contains, Each, Matcher
+from pydiction.cache import MatchCache
+
+N = 20
+FIXTURE = {"items": [{"id": i, "name": f"item-{i}", "tags": ["a", "b"], "price": i * 1.5} for i in range(20_000)]}
+EXPECTED = {"items": Each(Contains({"id": ANY_NOT_NONE, "name": str, "tags": Each(str)}))}
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    for _ in range(N):
+        func()
+    print(f"{label:<25} {(time.perf_counter() - start) * 1e3 / N:8.2f} ms per match")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "fixture.json")
+        with open(path, "w") as fp:
+            json.dump(FIXTURE, fp)
+
+        matcher = Matcher()
+        timed("Matcher.match", lambda: matcher.match(FIXTURE, EXPECTED, []))
+        with MatchCache(os.path.join(directory, "cache")) as cache:
+            cache.match(FIXTURE, EXPECTED)
+            timed("MatchCache.match", lambda: cache.match(FIXTURE, EXPECTED))
+            cache.match_file(path, EXPECTED)
+            timed("MatchCache.match_file", lambda: cache.match_file(path, EXPECTED))
+            print(cache.stats)
+
+
+if __name__ == "__main__":
+    main()
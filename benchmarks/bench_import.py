@@ -0,0 +1,37 @@
+"""
+Cold import time of pydiction, measured in fresh interpreters against the bare interpreter start-up.
+
+    PYTHONPATH=. python benchmarks/bench_import.py
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+REPEAT = 20
+HEAVY_MODULES = ("unittest", "unittest.mock", "asyncio", "inspect", "dataclasses")
+
+
+def run(code: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    baseline = statistics.median(run("pass") for _ in range(REPEAT))
+    for label, code in (("import pydiction", "import pydiction"), ("import unittest.mock", "import unittest.mock")):
+        total = statistics.median(run(code) for _ in range(REPEAT))
+        print(f"{label:<25} {(total - baseline) * 1e3:8.2f} ms over interpreter start-up")
+
+    loaded = subprocess.run(
+        [sys.executable, "-c", f"import sys, pydiction; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+    print(f"{'heavy modules loaded':<25} {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Repeated "contains anywhere" queries on one large document: scanning every subtree per query vs. a DocumentIndex
+built once.
+
+    PYTHONPATH=. python benchmarks/bench_index.py
+"""
+import time
+
+from pydiction import Contains, DocumentIndex, Matcher
+
+N = 50_000
+QUERIES = [{"level": "error", "code": 500 + i} for i in range(20)]
+DOCUMENT = {
+    "events": [
+        {"level": "error" if i % 10 == 0 else "info", "code": i % 600, "request": {"path": f"/items/{i}"}}
+        for i in range(N)
+    ]
+}
+
+
+def scan(document, pattern, matcher):
+    found = []
+    stack = [([], document)]
+    while stack:
+        path, node = stack.pop()
+        if next(Contains(pattern, recursive=True).match(node, path, matcher), None) is None:
+            found.append(path)
+        children = node.items() if isinstance(node, dict) else enumerate(node)
+        stack.extend((path + [key], value) for key, value in children if isinstance(value, (dict, list)))
+    return found
+
+
+def main():
+    matcher = Matcher()
+
+    start = time.perf_counter()
+    for pattern in QUERIES:
+        scan(DOCUMENT, pattern, matcher)
+    print(f"{'scan per query':<25} {(time.perf_counter() - start) * 1e3:8.2f} ms for {len(QUERIES)} queries")
+
+    start = time.perf_counter()
+    index = DocumentIndex(DOCUMENT)
+    built = time.perf_counter()
+    for pattern in QUERIES:
+        matcher.find(index, pattern)
+    done = time.perf_counter()
+    print(f"{'index build':<25} {(built - start) * 1e3:8.2f} ms")
+    print(f"{'indexed queries':<25} {(done - built) * 1e3:8.2f} ms for {len(QUERIES)} queries")
+
+
+if __name__ == "__main__":
+    main()
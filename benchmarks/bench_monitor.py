@@ -0,0 +1,32 @@
+"""
+Cost of ContractMonitor.submit on the request path.
+
+    PYTHONPATH=. python benchmarks/bench_monitor.py
+"""
+import timeit
+
+from pydiction import ANY_NOT_NONE
+from pydiction.monitor import DROP_OLDEST, ContractMonitor
+
+PAYLOAD = {"id": 1, "name": "John", "tags": ["a", "b"]}
+TEMPLATE = {"id": ANY_NOT_NONE, "name": ANY_NOT_NONE, "tags": ANY_NOT_NONE}
+N = 200_000
+
+
+def bench(label, monitor, number=N):
+    monitor.register("user", TEMPLATE)
+    total = min(timeit.repeat(lambda: monitor.submit("user", PAYLOAD), number=number, repeat=5))
+    print(f"{label:<40} {total / number * 1e6:8.3f} µs/submit")
+
+
+def main():
+    # workers are not started so the queue behaviour is deterministic
+    bench("sampled in, queue not full", ContractMonitor(maxsize=N * 5 + 1))
+    bench("sampled out (sample_rate=0.0)", ContractMonitor(sample_rate=0.0))
+    bench("sample_rate=0.01", ContractMonitor(maxsize=N * 5 + 1, sample_rate=0.01))
+    bench("queue full, drop_newest", ContractMonitor(maxsize=1))
+    bench("queue full, drop_oldest", ContractMonitor(maxsize=1, drop_policy=DROP_OLDEST))
+
+
+if __name__ == "__main__":
+    main()
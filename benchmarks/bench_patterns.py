@@ -0,0 +1,26 @@
+"""
+Checking a large list of strings with a regex lambda per element vs. Each(Matches(...)).
+
+    PYTHONPATH=. python benchmarks/bench_patterns.py
+"""
+import re
+import timeit
+
+from pydiction import Each, Matcher, Matches
+
+N = 100_000
+VALUES = [f"user-{i}" for i in range(N)]
+
+
+def main():
+    matcher = Matcher()
+    per_element = [lambda x: re.match(r"user-\d+", x)] * N
+    batched = Each(Matches(r"user-\d+"))
+
+    for label, expected in (("lambda per element", per_element), ("Each(Matches(...))", batched)):
+        total = min(timeit.repeat(lambda: matcher.match(VALUES, expected, []), number=1, repeat=5))
+        print(f"{label:<25} {total * 1e3:8.2f} ms for {N} strings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Validating payloads against a JSON Schema and diffing them: a validator pass followed by a pydiction match, vs. one
+match against the compiled schema. Uses ``jsonschema`` for the validator pass when it is installed, a minimal
+recursive validator otherwise.
+
+    PYTHONPATH=. python benchmarks/bench_schema.py
+"""
+import re
+import timeit
+
+from pydiction import ANY_NOT_NONE, Contains, Matcher
+from pydiction.schema import compile_schema
+
+N = 5_000
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer", "minimum": 1},
+        "name": {"type": "string", "pattern": "^[a-z]+$"},
+        "role": {"enum": ["admin", "user"]},
+        "tags": {"type": "array", "items": {"type": "string"}},
+        "address": {"type": "object", "properties": {"city": {"type": "string"}}, "required": ["city"]},
+    },
+    "required": ["id", "name", "role", "tags", "address"],
+}
+TEMPLATE = Contains(
+    {"id": ANY_NOT_NONE, "name": ANY_NOT_NONE, "role": ANY_NOT_NONE, "tags": ANY_NOT_NONE, "address": ANY_NOT_NONE}
+)
+PAYLOADS = [
+    {"id": i + 1, "name": "user", "role": "user", "tags": ["a", "b", "c"], "address": {"city": "Paris"}}
+    for i in range(N)
+]
+
+TYPES = {"object": dict, "array": list, "string": str, "integer": int}
+
+
+def minimal_validate(instance, schema):
+    if "type" in schema and not isinstance(instance, TYPES[schema["type"]]):
+        raise ValueError("type")
+    if "minimum" in schema and instance < schema["minimum"]:
+        raise ValueError("minimum")
+    if "pattern" in schema and not re.search(schema["pattern"], instance):
+        raise ValueError("pattern")
+    if "enum" in schema and instance not in schema["enum"]:
+        raise ValueError("enum")
+    for key in schema.get("required", []):
+        if key not in instance:
+            raise ValueError("required")
+    for key, sub_schema in schema.get("properties", {}).items():
+        if key in instance:
+            minimal_validate(instance[key], sub_schema)
+    if "items" in schema:
+        for item in instance:
+            minimal_validate(item, schema["items"])
+
+
+try:
+    import jsonschema
+
+    validate = jsonschema.Draft202012Validator(SCHEMA).validate
+    VALIDATOR = "jsonschema"
+except ImportError:
+
+    def validate(instance):
+        minimal_validate(instance, SCHEMA)
+
+    VALIDATOR = "minimal validator"
+
+
+def main():
+    matcher = Matcher()
+    plan = compile_schema(SCHEMA)
+
+    def two_pass():
+        for payload in PAYLOADS:
+            validate(payload)
+            matcher.match(payload, TEMPLATE, [])
+
+    def compiled():
+        for payload in PAYLOADS:
+            matcher.match(payload, plan, [])
+
+    for label, run in ((f"{VALIDATOR} + match", two_pass), ("compiled schema match", compiled)):
+        total = min(timeit.repeat(run, number=1, repeat=5))
+        print(f"{label:<30} {total * 1e3:8.2f} ms for {N} payloads")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Routing payloads to the templates they match: get_declarative_diff against every template vs. a TemplateSet.
+
+    PYTHONPATH=. python benchmarks/bench_templates.py
+"""
+import random
+import time
+
+from pydiction import ANY_NOT_NONE, Contains, Matcher
+from pydiction.templates import TemplateSet
+
+N = 2_000
+TEMPLATES = {}
+for i in range(100):
+    TEMPLATES[f"event-{i}"] = {"type": f"event-{i}", "version": 1, "data": {"id": ANY_NOT_NONE}}
+    TEMPLATES[f"event-{i}/any"] = Contains({"type": f"event-{i}"})
+RNG = random.Random(0)
+PAYLOADS = [{"type": f"event-{RNG.randrange(120)}", "version": 1, "data": {"id": i}} for i in range(N)]
+
+
+def main():
+    matcher = Matcher()
+    start = time.perf_counter()
+    for payload in PAYLOADS:
+        [name for name, expected in TEMPLATES.items() if not matcher.get_declarative_diff(payload, expected)]
+    print(f"{'diff per template':<25} {(time.perf_counter() - start) * 1e3:8.2f} ms for {N} payloads")
+
+    template_set = TemplateSet(matcher)
+    for name, expected in TEMPLATES.items():
+        template_set.register(name, expected)
+    start = time.perf_counter()
+    for payload in PAYLOADS:
+        template_set.match(payload)
+    print(f"{'TemplateSet.match':<25} {(time.perf_counter() - start) * 1e3:8.2f} ms for {N} payloads")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,53 @@
-from .core import Contains, DoesntContains, Matcher
-from .operators import ANY, ANY_NOT_NONE, Expect, ExpectNot
+from .core import AllOf, Contains, DoesntContains, Each, KeyedList, Matcher, register_comparator
+from .index import ContainsAnywhere, DocumentIndex
+from .operators import ANY, ANY_NOT_NONE, Expect, ExpectNot, Length, Matches, OneOf, StartsWith
 
 __version__ = "0.1.0"
-__all__ = ["ANY", "ANY_NOT_NONE", "Matcher", "Contains", "DoesntContains", "Expect", "ExpectNot"]
+
+# optional features, imported on first access to keep ``import pydiction`` cheap
+_LAZY_ATTRIBUTES = {
+    "ContractMonitor": "pydiction.monitor",
+    "DiffWriter": "pydiction.serialization",
+    "LazyJSONFile": "pydiction.lazy_json",
+    "MatchSession": "pydiction.session",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+__all__ = [
+    "ANY",
+    "ANY_NOT_NONE",
+    "Matcher",
+    "AllOf",
+    "Contains",
+    "ContainsAnywhere",
+    "DocumentIndex",
+    "DoesntContains",
+    "Each",
+    "KeyedList",
+    "Expect",
+    "ExpectNot",
+    "Length",
+    "Matches",
+    "OneOf",
+    "StartsWith",
+    "register_comparator",
+    "ContractMonitor",
+    "DiffWriter",
+    "LazyJSONFile",
+    "MatchSession",
+]
@@ -0,0 +1,91 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pydiction.utils import KeyIndex, PathIndex, format_path
+
+WILDCARD = "*"
+
+
+def normalize_path(path: Sequence) -> Tuple[tuple, tuple]:
+    """
+    split a path into its pattern (list indices and identity keys replaced with ``*``) and the indices or keys
+    that were replaced. only ``PathIndex`` and ``KeyIndex`` parts are replaced, dict keys made of digits are kept.
+    """
+    pattern = []
+    indices = []
+    for part in path:
+        if isinstance(part, PathIndex):
+            pattern.append(WILDCARD)
+            indices.append(int(part))
+        elif isinstance(part, KeyIndex):
+            pattern.append(KeyIndex(part.name, WILDCARD))
+            indices.append(part.value)
+        else:
+            pattern.append(part)
+    return tuple(pattern), tuple(indices)
+
+
+class ErrorGroup:
+    __slots__ = ("pattern", "message", "count", "examples", "samples")
+
+    def __init__(self, pattern: tuple, message: str):
+        self.pattern = pattern
+        self.message = message
+        self.count = 0
+        self.examples: List[tuple] = []
+        self.samples: List[Tuple[Any, Any]] = []
+
+    @property
+    def path(self) -> str:
+        return format_path(self.pattern)
+
+    def __repr__(self):  # pragma: no cover
+        return f"<ErrorGroup: {self.path} {self.message!r} x{self.count}>"
+
+    def __str__(self):
+        actual, expected = self.samples[0] if self.samples else (None, None)
+        summary = f"{self.count} occurrences"
+        if any(self.examples):
+            summary += ", e.g. indices " + ", ".join(str(list(indices)) for indices in self.examples)
+        return f"{(self.path, self.message, actual, expected)} [{summary}]"
+
+
+class ErrorAggregator:
+    """
+    group match errors by normalized path and message in a single pass.
+
+    memory is bounded by ``max_groups`` groups of at most ``max_examples`` index tuples and ``max_samples``
+    (actual, expected) pairs each; errors that would open a new group past the limit are only counted in
+    ``overflow``.
+    """
+
+    def __init__(self, *, max_examples: int = 3, max_samples: int = 3, max_groups: int = 1000):
+        self.max_examples = max_examples
+        self.max_samples = max_samples
+        self.max_groups = max_groups
+        self.overflow = 0
+        self._groups: Dict[Tuple[tuple, str], ErrorGroup] = {}
+
+    def add(self, error: Tuple[Sequence, str, Any, Any]) -> None:
+        path, message, actual, expected = error
+        pattern, indices = normalize_path(path)
+        group: Optional[ErrorGroup] = self._groups.get((pattern, message))
+        if group is None:
+            if len(self._groups) >= self.max_groups:
+                self.overflow += 1
+                return
+            group = self._groups[(pattern, message)] = ErrorGroup(pattern, message)
+
+        group.count += 1
+        if len(group.examples) < self.max_examples:
+            group.examples.append(indices)
+        if len(group.samples) < self.max_samples:
+            group.samples.append((actual, expected))
+
+    def extend(self, errors: Iterable[Tuple[Sequence, str, Any, Any]]) -> "ErrorAggregator":
+        for error in errors:
+            self.add(error)
+        return self
+
+    @property
+    def groups(self) -> List[ErrorGroup]:
+        return list(self._groups.values())
@@ -0,0 +1,150 @@
+"""
+ordered list diff by alignment, used by ``Matcher(list_diff="align")``.
+
+the lists are aligned with Myers' O(ND) diff, after trimming their common prefix and suffix, so an item inserted near
+the front of a long list is one error instead of a mismatch at every following index. equal items (``==``, compared
+natively) are aligned without being walked; unequal containers, operators and other objects are aligned when a full
+match of the pair finds no error. unaligned runs of items form hunks: the pairs of a ``change`` hunk are matched
+position by position, the remaining items are reported as ``not expected`` (actual items, at their actual index) or
+``not found`` (expected items, at their expected index).
+"""
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from pydiction.core import NOT_SET, Matcher
+from pydiction.utils import PathIndex, is_literal
+
+# past this many inserted and deleted items the lists are compared position by position, in one change hunk
+MAX_EDIT_DISTANCE = 1000
+
+
+class Hunk(NamedTuple):
+    """the items ``actual[actual_start:actual_end]`` stand where ``expected[expected_start:expected_end]`` were"""
+
+    actual_start: int
+    actual_end: int
+    expected_start: int
+    expected_end: int
+
+    @property
+    def kind(self) -> str:
+        if self.actual_start == self.actual_end:
+            return "delete"
+        if self.expected_start == self.expected_end:
+            return "insert"
+        return "change"
+
+
+def _myers(n: int, m: int, eq: Callable[[int, int], bool], max_distance: int) -> Optional[List[Tuple[int, int]]]:
+    """the aligned (x, y) pairs of a shortest edit script, None past ``max_distance`` edits"""
+    v = {1: 0}
+    trace = []
+    for d in range(min(n + m, max_distance) + 1):
+        trace.append(dict(v))
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and eq(x, y):
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(trace: List[Dict[int, int]], x: int, y: int) -> List[Tuple[int, int]]:
+    pairs = []
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        previous_k = k + 1 if k == -d or (k != d and v[k - 1] < v[k + 1]) else k - 1
+        previous_x = v[previous_k]
+        previous_y = previous_x - previous_k
+        while x > previous_x and y > previous_y:
+            x -= 1
+            y -= 1
+            pairs.append((x, y))
+        x, y = previous_x, previous_y
+    pairs.reverse()
+    return pairs
+
+
+def align(
+    actual: Sequence[Any],
+    expected: Sequence[Any],
+    matcher: Optional[Matcher] = None,
+    *,
+    strict_keys=True,
+    check_order=True,
+    max_distance: int = MAX_EDIT_DISTANCE,
+) -> List[Hunk]:
+    """the hunks where ``actual`` differs from ``expected``, the items in between match"""
+    matcher = matcher or Matcher()
+    matched: Dict[Tuple[int, int], bool] = {}
+
+    def eq(i: int, j: int) -> bool:
+        actual_item, expected_item = actual[i], expected[j]
+        if actual_item == expected_item:
+            return True
+        if is_literal(actual_item) and is_literal(expected_item):
+            return False
+        # operators, and containers the matcher may compare more loosely (lists inside dicts are unordered)
+        result = matched.get((i, j))
+        if result is None:
+            options = {"strict_keys": strict_keys, "check_order": check_order}
+            errors = matcher.iter_match(actual_item, expected_item, [], **options)
+            result = matched[(i, j)] = next(errors, None) is None
+        return result
+
+    start, actual_end, expected_end = 0, len(actual), len(expected)
+    while start < actual_end and start < expected_end and eq(start, start):
+        start += 1
+    while actual_end > start and expected_end > start and eq(actual_end - 1, expected_end - 1):
+        actual_end -= 1
+        expected_end -= 1
+
+    pairs = _myers(
+        actual_end - start, expected_end - start, lambda x, y: eq(start + x, start + y), max_distance=max_distance
+    )
+    if pairs is None:
+        # too far apart for the alignment to pay off
+        return [Hunk(start, actual_end, start, expected_end)] if start < max(actual_end, expected_end) else []
+
+    hunks = []
+    i = j = start
+    for x, y in pairs:
+        if x + start > i or y + start > j:
+            hunks.append(Hunk(i, x + start, j, y + start))
+        i, j = x + start + 1, y + start + 1
+    if i < actual_end or j < expected_end:
+        hunks.append(Hunk(i, actual_end, j, expected_end))
+    return hunks
+
+
+def aligned_errors(
+    matcher: Matcher,
+    actual: Sequence[Any],
+    expected: Sequence[Any],
+    path: List[Any],
+    *,
+    strict_keys=True,
+    check_order=True,
+) -> Iterator[Tuple[Sequence, str, Any, Any]]:
+    for hunk in align(actual, expected, matcher, strict_keys=strict_keys, check_order=check_order):
+        pairs = min(hunk.actual_end - hunk.actual_start, hunk.expected_end - hunk.expected_start)
+        for offset in range(pairs):
+            i = hunk.actual_start + offset
+            yield from matcher.iter_match(
+                actual[i],
+                expected[hunk.expected_start + offset],
+                path + [PathIndex(i)],
+                strict_keys=strict_keys,
+                check_order=check_order,
+            )
+        for i in range(hunk.actual_start + pairs, hunk.actual_end):
+            yield path + [PathIndex(i)], "not expected", actual[i], NOT_SET
+        for j in range(hunk.expected_start + pairs, hunk.expected_end):
+            yield path + [PathIndex(j)], "not found", NOT_SET, expected[j]
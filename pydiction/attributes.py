@@ -0,0 +1,112 @@
+import sys
+import sysconfig
+from abc import ABCMeta
+from collections.abc import Mapping, Sequence, Set
+from typing import Any, Dict, Iterator, Optional
+
+# class -> {field name: attribute name}, or None when the class isn't matched field by field
+_FIELDS: Dict[type, Optional[Dict[str, str]]] = {}
+
+
+def _is_stdlib(cls: type) -> bool:
+    package = cls.__module__.partition(".")[0]
+    names = getattr(sys, "stdlib_module_names", None)
+    if names is not None:
+        return package in names or package == "builtins"
+    module = sys.modules.get(package)
+    filename = getattr(module, "__file__", None)
+    return filename is None or filename.startswith(sysconfig.get_paths()["stdlib"])
+
+
+def _slot_names(cls: type) -> Optional[Dict[str, str]]:
+    if issubclass(cls, (Mapping, Sequence, Set)):
+        return None
+    fields: Dict[str, str] = {}
+    for klass in reversed(cls.__mro__[:-1]):
+        if "__slots__" not in vars(klass) or _is_stdlib(klass):
+            # instances have a __dict__ (no fixed set of fields), or a stdlib value type (UUID, Fraction, paths)
+            # whose slots are its internal state
+            return None
+        slots = getattr(klass, "__slots__")
+        for name in [slots] if isinstance(slots, str) else slots:
+            if name in ("__dict__", "__weakref__"):
+                continue
+            if name.startswith("__") and not name.endswith("__"):
+                fields[name] = f"_{klass.__name__.lstrip('_')}{name}"
+            else:
+                fields[name] = name
+    if all(name.startswith("_") for name in fields):
+        # only internal state, not a record
+        return None
+    return fields
+
+
+def _find_fields(cls: type) -> Optional[Dict[str, str]]:
+    if hasattr(cls, "__dataclass_fields__"):
+        # only loaded once a dataclass exists, importing it upfront would pull in ``inspect``
+        import dataclasses
+
+        return {field.name: field.name for field in dataclasses.fields(cls)}
+    if issubclass(cls, tuple) and hasattr(cls, "_fields"):
+        return {name: name for name in cls._fields}
+    attrs_fields = getattr(cls, "__attrs_attrs__", None)
+    if attrs_fields is not None:
+        return {field.name: field.name for field in attrs_fields}
+    return _slot_names(cls)
+
+
+def fields_of(cls: type) -> Optional[Dict[str, str]]:
+    """the fields of a dataclass, namedtuple, attrs or ``__slots__`` class, resolved once per class"""
+    try:
+        return _FIELDS[cls]
+    except KeyError:
+        fields = _FIELDS[cls] = _find_fields(cls)
+        return fields
+
+
+def has_fields(value: Any) -> bool:
+    return fields_of(type(value)) is not None
+
+
+class FieldsObject(metaclass=ABCMeta):
+    """virtual base class of the types matched field by field, so comparators can be registered for them"""
+
+    @classmethod
+    def __subclasshook__(cls, subclass):
+        return True if fields_of(subclass) is not None else NotImplemented
+
+
+class AttributeView(Mapping):
+    """a read-only mapping over an object's fields, unset fields are missing keys"""
+
+    __slots__ = ("obj", "fields")
+
+    def __init__(self, obj: Any):
+        self.obj = obj
+        self.fields = fields_of(type(obj)) or {}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self.obj, self.fields[key])
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: object) -> bool:
+        attribute = self.fields.get(key)  # type: ignore[call-overload]
+        return attribute is not None and hasattr(self.obj, attribute)
+
+    def __iter__(self) -> Iterator[str]:
+        for key, attribute in self.fields.items():
+            if hasattr(self.obj, attribute):
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"<AttributeView of {self.obj!r}>"
+
+
+def as_mapping(value: Any) -> Any:
+    """wrap objects matched field by field in an ``AttributeView``, return anything else unchanged"""
+    return AttributeView(value) if fields_of(type(value)) is not None else value
@@ -0,0 +1,127 @@
+import itertools
+import time
+from typing import Any, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from pydiction.core import LIST_DIFF_ZIP, Matcher, _current_matcher
+from pydiction.dispatch import ComparatorRegistry
+
+MAX_NODES = "max_nodes"
+MAX_TIME = "max_time"
+MAX_UNORDERED_LENGTH = "max_unordered_length"
+MAX_ERRORS = "max_errors"
+
+# how many nodes are spent between two clock reads
+_CLOCK_INTERVAL = 64
+
+
+class Budget(NamedTuple):
+    """limits of one match, ``None`` for no limit. ``max_time`` is in seconds"""
+
+    max_nodes: Optional[int] = None
+    max_time: Optional[float] = None
+    max_unordered_length: Optional[int] = None
+    max_errors: Optional[int] = None
+
+
+class BudgetUsage(NamedTuple):
+    nodes: int
+    seconds: float
+    errors: int
+    exhausted: Optional[str] = None
+
+
+class MatchResult(NamedTuple):
+    """the errors found, whether the match ran to the end, and how much of the budget it used"""
+
+    errors: List[Tuple[Sequence, str, Any, Any]]
+    complete: bool
+    usage: BudgetUsage
+
+
+class BudgetExhausted(Exception):
+    def __init__(self, limit: str):
+        super().__init__(f"{limit} budget exhausted")
+        self.limit = limit
+
+
+class BudgetedMatcher(Matcher):
+    """
+    a matcher that stops once a ``Budget`` runs out, see ``Matcher.match_with_budget``.
+
+    every value compared counts as a node, and so does every value checked by an operator (see ``Matcher.visit``)
+    and every permutation tried by an unordered list comparison.
+    unordered lists longer than ``max_unordered_length`` are skipped and the rest of the match goes on; the other
+    limits stop the match. either way the result is marked incomplete.
+    """
+
+    def __init__(self, budget: Budget, registry: Optional[ComparatorRegistry] = None, *, list_diff=LIST_DIFF_ZIP):
+        super().__init__(registry, list_diff=list_diff)
+        self.budget = budget
+        self.nodes = 0
+        self.skipped: List[Sequence] = []
+        self._deadline: Optional[float] = None
+        self._next_clock = _CLOCK_INTERVAL
+
+    def _spend(self, nodes: int = 1) -> None:
+        self.nodes += nodes
+        if self.budget.max_nodes is not None and self.nodes > self.budget.max_nodes:
+            raise BudgetExhausted(MAX_NODES)
+        if self._deadline is not None and self.nodes >= self._next_clock:
+            self._next_clock = self.nodes + _CLOCK_INTERVAL
+            if time.perf_counter() > self._deadline:
+                raise BudgetExhausted(MAX_TIME)
+
+    def visit(self, nodes: int = 1) -> None:
+        self._spend(nodes)
+
+    def iter_match(  # type: ignore[override]
+        self, actual: Any, expected: Any, path: List[str], *, strict_keys=True, check_order=True
+    ) -> Iterator[Tuple[Sequence, str, Any, Any]]:
+        self._spend()
+        return super().iter_match(actual, expected, path, strict_keys=strict_keys, check_order=check_order)
+
+    def _compare_lists(
+        self, actual: Sequence[Any], expected: List[Any], path: List[str], *, strict_keys=True, check_order=True
+    ) -> Iterator[Tuple[Sequence, str, Any, Any]]:
+        if check_order:
+            yield from super()._compare_lists(actual, expected, path, strict_keys=strict_keys, check_order=True)
+            return
+
+        limit = self.budget.max_unordered_length
+        if limit is not None and max(len(actual), len(expected)) > limit:
+            self.skipped.append(path)
+            return
+        if len(actual) != len(expected):
+            yield path, "Lists have different lengths", len(actual), len(expected)
+        for perm in itertools.permutations(actual):
+            self._spend()
+            if list(perm) == expected:
+                return
+        if actual != expected:
+            yield path, "different elements (ignoring order)", actual, expected
+
+    def run(self, actual: Any, expected: Any, *, strict_keys=True, check_order=True) -> MatchResult:
+        start = time.perf_counter()
+        if self.budget.max_time is not None:
+            self._deadline = start + self.budget.max_time
+        max_errors = self.budget.max_errors
+
+        errors: List[Tuple[Sequence, str, Any, Any]] = []
+        exhausted: Optional[str] = None
+        # operators comparing with ``==`` (``Contains.__eq__``) match with this matcher too
+        token = _current_matcher.set(self)
+        try:
+            for error in self.iter_match(actual, expected, [], strict_keys=strict_keys, check_order=check_order):
+                if max_errors is not None and len(errors) >= max_errors:
+                    exhausted = MAX_ERRORS
+                    break
+                errors.append(error)
+        except BudgetExhausted as e:
+            exhausted = e.limit
+        finally:
+            _current_matcher.reset(token)
+        if exhausted is None and self.skipped:
+            exhausted = MAX_UNORDERED_LENGTH
+
+        usage = BudgetUsage(self.nodes, time.perf_counter() - start, len(errors), exhausted)
+        return MatchResult(errors, exhausted is None, usage)
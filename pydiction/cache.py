@@ -0,0 +1,390 @@
+"""
+a persistent cache of match results, so unchanged (actual, expected) pairs skip the match across runs.
+
+results are stored in SQLite (WAL mode, so pytest-xdist workers and other processes can share one directory) under a
+key made of a hash of the actual value's JSON form and a fingerprint of the expected template, the match options and
+the matcher's comparators. the fingerprint follows operators into their state and the code of their classes, of
+predicates and of comparators, so editing any of them invalidates the entries using it. globals referenced by that
+code are not followed.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import types
+import weakref
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+# registers its comparators on the default registry, which is part of the fingerprint: import it up front so the
+# fingerprint doesn't depend on whether it was imported yet
+import pydiction.lazy_json  # noqa: F401
+from pydiction.core import Matcher
+from pydiction.dispatch import ComparatorRegistry
+from pydiction.serialization import DiffRecord, decode_error, encode_error
+from pydiction.utils import is_literal
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DATABASE_NAME = "pydiction-cache.sqlite3"
+
+# bump when the stored format or the fingerprint changes
+_CACHE_VERSION = b"1"
+
+# eviction frees entries down to this share of max_bytes, so it doesn't run on every write
+_LOW_WATERMARK = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    errors TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+_FUNCTIONS = (types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+_CONSTANTS = (str, bytes, int, float, complex, bool, type(None), type(Ellipsis))
+
+# the digests of the classes hashed so far, classes are hashed once per process
+_CLASS_DIGESTS: "weakref.WeakKeyDictionary[type, bytes]" = weakref.WeakKeyDictionary()
+_CLASS_LOCK = threading.RLock()
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    bypassed: int
+    evictions: int
+    entries: int
+    size: int
+
+
+class Fingerprint:
+    """a stable hash of a template, the same across processes as long as the template and its code don't change"""
+
+    def __init__(self):
+        self._hash = hashlib.blake2b(digest_size=20)
+        self._active: Set[int] = set()
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+    def _token(self, tag: bytes, data: bytes = b"") -> None:
+        self._hash.update(tag + str(len(data)).encode() + b":" + data)
+
+    def update(self, value: Any) -> "Fingerprint":
+        if isinstance(value, _CONSTANTS):
+            self._token(type(value).__name__.encode(), repr(value).encode("utf-8", "surrogatepass"))
+            return self
+
+        marker = id(value)
+        if marker in self._active:
+            # a reference cycle, the enclosing value is already being hashed
+            self._token(b"cycle")
+            return self
+        self._active.add(marker)
+        try:
+            self._update(value)
+        finally:
+            self._active.discard(marker)
+        return self
+
+    def _update(self, value: Any) -> None:
+        if isinstance(value, dict):
+            self._token(b"dict", type(value).__qualname__.encode())
+            for key, item in value.items():
+                self.update(key).update(item)
+            self._token(b"end")
+        elif isinstance(value, (list, tuple)):
+            self._token(type(value).__qualname__.encode(), str(len(value)).encode())
+            for item in value:
+                self.update(item)
+        elif isinstance(value, (set, frozenset)):
+            digests = sorted(Fingerprint().update(item).hexdigest() for item in value)
+            self._token(type(value).__qualname__.encode(), ",".join(digests).encode())
+        elif isinstance(value, type):
+            self._update_class(value)
+        elif isinstance(value, re.Pattern):
+            self._token(b"pattern", repr((value.pattern, value.flags)).encode())
+        elif isinstance(value, types.CodeType):
+            self._update_code(value)
+        elif isinstance(value, _FUNCTIONS):
+            self._update_function(value)
+        else:
+            self._update_object(value)
+
+    def _update_code(self, code: types.CodeType) -> None:
+        self._token(b"code", code.co_code)
+        self._token(b"names", repr((code.co_names, code.co_varnames, code.co_freevars)).encode())
+        for constant in code.co_consts:
+            self.update(constant)
+
+    def _update_function(self, func: Any) -> None:
+        if isinstance(func, types.MethodType):
+            self._token(b"method")
+            self.update(func.__func__).update(func.__self__)
+            return
+        self._token(b"function", f"{func.__module__}.{func.__qualname__}".encode())
+        if isinstance(func, types.FunctionType):
+            self._update_code(func.__code__)
+            self.update(func.__defaults__).update(func.__kwdefaults__)
+            for cell in func.__closure__ or ():
+                try:
+                    self.update(cell.cell_contents)
+                except ValueError:  # an empty cell
+                    self._token(b"empty")
+        elif func.__self__ is not None and not isinstance(func.__self__, types.ModuleType):
+            self.update(func.__self__)
+
+    def _update_class(self, cls: type) -> None:
+        with _CLASS_LOCK:
+            digest = _CLASS_DIGESTS.get(cls)
+            if digest is None:
+                # methods can refer to their class (``super()``), that's a cycle
+                _CLASS_DIGESTS[cls] = f"cycle:{cls.__module__}.{cls.__qualname__}".encode()
+                try:
+                    digest = _CLASS_DIGESTS[cls] = self._class_digest(cls)
+                except BaseException:
+                    del _CLASS_DIGESTS[cls]
+                    raise
+        self._token(b"type", digest)
+
+    @staticmethod
+    def _class_digest(cls: type) -> bytes:
+        fingerprint = Fingerprint()
+        fingerprint._token(b"class", f"{cls.__module__}.{cls.__qualname__}".encode())
+        for base in cls.__mro__:
+            if base.__module__ == "builtins":
+                continue
+            for name, attribute in sorted(vars(base).items()):
+                if name in ("__dict__", "__weakref__", "__doc__", "__module__", "__qualname__"):
+                    continue
+                if isinstance(attribute, (staticmethod, classmethod)):
+                    attribute = attribute.__func__
+                if isinstance(attribute, property):
+                    attribute = (attribute.fget, attribute.fset)
+                if isinstance(attribute, (types.FunctionType, tuple, list, dict, frozenset) + _CONSTANTS):
+                    fingerprint._token(b"attribute", name.encode())
+                    fingerprint.update(attribute)
+        return fingerprint._hash.digest()
+
+    def _update_object(self, value: Any) -> None:
+        cls = type(value)
+        self._update_class(cls)
+        state: Dict[str, Any] = dict(getattr(value, "__dict__", {}))
+        for base in cls.__mro__:
+            slots = base.__dict__.get("__slots__", ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name.startswith("__") and not name.endswith("__"):
+                    name = f"_{base.__name__.lstrip('_')}{name}"
+                if hasattr(value, name):
+                    state[name] = getattr(value, name)
+        if state:
+            for name in sorted(state):
+                self._token(b"attribute", name.encode())
+                self.update(state[name])
+            return
+
+        text = repr(value)
+        if _ADDRESS.search(text):
+            raise TypeError(f"can't fingerprint {cls.__qualname__} objects")
+        self._token(b"repr", text.encode("utf-8", "surrogatepass"))
+
+
+def fingerprint(expected: Any) -> str:
+    """the fingerprint of an expected template, raises ``TypeError`` for objects it can't hash by value"""
+    return Fingerprint().update(expected).hexdigest()
+
+
+def _check_json(value: Any) -> None:
+    if type(value) is dict:
+        for key, item in value.items():
+            if type(key) is not str:
+                raise TypeError(f"dict key {key!r} is not a string")
+            _check_json(item)
+    elif type(value) is list:
+        for item in value:
+            _check_json(item)
+    elif not is_literal(value):
+        raise TypeError(f"{type(value).__name__} is not a JSON type")
+
+
+def content_hash(actual: Any) -> str:
+    """
+    the hash of the JSON form of ``actual``, independent of the order of dict keys. raises ``TypeError`` for anything
+    but plain JSON data (dicts with string keys, lists and JSON scalars, not subclasses or tuples): those would share
+    the JSON form of values the matcher tells apart.
+    """
+    _check_json(actual)
+    data = json.dumps(actual, ensure_ascii=False, separators=(",", ":"), sort_keys=True, check_circular=False)
+    return hashlib.blake2b(data.encode("utf-8", "surrogatepass"), digest_size=20).hexdigest()
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MatchCache:
+    """
+    match through a persistent cache in ``directory``, returning ``DiffRecord`` errors (values without a JSON form
+    are kept as previews, see ``pydiction.serialization``) whether the result was cached or not.
+
+    the least recently used entries are evicted once the database grows over ``max_bytes``. values the cache can't
+    hash (non-JSON actual values, templates holding objects without a stable state) are matched without the cache
+    and counted as bypassed.
+    """
+
+    def __init__(self, directory: str, *, max_bytes: int = DEFAULT_MAX_BYTES, matcher: Optional[Matcher] = None):
+        self.directory = directory
+        self.path = os.path.join(directory, DATABASE_NAME)
+        self.max_bytes = max_bytes
+        self.matcher = matcher or Matcher()
+        self.hits = self.misses = self.bypassed = self.evictions = 0
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._registry_state: Optional[Tuple[tuple, str]] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _connection(self) -> sqlite3.Connection:
+        # one connection per thread, and new ones in forked processes
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def __enter__(self) -> "MatchCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _registry_fingerprint(self) -> str:
+        registries = []
+        registry: Optional[ComparatorRegistry] = self.matcher.registry
+        while registry is not None:
+            registries.append(registry._comparators)
+            registry = registry.parent
+        # registering a comparator replaces the registry's dict, so the dicts identify its state
+        snapshot = (type(self.matcher), *registries)
+        state = self._registry_state
+        if state is None or len(state[0]) != len(snapshot) or any(a is not b for a, b in zip(state[0], snapshot)):
+            fingerprint = Fingerprint().update(type(self.matcher))
+            for comparators in registries:
+                fingerprint.update(list(comparators.items()))
+            state = self._registry_state = (snapshot, fingerprint.hexdigest())
+        return state[1]
+
+    def _key(self, content: str, expected: Any, strict_keys: bool, check_order: bool) -> str:
+        digest = hashlib.blake2b(_CACHE_VERSION, digest_size=20)
+        digest.update(content.encode())
+        digest.update(fingerprint(expected).encode())
+        digest.update(self._registry_fingerprint().encode())
+        digest.update(repr((strict_keys, check_order, self.matcher.list_diff)).encode())
+        return digest.hexdigest()
+
+    def key(self, actual: Any, expected: Any, *, strict_keys=True, check_order=True) -> Optional[str]:
+        """the cache key of the pair, ``None`` if it can't be cached"""
+        try:
+            return self._key(content_hash(actual), expected, strict_keys, check_order)
+        except (TypeError, ValueError):
+            return None
+
+    def _get(self, key: str) -> Optional[List[DiffRecord]]:
+        connection = self._connection()
+        row = connection.execute("SELECT errors FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+        return [decode_error(record) for record in json.loads(row[0])]
+
+    def _put(self, key: str, errors: list) -> List[DiffRecord]:
+        records = [encode_error(error) for error in errors]
+        data = json.dumps(records, ensure_ascii=False)
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, errors, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, data, len(data) + len(key), time.time()),
+            )
+            self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return [decode_error(record) for record in records]
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * _LOW_WATERMARK)
+        evicted = []
+        for key, size in connection.execute("SELECT key, size FROM results ORDER BY accessed"):
+            evicted.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+        with self._stats_lock:
+            self.evictions += len(evicted)
+
+    def _lookup(self, key: Optional[str], match) -> List[DiffRecord]:
+        if key is None:
+            self._count("bypassed")
+            return [decode_error(encode_error(error)) for error in match()]
+        errors = self._get(key)
+        if errors is not None:
+            self._count("hits")
+            return errors
+        self._count("misses")
+        return self._put(key, match())
+
+    def match(self, actual: Any, expected: Any, *, strict_keys=True, check_order=True) -> List[DiffRecord]:
+        key = self.key(actual, expected, strict_keys=strict_keys, check_order=check_order)
+        return self._lookup(
+            key, lambda: self.matcher.match(actual, expected, [], strict_keys=strict_keys, check_order=check_order)
+        )
+
+    def match_file(self, path: str, expected: Any, *, strict_keys=True, check_order=True) -> List[DiffRecord]:
+        """like ``Matcher.match_file``, keyed by the file's bytes so cached files aren't even decoded"""
+        try:
+            key: Optional[str] = self._key(f"file:{_file_hash(path)}", expected, strict_keys, check_order)
+        except (TypeError, ValueError):
+            key = None
+        return self._lookup(
+            key, lambda: self.matcher.match_file(path, expected, strict_keys=strict_keys, check_order=check_order)
+        )
+
+    def assert_match(self, actual: Any, expected: Any, *, strict_keys=True, check_order=True) -> None:
+        self.matcher._raise_errors(self.match(actual, expected, strict_keys=strict_keys, check_order=check_order))
+
+    @property
+    def stats(self) -> CacheStats:
+        entries, size = self._connection().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return CacheStats(self.hits, self.misses, self.bypassed, self.evictions, entries, size)
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM results")
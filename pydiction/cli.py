@@ -0,0 +1,238 @@
+"""
+compare JSON files against expected templates in bulk.
+
+    python -m pydiction actual.json expected.json [actual2.json expected2.py ...]
+    python -m pydiction actual_dir/ expected_dir/ --jobs 8
+
+arguments come in (actual, expected) pairs. a pair of directories is walked for ``*.json`` actual files, each one
+compared with the file at the same relative path in the expected directory, as ``.json`` or as a ``.py`` module
+exposing the template in ``EXPECTED`` (so templates can use operators).
+
+exit codes: 0 when every pair matched, 1 when some did not, 2 on usage errors or files that could not be compared
+(including pairs that ran out of their ``--max-nodes``/``--max-time`` budget before finding any difference).
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pydiction.aggregation import ErrorAggregator
+from pydiction.budget import Budget
+from pydiction.core import LIST_DIFF_ALIGN, LIST_DIFF_ZIP, Matcher
+from pydiction.utils import format_path
+
+EXIT_OK = 0
+EXIT_MISMATCH = 1
+EXIT_ERROR = 2
+
+FORMAT_TEXT = "text"
+FORMAT_JSONL = "jsonl"
+
+
+def load_expected(path: str, name: str = "EXPECTED") -> Any:
+    """load a template from a JSON file or from the ``name`` attribute of a Python file"""
+    if not path.endswith(".py"):
+        with open(path, encoding="utf-8") as fp:
+            return json.load(fp)
+
+    spec = importlib.util.spec_from_file_location(f"_pydiction_expected_{abs(hash(path))}", path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"can't load {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    try:
+        return getattr(module, name)
+    except AttributeError:
+        raise AttributeError(f"{path} has no {name}") from None
+
+
+def _expected_for(expected_dir: Path, relative: Path) -> Path:
+    candidate = expected_dir / relative
+    if not candidate.exists() and candidate.with_suffix(".py").exists():
+        return candidate.with_suffix(".py")
+    return candidate
+
+
+def collect_pairs(arguments: Sequence[str]) -> Iterator[Tuple[str, str]]:
+    for actual, expected in zip(arguments[::2], arguments[1::2]):
+        actual_path, expected_path = Path(actual), Path(expected)
+        if actual_path.is_dir():
+            for file in sorted(actual_path.rglob("*.json")):
+                yield str(file), str(_expected_for(expected_path, file.relative_to(actual_path)))
+        else:
+            yield actual, expected
+
+
+def compare_pair(actual_path: str, expected_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """compare one pair, returns a picklable result so it can run in a worker process"""
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"actual": actual_path, "expected": expected_path, "status": "error", "errors": []}
+    try:
+        with open(actual_path, encoding="utf-8") as fp:
+            actual = json.load(fp)
+        expected = load_expected(expected_path, options["expected_name"])
+
+        budget = Budget(
+            max_nodes=options["max_nodes"],
+            max_time=options["max_time"],
+            max_unordered_length=options["max_unordered_length"],
+            max_errors=options["max_errors"],
+        )
+        match = Matcher(list_diff=options["list_diff"]).match_with_budget(
+            actual, expected, budget, strict_keys=options["strict_keys"], check_order=options["check_order"]
+        )
+        found = match.errors
+        if not match.complete:
+            result["truncated"] = True
+            result["exhausted"] = match.usage.exhausted
+        result["nodes"] = match.usage.nodes
+
+        if found:
+            result["status"] = "failed"
+        else:
+            result["status"] = "passed" if match.complete else "incomplete"
+        result["error_count"] = len(found)
+        result["errors"] = _render_errors(found, options)
+    except Exception as e:
+        result["exception"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _render_errors(errors: Sequence[Tuple[Sequence, str, Any, Any]], options: Dict[str, Any]) -> List[Any]:
+    if options["aggregate"]:
+        return [str(group) for group in ErrorAggregator().extend(errors).groups]
+    if options["format"] == FORMAT_JSONL:
+        from pydiction.serialization import encode_error
+
+        return [encode_error(error) for error in errors]
+    return [str((format_path(error[0]), *error[1:])) for error in errors]
+
+
+def _compare_pair_task(task: Tuple[str, str, Dict[str, Any]]) -> Dict[str, Any]:
+    return compare_pair(*task)
+
+
+def _print_result(result: Dict[str, Any], output_format: str, out: IO[str]) -> None:
+    if output_format == FORMAT_JSONL:
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        return
+    timing = f"{result['seconds'] * 1e3:.1f} ms"
+    if result["status"] == "passed":
+        out.write(f"PASS {result['actual']} ({timing})\n")
+    elif result["status"] == "incomplete":
+        out.write(f"INCOMPLETE {result['actual']} ({result['exhausted']} budget exhausted, {timing})\n")
+    elif result["status"] == "failed":
+        more = "+" if result.get("truncated") else ""
+        out.write(f"FAIL {result['actual']} ({result['error_count']}{more} errors, {timing})\n")
+        for line in result["errors"]:
+            out.write(f"    {line}\n")
+    else:
+        out.write(f"ERROR {result['actual']} ({timing}): {result['exception']}\n")
+    out.flush()
+
+
+def _print_summary(results: List[Dict[str, Any]], elapsed: float, output_format: str, out: IO[str]) -> None:
+    counts = {status: 0 for status in ("passed", "failed", "incomplete", "error")}
+    for result in results:
+        counts[result["status"]] += 1
+    slowest = max(results, key=lambda result: result["seconds"], default=None)
+    summary = {
+        "files": len(results),
+        **counts,
+        "seconds": elapsed,
+        "slowest": {"actual": slowest["actual"], "seconds": slowest["seconds"]} if slowest else None,
+    }
+    if output_format == FORMAT_JSONL:
+        out.write(json.dumps({"summary": summary}) + "\n")
+        return
+    out.write(
+        f"\n{summary['files']} files: {counts['passed']} passed, {counts['failed']} failed,"
+        f" {counts['incomplete']} incomplete, {counts['error']} errors in {elapsed:.2f}s\n"
+    )
+    if slowest:
+        out.write(f"slowest: {slowest['actual']} ({slowest['seconds'] * 1e3:.1f} ms)\n")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m pydiction", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("paths", nargs="+", metavar="ACTUAL EXPECTED", help="actual and expected files or directories")
+    parser.add_argument(
+        "--strict-keys", action=argparse.BooleanOptionalAction, default=True, help="Matcher strict_keys option"
+    )
+    parser.add_argument("--ignore-order", action="store_true", help="compare lists ignoring order (check_order=False)")
+    parser.add_argument(
+        "--list-diff",
+        choices=(LIST_DIFF_ZIP, LIST_DIFF_ALIGN),
+        default=LIST_DIFF_ZIP,
+        help="compare ordered lists position by position, or align them first to report inserted and removed items",
+    )
+    parser.add_argument("--max-errors", type=int, default=None, help="stop comparing a pair after this many errors")
+    parser.add_argument("--max-nodes", type=int, default=None, help="stop comparing a pair after this many values")
+    parser.add_argument("--max-time", type=float, default=None, help="stop comparing a pair after this many seconds")
+    parser.add_argument(
+        "--max-unordered-length",
+        type=int,
+        default=None,
+        help="skip unordered comparisons (--ignore-order) of longer lists",
+    )
+    parser.add_argument("--aggregate", action="store_true", help="collapse errors repeated across list elements")
+    parser.add_argument("--format", choices=(FORMAT_TEXT, FORMAT_JSONL), default=FORMAT_TEXT)
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--expected-name", default="EXPECTED", help="template attribute of .py expected files")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None, out: Optional[IO[str]] = None) -> int:
+    out = out or sys.stdout
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if len(args.paths) % 2:
+        parser.error("paths must come in (actual, expected) pairs")
+    for option in ("max_errors", "max_nodes", "max_time", "max_unordered_length"):
+        value = getattr(args, option)
+        if value is not None and value <= 0:
+            parser.error(f"--{option.replace('_', '-')} must be positive")
+
+    options = {
+        "strict_keys": args.strict_keys,
+        "check_order": not args.ignore_order,
+        "list_diff": args.list_diff,
+        "max_errors": args.max_errors,
+        "max_nodes": args.max_nodes,
+        "max_time": args.max_time,
+        "max_unordered_length": args.max_unordered_length,
+        "aggregate": args.aggregate,
+        "format": args.format,
+        "expected_name": args.expected_name,
+    }
+    tasks = [(actual, expected, options) for actual, expected in collect_pairs(args.paths)]
+    if not tasks:
+        parser.error("no files to compare")
+
+    start = time.perf_counter()
+    results: List[Dict[str, Any]] = []
+    if args.jobs <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            results.append(_compare_pair_task(task))
+            _print_result(results[-1], args.format, out)
+    else:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            futures = [executor.submit(_compare_pair_task, task) for task in tasks]
+            for future in as_completed(futures):
+                results.append(future.result())
+                _print_result(results[-1], args.format, out)
+    _print_summary(results, time.perf_counter() - start, args.format, out)
+
+    if any(result["status"] in ("error", "incomplete") for result in results):
+        return EXIT_ERROR
+    if any(result["status"] == "failed" for result in results):
+        return EXIT_MISMATCH
+    return EXIT_OK
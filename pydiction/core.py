@@ -1,57 +1,132 @@
+import abc
 import itertools
+from collections.abc import Mapping
+from contextvars import ContextVar
 from typing import (
+    IO,
+    TYPE_CHECKING,
     Any,
+    Callable,
     Dict,
     Generic,
     Iterable,
+    Iterator,
     List,
+    Literal,
+    Optional,
     Sequence,
     TypeVar,
     Union,
     cast,
     overload,
 )
-from unittest.mock import ANY
 
-from pydiction.operators import Expectation
-from pydiction.utils import sentinel
+from pydiction.aggregation import ErrorAggregator, ErrorGroup
+from pydiction.attributes import AttributeView, FieldsObject, as_mapping, has_fields
+from pydiction.dispatch import Comparator, ComparatorRegistry
+from pydiction.operators import Expectation, Predicate
+from pydiction.utils import KeyIndex, PathIndex, format_path, sentinel
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pydiction.budget import Budget, MatchResult
+    from pydiction.index import DocumentIndex
 
 T = TypeVar("T")
 
 NOT_SET: object = sentinel("NOT_SET")
 
+# how ordered lists are compared: position by position, or aligned first (see ``pydiction.alignment``)
+LIST_DIFF_ZIP = "zip"
+LIST_DIFF_ALIGN = "align"
+
+# how many list elements ``Each`` hands to ``Predicate.failures`` between two calls of ``Matcher.visit``
+_EACH_CHUNK = 1024
+
+# the matcher running the current match, for the comparisons that go through ``==`` (``Contains.__eq__``)
+_current_matcher: ContextVar[Optional["Matcher"]] = ContextVar("pydiction_current_matcher", default=None)
+
 
 def is_same_type(actual, expected, type_):
     return isinstance(expected, type_) and isinstance(actual, type_)
 
 
 class Matcher:
+    def __init__(self, registry: Optional[ComparatorRegistry] = None, *, list_diff: str = LIST_DIFF_ZIP):
+        if list_diff not in (LIST_DIFF_ZIP, LIST_DIFF_ALIGN):
+            raise ValueError(f"unknown list_diff {list_diff!r}")
+        self.registry = registry if registry is not None else default_registry
+        self.list_diff = list_diff
+
+    def register(self, actual_type: type, expected_type: type, comparator: Optional[Comparator] = None):
+        """register a comparator for this matcher only, see ``ComparatorRegistry``"""
+        if self.registry is default_registry:
+            self.registry = ComparatorRegistry(parent=default_registry)
+        return self.registry.register(actual_type, expected_type, comparator)
+
     def match(
         self, actual: Any, expected: Any, path: List[str], *, strict_keys=True, check_order=True
-    ) -> list[tuple[Sequence, str, Any, ANY]]:
-        # if expected is ANY or (expected is ANY_NOT_NONE and actual == ANY_NOT_NONE):
-        #     return []
-
-        if isinstance(expected, Contains):
-            errors = expected.match(actual, path, self, strict_keys=strict_keys, check_order=check_order)
-        elif isinstance(expected, DoesntContains):
-            errors = expected.match(actual, path, self)
-        elif is_same_type(actual, expected, dict):
-            errors = self._compare_dicts(actual, expected, path, strict_keys)
-        elif is_same_type(actual, expected, list):
-            errors = self._compare_lists(actual, expected, path, strict_keys=strict_keys, check_order=check_order)
-        else:
-            errors = self._compare_values(actual, expected, path)
+    ) -> list[tuple[Sequence, str, Any, Any]]:
+        return list(self.iter_match(actual, expected, path, strict_keys=strict_keys, check_order=check_order))
+
+    def match_with_budget(
+        self, actual: Any, expected: Any, budget: "Budget", *, strict_keys=True, check_order=True
+    ) -> "MatchResult":
+        """
+        match within ``budget`` (nodes visited, time, unordered list length, errors, see ``pydiction.budget``).
+        when it runs out the errors found so far are returned with ``complete=False`` instead of going on.
+        """
+        from pydiction.budget import BudgetedMatcher
+
+        return BudgetedMatcher(budget, self.registry, list_diff=self.list_diff).run(
+            actual, expected, strict_keys=strict_keys, check_order=check_order
+        )
+
+    def match_many(
+        self,
+        pairs: Iterable[tuple[Any, Any]],
+        *,
+        strict_keys=True,
+        check_order=True,
+        max_workers: Optional[int] = None,
+    ) -> list[list[tuple[Sequence, str, Any, Any]]]:
+        """
+        match each (actual, expected) pair on a thread pool, returns the errors of every pair in order.
 
-        return errors
+        matching never writes to the actual or expected objects, so pairs may share templates and payloads. threads
+        run in parallel on free-threaded (3.13t+) builds, with the GIL this only helps when comparators release it.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        def match_pair(pair):
+            actual, expected = pair
+            return self.match(actual, expected, [], strict_keys=strict_keys, check_order=check_order)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(match_pair, pairs))
+
+    def iter_match(
+        self, actual: Any, expected: Any, path: List[str], *, strict_keys=True, check_order=True
+    ) -> Iterator[tuple[Sequence, str, Any, Any]]:
+        comparator = self.registry.resolve(type(actual), type(expected))
+        yield from comparator(self, actual, expected, path, strict_keys=strict_keys, check_order=check_order)
+
+    def visit(self, nodes: int = 1) -> None:
+        """
+        called by operators checking ``nodes`` values without ``iter_match`` (``Each``, ``AllOf``), so subclasses
+        can account for them like ``BudgetedMatcher`` does
+        """
 
     @staticmethod
     def _compare_values(actual: Any, expected: Any, path: Sequence[str]) -> list[tuple[Sequence, str, Any, Any]]:
         errors: list[tuple[Sequence, str, Any, Any]] = []
-        if callable(expected):
+        if isinstance(expected, Predicate):
+            if not expected(actual):
+                errors.append((path, expected.error_msg, actual, expected.expected))
+        elif callable(expected):
             if not expected(actual):
                 if hasattr(expected, "__self__") and isinstance(expected.__self__, Expectation):
-                    errors.append((path, expected.__self__.error_msg or "", actual, expected.__self__.expected))
+                    expectation = expected.__self__
+                    errors.append((path, expectation.message_for(expected.__name__), actual, expectation.expected))
                 else:
                     errors.append((path, expected.__name__ or "", actual, "UNKNOWN"))
         elif actual != expected:
@@ -60,55 +135,53 @@ class Matcher:
         return errors
 
     def _compare_dicts(
-        self, actual: Dict[str, Any], expected: Dict[str, Any], path: List[str], strict_keys=None
-    ) -> list[tuple[Sequence, str, Any, ANY]]:
-        errors: list[tuple[Sequence, str, Any, ANY]] = []
+        self, actual: Mapping[str, Any], expected: Dict[str, Any], path: List[str], strict_keys=None, **_
+    ) -> Iterator[tuple[Sequence, str, Any, Any]]:
         if isinstance(expected, (Contains, DoesntContains)):
-            errors.extend(expected.match(actual, path, self))
+            yield from expected.match(actual, path, self)
         else:
-            errors.extend(
-                [(path + [key], "not expected", actual.get(key), NOT_SET) for key in actual.keys() - expected.keys()]
-            )
+            for key in actual.keys() - expected.keys():
+                yield path + [key], "not expected", actual.get(key), NOT_SET
             for key, expected_value in expected.items():
                 actual_value = actual.get(key)
                 if key not in actual:
-                    errors.append((path + [key], "not found", NOT_SET, expected_value))
+                    yield path + [key], "not found", NOT_SET, expected_value
                 else:
-                    errors.extend(
-                        self.match(
-                            actual_value, expected_value, path + [key], strict_keys=strict_keys, check_order=False
-                        )
+                    yield from self.iter_match(
+                        actual_value, expected_value, path + [key], strict_keys=strict_keys, check_order=False
                     )
 
-        return errors
-
     def _compare_lists(
-        self, actual: List[Any], expected: List[Any], path: List[str], *, strict_keys=True, check_order=True
-    ) -> list[tuple[Sequence, str, Any, ANY]]:
-        errors: list[tuple[Sequence, str, Any, ANY]] = []
-
+        self, actual: Sequence[Any], expected: List[Any], path: List[str], *, strict_keys=True, check_order=True
+    ) -> Iterator[tuple[Sequence, str, Any, Any]]:
         if len(actual) != len(expected):
-            errors.append((path, "Lists have different lengths", len(actual), len(expected)))
-        if check_order:
+            yield path, "Lists have different lengths", len(actual), len(expected)
+        if check_order and self.list_diff == LIST_DIFF_ALIGN:
+            from pydiction.alignment import aligned_errors
+
+            yield from aligned_errors(self, actual, expected, path, strict_keys=strict_keys, check_order=check_order)
+        elif check_order:
             for i, (actual_item, expected_item) in enumerate(zip(actual, expected)):
-                errors.extend(
-                    self.match(
-                        actual_item, expected_item, path + [str(i)], strict_keys=strict_keys, check_order=check_order
-                    )
+                yield from self.iter_match(
+                    actual_item, expected_item, path + [PathIndex(i)], strict_keys=strict_keys, check_order=check_order
                 )
         else:
             actual_permutations = itertools.permutations(actual)
             for perm in actual_permutations:
                 if list(perm) == expected:
-                    return errors
+                    return
 
             if actual != expected:
-                errors.append((path, "different elements (ignoring order)", actual, expected))
-        return errors
+                yield path, "different elements (ignoring order)", actual, expected
 
     @overload
     def assert_declarative_object(
-        self, actual: list, expected: Union[list, "BaseOperator"], strict_keys=True, check_order=True
+        self,
+        actual: list,
+        expected: Union[list, "BaseOperator"],
+        strict_keys=True,
+        check_order=True,
+        aggregate=False,
     ) -> None:  # pragma: no cover
         ...
 
@@ -119,6 +192,7 @@ class Matcher:
         expected: Union[Dict[str, Any], "BaseOperator"],
         strict_keys=True,
         check_order=True,
+        aggregate=False,
     ) -> None:  # pragma: no cover
         ...
 
@@ -128,27 +202,104 @@ class Matcher:
         expected: Union[Dict[str, Any], list, "BaseOperator"],
         strict_keys=True,
         check_order=True,
+        aggregate=False,
     ) -> None:
-        errors = self.match(actual, expected, [], strict_keys=strict_keys, check_order=check_order)
-        self._raise_errors(errors)
+        if aggregate:
+            aggregator = ErrorAggregator().extend(
+                self.iter_match(actual, expected, [], strict_keys=strict_keys, check_order=check_order)
+            )
+            self._raise_aggregated_errors(aggregator)
+        else:
+            errors = self.match(actual, expected, [], strict_keys=strict_keys, check_order=check_order)
+            self._raise_errors(errors)
+
+    @overload
+    def get_declarative_diff(
+        self,
+        actual: Dict[str, Any],
+        expected: Union[Dict[str, Any], "BaseOperator"],
+        strict_keys=True,
+        check_order=True,
+        aggregate: Literal[False] = False,
+    ) -> list:  # pragma: no cover
+        ...
 
+    @overload
     def get_declarative_diff(
         self,
         actual: Dict[str, Any],
         expected: Union[Dict[str, Any], "BaseOperator"],
         strict_keys=True,
         check_order=True,
+        *,
+        aggregate: Literal[True],
+    ) -> List[ErrorGroup]:  # pragma: no cover
+        ...
+
+    def get_declarative_diff(
+        self,
+        actual: Dict[str, Any],
+        expected: Union[Dict[str, Any], "BaseOperator"],
+        strict_keys=True,
+        check_order=True,
+        aggregate=False,
     ) -> list:
+        if aggregate:
+            return (
+                ErrorAggregator()
+                .extend(self.iter_match(actual, expected, [], strict_keys=strict_keys, check_order=check_order))
+                .groups
+            )
         return self.match(actual, expected, [], strict_keys=strict_keys, check_order=check_order)
 
+    def write_declarative_diff(
+        self,
+        actual: Any,
+        expected: Any,
+        fp: IO[str],
+        strict_keys=True,
+        check_order=True,
+        *,
+        max_length: int = 200,
+    ) -> int:
+        """stream the diff to ``fp`` as JSON Lines (see ``pydiction.serialization``), returns the number of errors"""
+        from pydiction.serialization import DiffWriter
+
+        writer = DiffWriter(fp, max_length=max_length)
+        return writer.write_all(self.iter_match(actual, expected, [], strict_keys=strict_keys, check_order=check_order))
+
+    def find(self, index: "DocumentIndex", pattern: Any) -> list[list]:
+        """paths of every subtree of the indexed document matching ``pattern``, see ``pydiction.index``"""
+        return index.find(pattern, self)
+
+    def match_file(self, path: str, expected: Any, strict_keys=True, check_order=True) -> list:
+        """
+        match a JSON file without loading it: the file is memory-mapped and only the subtrees the expected template
+        visits through plain dicts and ordered lists are located and decoded (see ``pydiction.lazy_json``)
+        """
+        from pydiction.lazy_json import LazyJSONFile
+
+        with LazyJSONFile(path) as actual:
+            return self.match(actual, expected, [], strict_keys=strict_keys, check_order=check_order)
+
     @staticmethod
     def _raise_errors(errors) -> None:
         if errors:
-            raise AssertionError("\n" + "\n".join([str((".".join(i[0]), *i[1:])) for i in errors]))
+            raise AssertionError("\n" + "\n".join([str((format_path(i[0]), *i[1:])) for i in errors]))
+
+    @staticmethod
+    def _raise_aggregated_errors(aggregator: ErrorAggregator) -> None:
+        lines = [str(group) for group in aggregator.groups]
+        if aggregator.overflow:
+            lines.append(f"... and {aggregator.overflow} more errors")
+        if lines:
+            raise AssertionError("\n" + "\n".join(lines))
 
 
-class BaseOperator:
-    pass
+class BaseOperator(abc.ABC):
+    @abc.abstractmethod
+    def match(self, actual, path, matcher: Matcher, **options) -> Iterator[tuple[Sequence, str, Any, Any]]:
+        """the errors of ``actual`` at ``path``, ``options`` are the matcher options to pass on"""
 
 
 class Contains(Generic[T], Iterable, BaseOperator):
@@ -160,77 +311,71 @@ class Contains(Generic[T], Iterable, BaseOperator):
     def __iter__(self):  # pragma: no cover
         return iter(self.iterable)
 
-    def match(self, actual, path, matcher: Matcher, *, strict_keys=True, **_) -> list[tuple[Sequence, str, Any, ANY]]:
-        if is_same_type(actual, self.iterable, dict):
-            errors = self._match_dict(actual, matcher, path, strict_keys)
+    def match(
+        self, actual, path, matcher: Matcher, *, strict_keys=True, **_
+    ) -> Iterator[tuple[Sequence, str, Any, Any]]:
+        mapping = as_mapping(actual)
+        if isinstance(self.iterable, dict) and (type(mapping) is dict or isinstance(mapping, Mapping)):
+            yield from self._match_dict(mapping, matcher, path, strict_keys)
         elif is_same_type(actual, self.iterable, list):
-            errors = self._match_list(actual, matcher, path, strict_keys)
+            yield from self._match_list(actual, matcher, path, strict_keys)
         else:
-            errors = [(path, "Contains can only be used with dictionaries or lists", actual, self.iterable)]
-
-        return errors
+            yield path, "Contains can only be used with dictionaries or lists", actual, self.iterable
 
     def _match_dict(self, actual, matcher, path, strict_keys):
-        errors = []
         for key, expected_value in self.iterable.items():
             actual_value = actual.get(key)
             key_ = path + [key]
-            if self.recursive and isinstance(actual_value, (list, dict)):
-                errors += Contains(expected_value, recursive=self.recursive).match(actual_value, key_, matcher)
+            if self.recursive and (isinstance(actual_value, (list, dict)) or has_fields(actual_value)):
+                yield from Contains(expected_value, recursive=self.recursive).match(actual_value, key_, matcher)
             else:
                 if isinstance(expected_value, (Contains, DoesntContains)):
-                    errors += expected_value.match(actual_value, key_, matcher)
+                    yield from expected_value.match(actual_value, key_, matcher)
                 else:
                     if key not in actual:
-                        errors.append((key_, "not found", actual_value, expected_value))
+                        yield key_, "not found", actual_value, expected_value
                     elif self.check_pairs:
-                        errors += matcher.match(
+                        yield from matcher.iter_match(
                             actual_value, expected_value, key_, strict_keys=strict_keys, check_order=False
                         )
-        return errors
 
     def _match_list(self, actual, matcher, path, strict_keys):
-        errors = []
+        # reads only: the actual list may be shared with other threads matching at the same time
         if len(actual) < len(self.iterable):
-            errors.append((path, "List is too short", actual, self.iterable))
+            yield path, "List is too short", actual, self.iterable
         else:
             for i, expected_item in enumerate(self.iterable):
-                actual_copy = actual.copy()
-                tmp_path = path + [str(i)]
+                tmp_path = path + [PathIndex(i)]
                 found = False
-                for j, actual_item in enumerate(actual_copy):
+                for actual_item in actual:
                     if actual_item in self.iterable:
                         found = True
-                        actual.pop(j)
                         break
-                    elif isinstance(actual_item, (dict, list)):
+                    elif isinstance(actual_item, (dict, list)) or has_fields(actual_item):
                         if self.recursive and not isinstance(self.iterable, (Contains, DoesntContains)):
                             expected_item = Contains(expected_item, recursive=self.recursive)
 
                         if isinstance(expected_item, (Contains, DoesntContains)):
                             inner_errors = expected_item.match(actual_item, tmp_path, matcher)
                         else:
-                            inner_errors = matcher.match(
+                            inner_errors = matcher.iter_match(
                                 actual_item, expected_item, tmp_path, strict_keys=strict_keys, check_order=False
                             )
-                        if not inner_errors:
+                        if next(inner_errors, None) is None:
                             found = True
-                            actual.pop(j)
                             break
 
                 if found:
                     break
                 else:
-                    errors.append((tmp_path, "not_found", actual_item, expected_item))
-
-        return errors
+                    yield tmp_path, "not_found", actual_item, expected_item
 
     def __repr__(self):  # pragma: no cover
         return f"<Contains: {repr(self.iterable)}>"
 
     def __eq__(self, other):
-        match = self.match(other, [], Matcher())
-        return len(match) == 0
+        matcher = _current_matcher.get() or Matcher()
+        return next(self.match(other, [], matcher), None) is None
 
 
 class DoesntContains(Generic[T], Iterable, BaseOperator):
@@ -243,9 +388,9 @@ class DoesntContains(Generic[T], Iterable, BaseOperator):
     def __iter__(self):  # pragma: no cover
         return iter(self.iterable)
 
-    def match(self, actual, path, _: Matcher, **kwargs) -> list[tuple[Sequence, str, Any, ANY]]:
-        errors: list[tuple[Sequence, str, Any, ANY]] = []
-        if isinstance(actual, dict):
+    def match(self, actual, path, matcher: Matcher, **kwargs) -> Iterator[tuple[Sequence, str, Any, Any]]:
+        actual = as_mapping(actual)
+        if isinstance(actual, Mapping):
             for key, expected_value in cast(dict, self.iterable).items():
                 actual_value = actual.get(key)
                 # todo:
@@ -255,21 +400,183 @@ class DoesntContains(Generic[T], Iterable, BaseOperator):
                 #       continue
 
                 if actual_value == expected_value:
-                    errors.append((path, f"should not contain {key}", actual_value, expected_value))
+                    yield path, f"should not contain {key}", actual_value, expected_value
 
         elif isinstance(actual, list):
             for i, expected_item in enumerate(self.iterable):
                 actual_item = actual[i]
                 if isinstance(actual_item, dict):
                     if expected_item in actual:
-                        errors.append(
-                            (path + [str(i)], f"list should not contain {expected_item}", actual_item, expected_item)
-                        )
+                        message = f"list should not contain {expected_item}"
+                        yield path + [PathIndex(i)], message, actual_item, expected_item
 
                 elif actual_item in self.iterable:
-                    errors.append((path + [str(i)], f"list should not contain {expected_item}", actual, expected_item))
-
-        return errors
+                    yield path + [PathIndex(i)], f"list should not contain {expected_item}", actual, expected_item
 
     def __repr__(self):  # pragma: no cover
         return repr(self.iterable)
+
+
+class KeyedList(BaseOperator):
+    """
+    match list elements by an identity key instead of by position.
+
+    both lists are indexed by ``key`` (an item key or a callable) so matching is linear in their length; pairs with
+    the same key are matched with the regular matcher rules under a ``[key=value]`` path. missing and duplicate keys
+    are reported, and so are unexpected keys when ``strict`` is set.
+    """
+
+    def __init__(self, items: List[Any], key: Union[str, Callable[[Any], Any]] = "id", *, strict=True):
+        self.items = items
+        self.key = key
+        self.strict = strict
+        self.key_name = key if isinstance(key, str) else getattr(key, "__name__", "key")
+        self._expected: Dict[Any, Any] = {}
+        for item in items:
+            item_key = self._key_of(item)
+            if item_key is NOT_SET:
+                raise ValueError(f"expected item {item!r} has no {self.key_name!r} key")
+            if item_key in self._expected:
+                raise ValueError(f"duplicate expected key {self.key_name}={item_key!r}")
+            self._expected[item_key] = item
+
+    def _key_of(self, item):
+        try:
+            return item[self.key] if isinstance(self.key, str) else self.key(item)
+        except (KeyError, TypeError, IndexError, AttributeError):
+            return NOT_SET
+
+    def match(
+        self, actual, path, matcher: Matcher, *, strict_keys=True, check_order=True, **_
+    ) -> Iterator[tuple[Sequence, str, Any, Any]]:
+        if not isinstance(actual, list):
+            yield path, "KeyedList can only be used with lists", actual, self.items
+            return
+
+        indexed: Dict[Any, Any] = {}
+        for i, item in enumerate(actual):
+            item_key = self._key_of(item)
+            if item_key is NOT_SET:
+                yield path + [PathIndex(i)], f"missing key {self.key_name}", item, NOT_SET
+                continue
+            try:
+                duplicate = item_key in indexed
+            except TypeError:
+                yield path + [PathIndex(i)], f"unhashable key {self.key_name}", item_key, NOT_SET
+                continue
+            if duplicate:
+                yield path + [KeyIndex(self.key_name, item_key)], "duplicate key", item, indexed[item_key]
+            else:
+                indexed[item_key] = item
+
+        for item_key, expected_item in self._expected.items():
+            item_path = path + [KeyIndex(self.key_name, item_key)]
+            if item_key not in indexed:
+                yield item_path, "not found", NOT_SET, expected_item
+            else:
+                yield from matcher.iter_match(
+                    indexed[item_key], expected_item, item_path, strict_keys=strict_keys, check_order=check_order
+                )
+
+        if self.strict:
+            for item_key, item in indexed.items():
+                if item_key not in self._expected:
+                    yield path + [KeyIndex(self.key_name, item_key)], "not expected", item, NOT_SET
+
+    def __repr__(self):  # pragma: no cover
+        return f"<KeyedList[{self.key_name}]: {repr(self.items)}>"
+
+
+class Each(BaseOperator):
+    """
+    match every element of a list against the same expected value.
+
+    a ``Predicate`` (``Matches``, ``OneOf``, ...) is applied to the list through its ``failures`` method, a chunk of
+    elements at a time, instead of one matcher call per element.
+    """
+
+    def __init__(self, expected: Any):
+        self.expected = expected
+
+    def match(
+        self, actual, path, matcher: Matcher, *, strict_keys=True, check_order=True, **_
+    ) -> Iterator[tuple[Sequence, str, Any, Any]]:
+        if not isinstance(actual, list):
+            yield path, "Each can only be used with lists", actual, self.expected
+            return
+
+        expected = self.expected
+        if isinstance(expected, Predicate):
+            for start in range(0, len(actual), _EACH_CHUNK):
+                chunk = actual[start : start + _EACH_CHUNK]
+                matcher.visit(len(chunk))
+                for i in expected.failures(chunk):
+                    yield path + [PathIndex(start + i)], expected.error_msg, chunk[i], expected.expected
+        else:
+            for i, item in enumerate(actual):
+                yield from matcher.iter_match(
+                    item, expected, path + [PathIndex(i)], strict_keys=strict_keys, check_order=check_order
+                )
+
+    def __repr__(self):  # pragma: no cover
+        return f"<Each: {repr(self.expected)}>"
+
+
+class AllOf(BaseOperator):
+    """
+    match the actual value against each expected value in turn, stopping at the first one that fails (like ``and``)
+    """
+
+    def __init__(self, *expected: Any):
+        self.expected = expected
+
+    def match(
+        self, actual, path, matcher: Matcher, *, strict_keys=True, check_order=True, **_
+    ) -> Iterator[tuple[Sequence, str, Any, Any]]:
+        for expected in self.expected:
+            if isinstance(expected, Predicate):
+                # called directly like in Each, these are the bulk of the checks of a compiled schema
+                matcher.visit()
+                if not expected(actual):
+                    yield path, expected.error_msg, actual, expected.expected
+                    return
+                continue
+            errors = matcher.iter_match(actual, expected, path, strict_keys=strict_keys, check_order=check_order)
+            first = next(errors, None)
+            if first is not None:
+                yield first
+                yield from errors
+                return
+
+    def __repr__(self):  # pragma: no cover
+        return f"<AllOf: {', '.join(map(repr, self.expected))}>"
+
+
+def _match_operator(matcher: Matcher, actual, expected: BaseOperator, path, **options):
+    return expected.match(actual, path, matcher, **options)
+
+
+def _match_dicts(matcher: Matcher, actual, expected, path, **options):
+    return matcher._compare_dicts(actual, expected, path, **options)
+
+
+def _match_lists(matcher: Matcher, actual, expected, path, **options):
+    return matcher._compare_lists(actual, expected, path, **options)
+
+
+def _match_fields(matcher: Matcher, actual, expected, path, **options):
+    return matcher._compare_dicts(AttributeView(actual), expected, path, **options)
+
+
+def _match_values(matcher: Matcher, actual, expected, path, **_):
+    return matcher._compare_values(actual, expected, path)
+
+
+default_registry = ComparatorRegistry()
+default_registry.register(object, object, _match_values)
+default_registry.register(object, BaseOperator, _match_operator)
+default_registry.register(dict, dict, _match_dicts)
+default_registry.register(list, list, _match_lists)
+default_registry.register(FieldsObject, dict, _match_fields)
+
+register_comparator = default_registry.register
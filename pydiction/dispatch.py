@@ -0,0 +1,86 @@
+import threading
+import weakref
+from abc import ABCMeta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+Comparator = Callable[..., Iterable[Tuple[Sequence, str, Any, Any]]]
+
+
+class ComparatorRegistry:
+    """
+    comparators keyed on the (actual type, expected type) pair, resolved like ``functools.singledispatch``.
+
+    a comparator is called as ``comparator(matcher, actual, expected, path, *, strict_keys, check_order)`` and
+    returns (or yields) the errors. resolution walks the expected type's MRO, and for each class the actual type's
+    MRO, so a comparator registered on a more specific expected type wins; the result is cached per concrete type
+    pair. a registry created with a ``parent`` sees the parent's comparators, its own ones taking precedence.
+    registered abstract base classes match their virtual subclasses too, right before ``object`` in the MRO.
+    """
+
+    def __init__(self, parent: Optional["ComparatorRegistry"] = None):
+        self.parent = parent
+        self._comparators: Dict[Tuple[type, type], Comparator] = {}
+        self._cache: Dict[Tuple[type, type], Comparator] = {}
+        self._children: "weakref.WeakSet[ComparatorRegistry]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        if parent is not None:
+            parent._children.add(self)
+
+    def register(self, actual_type: type, expected_type: type, comparator: Optional[Comparator] = None):
+        """register ``comparator`` for the type pair, can be used as a decorator"""
+        if comparator is None:
+            return lambda func: self.register(actual_type, expected_type, func)
+
+        with self._lock:
+            # copy on write: concurrent resolutions keep iterating over the previous snapshot
+            comparators = dict(self._comparators)
+            comparators[(actual_type, expected_type)] = comparator
+            self._comparators = comparators
+            self._invalidate()
+        return comparator
+
+    def _invalidate(self) -> None:
+        # a resolution that started before this writes into the discarded cache, never into the new one
+        self._cache = {}
+        for child in list(self._children):
+            child._invalidate()
+
+    def _lookup(self, key: Tuple[type, type]) -> Optional[Comparator]:
+        comparator = self._comparators.get(key)
+        if comparator is None and self.parent is not None:
+            return self.parent._lookup(key)
+        return comparator
+
+    def _registered_types(self, position: int) -> set:
+        types = {key[position] for key in self._comparators}
+        if self.parent is not None:
+            types |= self.parent._registered_types(position)
+        return types
+
+    def _compose_mro(self, cls: type, position: int) -> List[type]:
+        mro: List[type] = list(cls.__mro__)
+        virtual = [
+            abc
+            for abc in self._registered_types(position)
+            if isinstance(abc, ABCMeta) and abc not in mro and issubclass(cls, abc)
+        ]
+        if virtual:
+            mro[-1:-1] = sorted(virtual, key=lambda abc: abc.__qualname__)
+        return mro
+
+    def resolve(self, actual_type: type, expected_type: type) -> Comparator:
+        key = (actual_type, expected_type)
+        cache = self._cache
+        comparator = cache.get(key)
+        if comparator is None:
+            comparator = cache[key] = self._resolve(actual_type, expected_type)
+        return comparator
+
+    def _resolve(self, actual_type: type, expected_type: type) -> Comparator:
+        actual_mro = self._compose_mro(actual_type, 0)
+        for expected_cls in self._compose_mro(expected_type, 1):
+            for actual_cls in actual_mro:
+                comparator = self._lookup((actual_cls, expected_cls))
+                if comparator is not None:
+                    return comparator
+        raise LookupError(f"no comparator registered for ({actual_type.__name__}, {expected_type.__name__})")
@@ -0,0 +1,126 @@
+import itertools
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from pydiction.core import BaseOperator, Contains, DoesntContains, Matcher
+from pydiction.utils import PathIndex, is_literal, sentinel
+
+# stands for the key of list elements in the (key, value) index
+LIST_ITEM: object = sentinel("LIST_ITEM")
+
+
+class DocumentIndex:
+    """
+    an index of a document built in one walk, mapping key names and (key, leaf value) pairs to the dicts and lists
+    holding them, and leaf values to their paths.
+
+    queries (``find``, ``ContainsAnywhere``) take their candidates from the most selective entry of a dict pattern,
+    or from the items of a list pattern, and run the full structural match on those only, so their cost depends on
+    the number of candidates rather than on the size of the document. the index is a snapshot: rebuild it after
+    changing the document.
+    """
+
+    def __init__(self, document: Any):
+        self.document = document
+        self.nodes: List[Tuple[Tuple[Any, ...], Any]] = []
+        self._dicts: List[int] = []
+        self._lists: List[int] = []
+        self._by_key: Dict[Any, List[int]] = {}
+        self._by_pair: Dict[Tuple[Any, Any], List[int]] = {}
+        self._by_value: Dict[Any, List[Tuple[Tuple[Any, ...], Any]]] = {}
+        self._build()
+
+    def _build(self) -> None:
+        if not isinstance(self.document, (dict, list)):
+            self._add_leaf((), self.document)
+            return
+        stack: List[Tuple[Tuple[Any, ...], Any]] = [((), self.document)]
+        while stack:
+            path, node = stack.pop()
+            node_id = len(self.nodes)
+            self.nodes.append((path, node))
+            if isinstance(node, dict):
+                self._dicts.append(node_id)
+                items: Iterator[Tuple[Any, Any, Any]] = ((key, key, value) for key, value in node.items())
+            else:
+                self._lists.append(node_id)
+                items = ((LIST_ITEM, PathIndex(i), value) for i, value in enumerate(node))
+
+            children = []
+            for key, part, value in items:
+                if key is not LIST_ITEM:
+                    self._by_key.setdefault(key, []).append(node_id)
+                if isinstance(value, (dict, list)):
+                    children.append((path + (part,), value))
+                elif self._add_leaf(path + (part,), value):
+                    holders = self._by_pair.setdefault((key, value), [])
+                    if not holders or holders[-1] != node_id:
+                        holders.append(node_id)
+            stack.extend(reversed(children))
+
+    def _add_leaf(self, path: Tuple[Any, ...], value: Any) -> bool:
+        try:
+            self._by_value.setdefault(value, []).append((path, value))
+        except TypeError:
+            return False
+        return True
+
+    def _candidates(self, pattern: Any) -> List[int]:
+        if isinstance(pattern, dict):
+            selected: Optional[List[int]] = None
+            for key, value in pattern.items():
+                if isinstance(value, DoesntContains):
+                    # satisfied by a missing key as well
+                    continue
+                ids = self._by_pair.get((key, value), []) if is_literal(value) else self._by_key.get(key, [])
+                if selected is None or len(ids) < len(selected):
+                    selected = ids
+            return self._dicts if selected is None else selected
+
+        # a list contains a list pattern as soon as one of its items equals any item of the pattern, so the
+        # candidates are the union over the pattern items. operators, dicts and lists can match any list
+        if not pattern or not all(is_literal(item) for item in pattern):
+            return self._lists
+        return list(itertools.chain.from_iterable(self._by_pair.get((LIST_ITEM, item), []) for item in pattern))
+
+    def find(self, pattern: Any, matcher: Optional[Matcher] = None) -> List[List[Any]]:
+        """
+        paths of the subtrees matching ``pattern``: dicts and lists containing it (``Contains(..., recursive=True)``
+        rules), or the leaves matching a value, operator or predicate
+        """
+        matcher = matcher or Matcher()
+        if isinstance(pattern, (dict, list)):
+            expected = Contains(pattern, recursive=True)
+            found = []
+            for node_id in sorted(set(self._candidates(pattern))):
+                path, node = self.nodes[node_id]
+                if next(expected.match(node, list(path), matcher), None) is None:
+                    found.append(list(path))
+            return found
+
+        if is_literal(pattern):
+            leaves: Iterable[Tuple[Tuple[Any, ...], Any]] = self._by_value.get(pattern, [])
+        else:
+            # operators and predicates can't be looked up, every leaf is a candidate
+            leaves = itertools.chain.from_iterable(self._by_value.values())
+        return [
+            list(path) for path, value in leaves if next(matcher.iter_match(value, pattern, list(path)), None) is None
+        ]
+
+
+class ContainsAnywhere(BaseOperator):
+    """
+    match if ``pattern`` is found anywhere in the actual value, see ``DocumentIndex.find``.
+
+    the actual value can be a ``DocumentIndex`` to share one index between several queries on the same document.
+    """
+
+    def __init__(self, pattern: Any):
+        self.pattern = pattern
+
+    def match(self, actual, path, matcher: Matcher, **_) -> Iterator[Tuple[Sequence, str, Any, Any]]:
+        index = actual if isinstance(actual, DocumentIndex) else DocumentIndex(actual)
+        if not index.find(self.pattern, matcher):
+            yield path, "not found anywhere", index.document, self.pattern
+
+    def __repr__(self):  # pragma: no cover
+        return f"<ContainsAnywhere: {repr(self.pattern)}>"
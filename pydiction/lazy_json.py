@@ -0,0 +1,227 @@
+import json
+import mmap
+import re
+from collections.abc import Mapping, Sequence
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from pydiction.core import BaseOperator, Matcher, default_registry
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]', re.DOTALL)
+_SCALAR = re.compile(rb"[^,\]}\s]*")
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+class _Document:
+    """a JSON text and the scanning primitives the lazy views are built on"""
+
+    def __init__(self, buffer: Buffer):
+        self.buffer = buffer
+
+    def skip_whitespace(self, pos: int) -> int:
+        return _WHITESPACE.match(self.buffer, pos).end()  # type: ignore[union-attr]
+
+    def skip_value(self, pos: int) -> int:
+        """return the offset right after the value starting at ``pos`` without decoding it"""
+        first = self.buffer[pos : pos + 1]
+        if first == b'"':
+            match = _STRING.match(self.buffer, pos)
+            if match is None:
+                raise ValueError(f"unterminated string at offset {pos}")
+            return match.end()
+        if first in (b"{", b"["):
+            depth = 0
+            for token in _TOKEN.finditer(self.buffer, pos):
+                char = token.group()
+                if char in (b"{", b"["):
+                    depth += 1
+                elif char in (b"}", b"]"):
+                    depth -= 1
+                    if depth == 0:
+                        return token.end()
+            raise ValueError(f"unterminated container at offset {pos}")
+        return _SCALAR.match(self.buffer, pos).end()  # type: ignore[union-attr]
+
+    def expect(self, pos: int, char: bytes) -> int:
+        if self.buffer[pos : pos + 1] != char:
+            raise ValueError(f"expected {char.decode()!r} at offset {pos}")
+        return pos + 1
+
+    def decode(self, start: int, end: int) -> Any:
+        return json.loads(self.buffer[start:end])
+
+    def value(self, start: int, end: int) -> Any:
+        first = self.buffer[start : start + 1]
+        if first == b"{":
+            return LazyObject(self, start, end)
+        if first == b"[":
+            return LazyArray(self, start, end)
+        return self.decode(start, end)
+
+    def root(self) -> Any:
+        start = self.skip_whitespace(0)
+        end = self.skip_value(start)
+        if self.skip_whitespace(end) != len(self.buffer):
+            raise ValueError(f"extra data at offset {end}")
+        return self.value(start, end)
+
+
+class LazyNode:
+    """a JSON container whose children are located on first access and decoded only when read"""
+
+    __slots__ = ("_document", "_start", "_end")
+
+    def __init__(self, document: _Document, start: int, end: int):
+        self._document = document
+        self._start = start
+        self._end = end
+
+    def materialize(self) -> Any:
+        """decode the whole subtree into plain dicts and lists"""
+        return self._document.decode(self._start, self._end)
+
+
+class LazyObject(LazyNode, Mapping):
+    __slots__ = ("_offsets",)
+
+    def __init__(self, document: _Document, start: int, end: int):
+        super().__init__(document, start, end)
+        self._offsets: Optional[Dict[str, Tuple[int, int]]] = None
+
+    def _index(self) -> Dict[str, Tuple[int, int]]:
+        if self._offsets is not None:
+            return self._offsets
+        document = self._document
+        offsets: Dict[str, Tuple[int, int]] = {}
+        pos = document.skip_whitespace(self._start + 1)
+        if document.buffer[pos : pos + 1] != b"}":
+            while True:
+                key_end = document.skip_value(pos)
+                key = document.decode(pos, key_end)
+                pos = document.skip_whitespace(document.expect(document.skip_whitespace(key_end), b":"))
+                value_end = document.skip_value(pos)
+                offsets[key] = (pos, value_end)
+                pos = document.skip_whitespace(value_end)
+                if document.buffer[pos : pos + 1] == b"}":
+                    break
+                pos = document.skip_whitespace(document.expect(pos, b","))
+        self._offsets = offsets
+        return offsets
+
+    def __getitem__(self, key: str) -> Any:
+        return self._document.value(*self._index()[key])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index())
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def __repr__(self):
+        return f"<LazyObject at {self._start}:{self._end}>"
+
+
+class LazyArray(LazyNode, Sequence):
+    __slots__ = ("_offsets",)
+
+    def __init__(self, document: _Document, start: int, end: int):
+        super().__init__(document, start, end)
+        self._offsets: Optional[List[Tuple[int, int]]] = None
+
+    def _index(self) -> List[Tuple[int, int]]:
+        if self._offsets is not None:
+            return self._offsets
+        document = self._document
+        offsets: List[Tuple[int, int]] = []
+        pos = document.skip_whitespace(self._start + 1)
+        if document.buffer[pos : pos + 1] != b"]":
+            while True:
+                value_end = document.skip_value(pos)
+                offsets.append((pos, value_end))
+                pos = document.skip_whitespace(value_end)
+                if document.buffer[pos : pos + 1] == b"]":
+                    break
+                pos = document.skip_whitespace(document.expect(pos, b","))
+        self._offsets = offsets
+        return offsets
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self._document.value(*offsets) for offsets in self._index()[index]]
+        return self._document.value(*self._index()[index])
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def __eq__(self, other):
+        if isinstance(other, (list, LazyArray)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"<LazyArray at {self._start}:{self._end}>"
+
+
+def materialize(value: Any) -> Any:
+    return value.materialize() if isinstance(value, LazyNode) else value
+
+
+def _materialized(errors):
+    for path, message, actual, expected in errors:
+        yield path, message, materialize(actual), expected
+
+
+def _match_lazy_object(matcher: Matcher, actual: LazyObject, expected: dict, path, **options):
+    return _materialized(matcher._compare_dicts(actual, expected, path, **options))
+
+
+def _match_lazy_array(matcher: Matcher, actual: LazyArray, expected: list, path, *, check_order=True, **options):
+    if not check_order:
+        # permutations compare whole elements, there is nothing left to skip
+        return matcher._compare_lists(actual.materialize(), expected, path, check_order=False, **options)
+    return _materialized(matcher._compare_lists(actual, expected, path, check_order=True, **options))
+
+
+def _match_materialized(matcher: Matcher, actual: LazyNode, expected: Any, path, **options):
+    return matcher.iter_match(actual.materialize(), expected, path, **options)
+
+
+default_registry.register(LazyObject, dict, _match_lazy_object)
+default_registry.register(LazyArray, list, _match_lazy_array)
+default_registry.register(LazyNode, BaseOperator, _match_materialized)
+default_registry.register(LazyNode, object, _match_materialized)
+
+
+class LazyJSONFile:
+    """
+    memory-map a JSON file and expose its root value as lazy views, use as a context manager
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file: Optional[BinaryIO] = None
+        self._mmap: Optional[mmap.mmap] = None
+
+    def __enter__(self) -> Any:
+        self._file = file = open(self.path, "rb")
+        try:
+            if not file.seek(0, 2):
+                raise ValueError(f"{self.path} is empty")
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            return _Document(self._mmap).root()
+        except BaseException:
+            self.__exit__()
+            raise
+
+    def __exit__(self, *exc_info) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -1,9 +1,27 @@
-from typing import Optional, TypeVar
-from unittest.mock import ANY
+import abc
+import functools
+import re
+from typing import Any, Iterable, Iterator, Optional, Pattern, Sequence, Tuple, TypeVar, Union
 
 
-class _ANY_NOT_NONE(ANY.__class__):
-    "A helper object that compares equal to everything."
+class _ANY:
+    "A helper object that compares equal to everything, a drop-in for ``unittest.mock.ANY``."
+
+    def __eq__(self, other):
+        return True
+
+    def __ne__(self, other):
+        return False
+
+    def __repr__(self):
+        return "<ANY>"
+
+    def __hash__(self):
+        return hash(repr(self))
+
+
+class _ANY_NOT_NONE(_ANY):
+    "A helper object that compares equal to everything but None."
 
     def __eq__(self, other):
         if other is None:
@@ -57,13 +75,9 @@ class Expectation:
     def __contains__(self, other: T) -> bool:
         return other.__contains__(self.expected)  # type: ignore[operator]
 
-    def __getattribute__(self, item):
-        error_mapping = object.__getattribute__(self, "__error_mapping__")
-        if item in error_mapping:
-            item_ = error_mapping[item]
-            setattr(self, "error_msg", item_)
-        #
-        return object.__getattribute__(self, item)
+    def message_for(self, method_name: str) -> str:
+        """the error message of a failed ``expectation.<method_name>`` check, ``error_msg`` takes precedence"""
+        return self.error_msg or self.__error_mapping__.get(method_name) or ""
 
 
 class Expect(Expectation):
@@ -111,4 +125,106 @@ class ExpectNot(Expectation):
         return not super().__contains__(other)
 
 
+@functools.lru_cache(maxsize=512)
+def compile_pattern(pattern: str, flags: int = 0) -> Pattern:
+    """compile ``pattern`` once, the compiled patterns are shared by every template through a bounded cache"""
+    return re.compile(pattern, flags)
+
+
+class Predicate(abc.ABC):
+    """
+    a check applied to the actual value, with an error message and the expected value to report on failure
+    """
+
+    error_msg: str = ""
+
+    def __init__(self, expected: Any):
+        self.expected = expected
+
+    @abc.abstractmethod
+    def __call__(self, actual: Any) -> bool:
+        """whether ``actual`` passes the check"""
+
+    def failures(self, values: Sequence[Any]) -> Iterator[int]:
+        """indices of the values that fail the check, used by ``Each`` to check a whole list in one loop"""
+        return (i for i, value in enumerate(values) if not self(value))
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.expected!r}>"
+
+
+class Matches(Predicate):
+    error_msg = "does not match pattern"
+
+    def __init__(self, pattern: str, flags: int = 0, *, mode: str = "match"):
+        if mode not in ("match", "search", "fullmatch"):
+            raise ValueError(f"unknown mode {mode!r}")
+        super().__init__(pattern)
+        self._match = getattr(compile_pattern(pattern, flags), mode)
+
+    def __call__(self, actual: Any) -> bool:
+        return isinstance(actual, str) and self._match(actual) is not None
+
+    def failures(self, values: Sequence[Any]) -> Iterator[int]:
+        match = self._match
+        return (i for i, value in enumerate(values) if not isinstance(value, str) or match(value) is None)
+
+
+class StartsWith(Predicate):
+    error_msg = "does not start with"
+
+    def __init__(self, prefix: Union[str, Tuple[str, ...]]):
+        super().__init__(prefix)
+
+    def __call__(self, actual: Any) -> bool:
+        return isinstance(actual, str) and actual.startswith(self.expected)
+
+    def failures(self, values: Sequence[Any]) -> Iterator[int]:
+        prefix = self.expected
+        return (i for i, value in enumerate(values) if not isinstance(value, str) or not value.startswith(prefix))
+
+
+class OneOf(Predicate):
+    error_msg = "not one of"
+
+    def __init__(self, values: Iterable[Any]):
+        super().__init__(frozenset(values))
+
+    def __call__(self, actual: Any) -> bool:
+        try:
+            return actual in self.expected
+        except TypeError:
+            return False
+
+    def failures(self, values: Sequence[Any]) -> Iterator[int]:
+        expected = self.expected
+        for i, value in enumerate(values):
+            try:
+                if value not in expected:
+                    yield i
+            except TypeError:
+                yield i
+
+
+class Length(Predicate):
+    error_msg = "length out of range"
+
+    def __init__(self, exact: Optional[int] = None, *, min: Optional[int] = None, max: Optional[int] = None):
+        if exact is not None:
+            if min is not None or max is not None:
+                raise ValueError("Length takes either an exact length or min/max")
+            min = max = exact
+        super().__init__(exact if exact is not None else (min, max))
+        self.min = min
+        self.max = max
+
+    def __call__(self, actual: Any) -> bool:
+        try:
+            length = len(actual)
+        except TypeError:
+            return False
+        return (self.min is None or length >= self.min) and (self.max is None or length <= self.max)
+
+
+ANY = _ANY()
 ANY_NOT_NONE = _ANY_NOT_NONE()
@@ -0,0 +1,306 @@
+"""
+compile JSON Schema documents into pydiction expected structures, so one match validates the schema and gives the
+path-level diff.
+
+supported keywords: ``type``, ``properties``, ``required``, ``additionalProperties``, ``items`` (a single schema),
+``enum``, ``const``, ``minimum``, ``maximum``, ``exclusiveMinimum``, ``exclusiveMaximum`` (numbers), ``pattern``,
+``minLength``, ``maxLength``, ``minItems``, ``maxItems`` and ``allOf``. annotations (``title``, ``format``, ...) are
+ignored, any other keyword raises ``ValueError``.
+"""
+import functools
+import json
+import operator
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+from pydiction.core import NOT_SET, AllOf, BaseOperator, Contains, Each, Matcher
+from pydiction.operators import ANY, Expect, Length, Matches, Predicate
+
+_ANNOTATIONS = frozenset(
+    (
+        "$schema",
+        "$id",
+        "$comment",
+        "title",
+        "description",
+        "default",
+        "examples",
+        "format",
+        "readOnly",
+        "writeOnly",
+        "deprecated",
+    )
+)
+
+_KEYWORDS = frozenset(
+    (
+        "type",
+        "const",
+        "enum",
+        "minimum",
+        "exclusiveMinimum",
+        "maximum",
+        "exclusiveMaximum",
+        "minLength",
+        "maxLength",
+        "pattern",
+        "properties",
+        "required",
+        "additionalProperties",
+        "minItems",
+        "maxItems",
+        "items",
+        "allOf",
+    )
+)
+
+
+_BOUNDS = {"minimum": "__ge__", "exclusiveMinimum": "__gt__", "maximum": "__le__", "exclusiveMaximum": "__lt__"}
+
+_JSON_TYPES: Dict[str, Tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "null": (type(None),),
+    "object": (dict, Mapping),
+    "array": (list,),
+}
+
+
+class JSONType(Predicate):
+    """check the JSON type of the value, booleans aren't numbers and integral floats are integers"""
+
+    error_msg = "wrong type"
+
+    def __init__(self, types: Union[str, Sequence[str]]):
+        names = (types,) if isinstance(types, str) else tuple(types)
+        unknown = [name for name in names if name not in _JSON_TYPES]
+        if unknown:
+            raise ValueError(f"unknown JSON types {unknown}")
+        super().__init__(types)
+        self._types = tuple(cls for name in names for cls in _JSON_TYPES[name])
+        self._boolean = "boolean" in names
+        self._integer = "integer" in names
+
+    def __call__(self, actual: Any) -> bool:
+        if actual is True or actual is False:
+            return self._boolean
+        if self._integer and type(actual) is float and actual.is_integer():
+            return True
+        return isinstance(actual, self._types)
+
+
+def _is_bool(value: Any) -> bool:
+    return value is True or value is False
+
+
+def _json_equal(actual: Any, expected: Any) -> bool:
+    """JSON equality: numbers compare by value, but booleans aren't numbers (``true`` is not ``1``)"""
+    if _is_bool(actual) or _is_bool(expected):
+        return actual is expected
+    if isinstance(expected, dict):
+        return (
+            isinstance(actual, Mapping)
+            and actual.keys() == expected.keys()
+            and all(_json_equal(actual[key], value) for key, value in expected.items())
+        )
+    if isinstance(expected, list):
+        return (
+            isinstance(actual, list)
+            and len(actual) == len(expected)
+            and all(_json_equal(item, value) for item, value in zip(actual, expected))
+        )
+    return not isinstance(actual, (Mapping, list)) and actual == expected
+
+
+class JSONConst(Predicate):
+    """the ``const`` keyword, compared with JSON equality"""
+
+    error_msg = "does not match"
+
+    def __call__(self, actual: Any) -> bool:
+        return _json_equal(actual, self.expected)
+
+
+class JSONEnum(Predicate):
+    """
+    the ``enum`` keyword, compared with JSON equality. hashable members are looked up, objects and arrays are
+    scanned
+    """
+
+    error_msg = "not one of"
+
+    def __init__(self, values: Iterable[Any]):
+        super().__init__(list(values))
+        scalars = set()
+        self._scanned: List[Any] = []
+        for value in self.expected:
+            if isinstance(value, (dict, list)):
+                self._scanned.append(value)
+                continue
+            try:
+                scalars.add((_is_bool(value), value))
+            except TypeError:
+                self._scanned.append(value)
+        self._scalars = frozenset(scalars)
+
+    def __call__(self, actual: Any) -> bool:
+        if not isinstance(actual, (Mapping, list)):
+            try:
+                if (_is_bool(actual), actual) in self._scalars:
+                    return True
+            except TypeError:
+                pass
+        return any(_json_equal(actual, value) for value in self._scanned)
+
+
+class Bound(Predicate):
+    """a numeric limit, values that aren't numbers pass (they're left to ``type``)"""
+
+    _OPERATORS = {"__ge__": operator.ge, "__gt__": operator.gt, "__le__": operator.le, "__lt__": operator.lt}
+
+    def __init__(self, limit: Union[int, float], comparison: str):
+        super().__init__(limit)
+        self._compare = self._OPERATORS[comparison]
+        self.error_msg = Expect.__error_mapping__[comparison]
+
+    def __call__(self, actual: Any) -> bool:
+        if isinstance(actual, bool) or not isinstance(actual, (int, float)):
+            return True
+        return self._compare(actual, self.expected)
+
+
+class OnlyFor(BaseOperator):
+    """apply ``expected`` to values of the given JSON type only, like the type-specific JSON Schema keywords"""
+
+    def __init__(self, json_type: str, expected: Any):
+        self.json_type = JSONType(json_type)
+        self.expected = expected
+
+    def match(self, actual, path, matcher: Matcher, **options) -> Iterator[Tuple[Sequence, str, Any, Any]]:
+        if self.json_type(actual):
+            yield from matcher.iter_match(actual, self.expected, path, **options)
+
+    def __repr__(self):  # pragma: no cover
+        return f"<OnlyFor {self.json_type.expected}: {self.expected!r}>"
+
+
+class Properties(BaseOperator):
+    """
+    an object with optional properties: present properties are matched, missing ones are reported only when
+    required, and extra ones are allowed (``additional=True``), reported (``False``) or matched against a schema
+    """
+
+    def __init__(self, properties: Dict[str, Any], required: Iterable[str] = (), additional: Any = True):
+        self.properties = properties
+        self.required = frozenset(required)
+        self.additional = additional
+
+    def match(
+        self, actual, path, matcher: Matcher, *, strict_keys=True, check_order=True, **_
+    ) -> Iterator[Tuple[Sequence, str, Any, Any]]:
+        if not isinstance(actual, Mapping):
+            yield path, "Properties can only be used with objects", actual, self.properties
+            return
+
+        for key, expected in self.properties.items():
+            if key in actual:
+                yield from matcher.iter_match(
+                    actual[key], expected, path + [key], strict_keys=strict_keys, check_order=check_order
+                )
+            elif key in self.required:
+                yield path + [key], "not found", NOT_SET, expected
+        for key in self.required.difference(self.properties):
+            if key not in actual:
+                yield path + [key], "not found", NOT_SET, ANY
+
+        if self.additional is True:
+            return
+        for key in actual.keys() - self.properties.keys():
+            if self.additional is False:
+                yield path + [key], "not expected", actual[key], NOT_SET
+            else:
+                yield from matcher.iter_match(
+                    actual[key], self.additional, path + [key], strict_keys=strict_keys, check_order=check_order
+                )
+
+    def __repr__(self):  # pragma: no cover
+        return f"<Properties: {self.properties!r}, required={sorted(self.required)!r}>"
+
+
+def _compile_object(schema: Dict[str, Any]) -> Any:
+    properties = {key: _compile(value) for key, value in schema.get("properties", {}).items()}
+    required = schema.get("required", [])
+    additional = schema.get("additionalProperties", True)
+    if additional not in (True, False):
+        additional = _compile(additional)
+
+    if set(required) >= properties.keys():
+        template = dict(properties)
+        template.update((key, ANY) for key in required if key not in properties)
+        if additional is False:
+            return template
+        if additional is True:
+            return Contains(template)
+    return Properties(properties, required, additional)
+
+
+def _compile(schema: Union[Dict[str, Any], bool]) -> Any:
+    if schema is True or schema == {}:
+        return ANY
+    if not isinstance(schema, dict):
+        raise ValueError(f"unsupported schema {schema!r}")
+
+    unsupported = schema.keys() - _ANNOTATIONS - _KEYWORDS
+    if unsupported:
+        raise ValueError(f"unsupported JSON Schema keywords {sorted(unsupported)}")
+
+    def only_for(json_type: str, check: Any) -> Any:
+        # no need to check the type twice when the schema restricts it to this one
+        return check if schema.get("type") == json_type else OnlyFor(json_type, check)
+
+    checks: List[Any] = []
+    if "type" in schema:
+        checks.append(JSONType(schema["type"]))
+    if "const" in schema:
+        checks.append(JSONConst(schema["const"]))
+    if "enum" in schema:
+        checks.append(JSONEnum(schema["enum"]))
+    for keyword, comparison in _BOUNDS.items():
+        if keyword in schema:
+            checks.append(Bound(schema[keyword], comparison))
+    if "minLength" in schema or "maxLength" in schema:
+        checks.append(only_for("string", Length(min=schema.get("minLength"), max=schema.get("maxLength"))))
+    if "pattern" in schema:
+        checks.append(only_for("string", Matches(schema["pattern"], mode="search")))
+    if schema.keys() & {"properties", "required", "additionalProperties"}:
+        checks.append(only_for("object", _compile_object(schema)))
+    if "minItems" in schema or "maxItems" in schema:
+        checks.append(only_for("array", Length(min=schema.get("minItems"), max=schema.get("maxItems"))))
+    if "items" in schema:
+        if not isinstance(schema["items"], (dict, bool)):
+            raise ValueError("only a single schema is supported for items")
+        items = _compile(schema["items"])
+        if items is not ANY:
+            checks.append(only_for("array", Each(items)))
+    for sub_schema in schema.get("allOf", []):
+        checks.append(_compile(sub_schema))
+
+    checks = [check for check in checks if check is not ANY]
+    if not checks:
+        return ANY
+    return checks[0] if len(checks) == 1 else AllOf(*checks)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_cached(schema_json: str) -> Any:
+    return _compile(json.loads(schema_json))
+
+
+def compile_schema(schema: Union[Dict[str, Any], bool]) -> Any:
+    """
+    the expected structure checking ``schema``, compiled plans are cached by the schema's content and shared, so
+    they must not be modified
+    """
+    return _compile_cached(json.dumps(schema, sort_keys=True))
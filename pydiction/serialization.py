@@ -0,0 +1,179 @@
+import json
+import math
+import reprlib
+from typing import IO, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from pydiction.core import NOT_SET
+from pydiction.utils import KeyIndex, PathIndex
+
+FORMAT_VERSION = 1
+HEADER_KEY = "$pydiction_diff"
+
+
+class ValuePreview(NamedTuple):
+    """a value that had no lossless JSON form, kept as a bounded repr"""
+
+    type: str
+    repr: str
+    truncated: bool = False
+
+
+class DiffRecord(NamedTuple):
+    path: Tuple[Any, ...]
+    message: str
+    actual: Any
+    expected: Any
+
+    @property
+    def key(self) -> Tuple[Tuple[Any, ...], str]:
+        return self.path, self.message
+
+
+def _make_repr(max_length: int) -> reprlib.Repr:
+    r = reprlib.Repr()
+    r.maxlevel = 3
+    r.maxdict = r.maxlist = r.maxtuple = r.maxset = r.maxfrozenset = r.maxdeque = r.maxarray = 10
+    r.maxstring = r.maxother = r.maxlong = max_length
+    return r
+
+
+def encode_value(value: Any, max_length: int = 200, _repr: Optional[reprlib.Repr] = None) -> Any:
+    if value is NOT_SET:
+        return {"$sentinel": "NOT_SET"}
+    if value is None or type(value) in (bool, int):
+        return value
+    if type(value) is float and math.isfinite(value):
+        return value
+    if type(value) is str:
+        if len(value) <= max_length:
+            return value
+        return {"$type": "str", "$repr": value[:max_length], "$truncated": True}
+
+    text = (_repr or _make_repr(max_length)).repr(value)
+    encoded: Dict[str, Any] = {"$type": type(value).__qualname__, "$repr": text[:max_length]}
+    if len(text) > max_length:
+        encoded["$truncated"] = True
+    return encoded
+
+
+def decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if value.get("$sentinel") == "NOT_SET":
+            return NOT_SET
+        if "$repr" in value:
+            return ValuePreview(value["$type"], value["$repr"], value.get("$truncated", False))
+    return value
+
+
+def _encode_path(path: Sequence) -> List[Any]:
+    encoded: List[Any] = []
+    for part in path:
+        if isinstance(part, PathIndex):
+            encoded.append(int(part))
+        elif isinstance(part, KeyIndex):
+            encoded.append({"$key": part.name, "$value": encode_value(part.value)})
+        elif isinstance(part, str):
+            encoded.append(part)
+        else:
+            encoded.append({"$type": type(part).__qualname__, "$repr": repr(part)})
+    return encoded
+
+
+def _decode_path_part(part: Any) -> Any:
+    if isinstance(part, int):
+        return PathIndex(part)
+    if isinstance(part, dict) and "$key" in part:
+        return KeyIndex(part["$key"], decode_value(part["$value"]))
+    return decode_value(part)
+
+
+def _decode_path(path: List[Any]) -> Tuple[Any, ...]:
+    return tuple(_decode_path_part(part) for part in path)
+
+
+def encode_error(
+    error: Tuple[Sequence, str, Any, Any], max_length: int = 200, _repr: Optional[reprlib.Repr] = None
+) -> Dict[str, Any]:
+    """the JSON record of one match error, as written by ``DiffWriter``"""
+    path, message, actual, expected = error
+    _repr = _repr or _make_repr(max_length)
+    return {
+        "path": _encode_path(path),
+        "message": message,
+        "actual": encode_value(actual, max_length, _repr),
+        "expected": encode_value(expected, max_length, _repr),
+    }
+
+
+def decode_error(record: Dict[str, Any]) -> DiffRecord:
+    """the ``DiffRecord`` of a record made by ``encode_error``"""
+    return DiffRecord(
+        _decode_path(record["path"]),
+        record["message"],
+        decode_value(record["actual"]),
+        decode_value(record["expected"]),
+    )
+
+
+class DiffWriter:
+    """
+    write match errors as JSON Lines, one error per line, as they are produced.
+
+    values without a lossless JSON form (operators, ``NOT_SET``, long strings, containers) are written as
+    bounded previews, so each line stays under a few ``max_length`` characters whatever the input size.
+    """
+
+    def __init__(self, fp: IO[str], *, max_length: int = 200, metadata: Optional[Dict[str, Any]] = None):
+        self.fp = fp
+        self.max_length = max_length
+        self.count = 0
+        self._repr = _make_repr(max_length)
+        header: Dict[str, Any] = {HEADER_KEY: FORMAT_VERSION}
+        if metadata:
+            header["metadata"] = metadata
+        self.fp.write(json.dumps(header) + "\n")
+
+    def write(self, error: Tuple[Sequence, str, Any, Any]) -> None:
+        record = encode_error(error, self.max_length, self._repr)
+        self.fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def write_all(self, errors: Iterable[Tuple[Sequence, str, Any, Any]]) -> int:
+        for error in errors:
+            self.write(error)
+        return self.count
+
+
+def read_diff(fp: IO[str]) -> Iterator[DiffRecord]:
+    """read back the records written by ``DiffWriter`` one line at a time"""
+    for line in fp:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if HEADER_KEY in record:
+            if record[HEADER_KEY] != FORMAT_VERSION:
+                raise ValueError(f"unsupported diff format version {record[HEADER_KEY]}")
+            continue
+        yield decode_error(record)
+
+
+def compare_diffs(
+    old: Iterable[DiffRecord], new: Iterable[DiffRecord]
+) -> Tuple[List[DiffRecord], List[DiffRecord]]:
+    """
+    compare two runs by (path, message); returns the records that were fixed and the ones that were introduced.
+    ``new`` is streamed, only one record per key of ``old`` is kept in memory.
+    """
+    old_records: Dict[Tuple[Tuple[Any, ...], str], DiffRecord] = {}
+    for record in old:
+        old_records.setdefault(record.key, record)
+
+    introduced: List[DiffRecord] = []
+    seen = set()
+    for record in new:
+        if record.key in old_records:
+            seen.add(record.key)
+        else:
+            introduced.append(record)
+    fixed = [record for key, record in old_records.items() if key not in seen]
+    return fixed, introduced
@@ -0,0 +1,166 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from pydiction.core import LIST_DIFF_ZIP, NOT_SET, Matcher
+from pydiction.utils import PathIndex
+
+ChangedPath = Union[str, Sequence[Any]]
+
+
+class _ErrorNode:
+    __slots__ = ("errors", "children")
+
+    def __init__(self):
+        self.errors: List[tuple] = []
+        self.children: Dict[Any, "_ErrorNode"] = {}
+
+    def child(self, key) -> "_ErrorNode":
+        node = self.children.get(key)
+        if node is None:
+            node = self.children[key] = _ErrorNode()
+        return node
+
+    def __iter__(self) -> Iterator[tuple]:
+        yield from self.errors
+        for child in self.children.values():
+            yield from child
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """split a JSON pointer (RFC 6901) into its reference tokens"""
+    if not pointer:
+        return []
+    if not pointer.startswith("/"):
+        raise ValueError(f"invalid JSON pointer {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+class MatchSession:
+    """
+    keep the result of matching ``actual`` against ``expected`` and re-evaluate only the subtrees that changed.
+
+    ``update`` takes the paths that were changed in place (as key sequences or JSON pointers), ``update_from_patch``
+    takes the JSON Patch that was applied to ``actual``. The session walks plain dicts and ordered lists down to the
+    deepest node covering each change and re-matches only that node; operators (``Contains``, ...), unordered lists,
+    lists aligned by a ``list_diff="align"`` matcher and values are re-matched as a whole. Inserting or removing list
+    elements shifts the following indices, so notify the list itself for those (``update_from_patch`` does that for
+    ``add``/``remove``/``move``).
+    """
+
+    def __init__(
+        self, actual: Any, expected: Any, matcher: Optional[Matcher] = None, *, strict_keys=True, check_order=True
+    ):
+        self.actual = actual
+        self.expected = expected
+        self.matcher = matcher or Matcher()
+        self.strict_keys = strict_keys
+        self.check_order = check_order
+        self._root = _ErrorNode()
+        self._rematch(self._root, [], actual, expected, check_order)
+
+    @property
+    def errors(self) -> List[tuple]:
+        return list(self._root)
+
+    def update(self, changed_paths: Iterable[ChangedPath]) -> None:
+        paths = [parse_pointer(path) if isinstance(path, str) else list(path) for path in changed_paths]
+        done: List[List[Any]] = []
+        for parts in sorted(paths, key=len):
+            if any(parts[: len(prefix)] == prefix for prefix in done):
+                continue
+            done.append(self._update(parts))
+
+    def update_from_patch(self, patch: Iterable[Dict[str, Any]]) -> None:
+        changed: List[List[str]] = []
+        for operation in patch:
+            op = operation["op"]
+            if op == "test":
+                continue
+            if op == "move":
+                changed.append(self._structural_path(parse_pointer(operation["from"])))
+            if op in ("add", "remove", "move", "copy"):
+                changed.append(self._structural_path(parse_pointer(operation["path"])))
+            else:
+                changed.append(parse_pointer(operation["path"]))
+        self.update(changed)
+
+    def _structural_path(self, parts: List[str]) -> List[str]:
+        """insertions and removals in a list move every following element, so the list itself changed"""
+        if not parts:
+            return parts
+        parent = self.actual
+        for part in parts[:-1]:
+            try:
+                parent = parent[int(part)] if isinstance(parent, list) else parent[part]
+            except (KeyError, IndexError, ValueError, TypeError):
+                return parts[:-1]
+        return parts[:-1] if isinstance(parent, list) else parts
+
+    def _update(self, parts: List[Any]) -> List[Any]:
+        """re-match the deepest node covering ``parts`` and return the path that was re-matched"""
+        actual, expected = self.actual, self.expected
+        check_order = self.check_order
+        node = self._root
+        path: List[Any] = []
+        for part in parts:
+            if isinstance(actual, dict) and isinstance(expected, dict):
+                if part not in actual or part not in expected:
+                    node.children.pop(part, None)
+                    self._rematch_key(node, path, actual, expected, part)
+                    return path + [part]
+                actual, expected = actual[part], expected[part]
+                check_order = False
+            elif (
+                isinstance(actual, list)
+                and isinstance(expected, list)
+                and check_order
+                and self.matcher.list_diff == LIST_DIFF_ZIP
+            ):
+                self._refresh_length(node, path, actual, expected)
+                try:
+                    position = int(part)
+                except ValueError:
+                    return path
+                index = PathIndex(position)
+                if not 0 <= position < min(len(actual), len(expected)):
+                    node.children.pop(index, None)
+                    return path + [index]
+                part = index
+                actual, expected = actual[position], expected[position]
+            else:
+                break
+            path.append(part)
+            node = node.child(part)
+
+        node.errors = []
+        node.children = {}
+        self._rematch(node, path, actual, expected, check_order)
+        return path
+
+    def _rematch(self, node: _ErrorNode, path: List[Any], actual: Any, expected: Any, check_order: bool) -> None:
+        errors = self.matcher.iter_match(actual, expected, path, strict_keys=self.strict_keys, check_order=check_order)
+        self._add(node, len(path), errors)
+
+    def _rematch_key(self, node: _ErrorNode, path: List[Any], actual: dict, expected: dict, key: Any) -> None:
+        key_path = path + [key]
+        errors: Iterable[Tuple[Sequence, str, Any, Any]]
+        if key in actual:
+            errors = [(key_path, "not expected", actual[key], NOT_SET)]
+        elif key in expected:
+            errors = [(key_path, "not found", NOT_SET, expected[key])]
+        else:
+            return
+        self._add(node, len(path), errors)
+
+    @staticmethod
+    def _refresh_length(node: _ErrorNode, path: List[Any], actual: list, expected: list) -> None:
+        node.errors = [error for error in node.errors if error[1] != "Lists have different lengths"]
+        if len(actual) != len(expected):
+            node.errors.append((list(path), "Lists have different lengths", len(actual), len(expected)))
+
+    @staticmethod
+    def _add(node: _ErrorNode, depth: int, errors: Iterable[Tuple[Sequence, str, Any, Any]]) -> None:
+        for error in errors:
+            target = node
+            for part in error[0][depth:]:
+                target = target.child(part)
+            target.errors.append(error)
@@ -0,0 +1,171 @@
+from collections import Counter
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union, overload
+
+from pydiction.core import Contains, DoesntContains, Each, KeyedList, Matcher
+from pydiction.utils import is_literal, sentinel
+
+Path = Tuple[Any, ...]
+
+# the payload can't be checked at this path without matching it (not a dict, list or JSON scalar)
+_UNDECIDED: object = sentinel("UNDECIDED")
+_MISSING: object = sentinel("MISSING")
+
+
+def _is_json(value: Any) -> bool:
+    return isinstance(value, (dict, list)) or is_literal(value)
+
+
+def _lookup(payload: Any, path: Path) -> Any:
+    node = payload
+    for key in path:
+        if not isinstance(node, dict):
+            return _MISSING if _is_json(node) else _UNDECIDED
+        if key not in node:
+            return _MISSING
+        node = node[key]
+    return node
+
+
+class _Template:
+    """a registered template and the features any payload matching it must have"""
+
+    __slots__ = ("name", "order", "expected", "strict_keys", "check_order", "kinds", "key_sets", "required", "literals")
+
+    def __init__(self, name: str, order: int, expected: Any, strict_keys: bool, check_order: bool):
+        self.name = name
+        self.order = order
+        self.expected = expected
+        self.strict_keys = strict_keys
+        self.check_order = check_order
+        self.kinds: List[Tuple[Path, type]] = []
+        self.key_sets: List[Tuple[Path, frozenset]] = []
+        self.required: List[Path] = []
+        self.literals: List[Tuple[Path, Any]] = []
+        self._analyze(expected, ())
+
+    def _analyze(self, expected: Any, path: Path) -> None:
+        if type(expected) is dict:
+            # plain dicts are matched with their exact key set
+            self.kinds.append((path, dict))
+            self.key_sets.append((path, frozenset(expected)))
+            for key, value in expected.items():
+                self._analyze(value, path + (key,))
+        elif isinstance(expected, Contains) and isinstance(expected.iterable, dict) and not expected.recursive:
+            self.kinds.append((path, dict))
+            for key, value in expected.iterable.items():
+                if isinstance(value, (Contains, DoesntContains)):
+                    continue
+                self.required.append(path + (key,))
+                if expected.check_pairs:
+                    self._analyze(value, path + (key,))
+        elif type(expected) is list or isinstance(expected, (KeyedList, Each)):
+            self.kinds.append((path, list))
+        elif isinstance(expected, Contains) and isinstance(expected.iterable, list):
+            self.kinds.append((path, list))
+        elif is_literal(expected):
+            self.literals.append((path, expected))
+
+    def admits(self, payload: Any) -> bool:
+        """False if ``payload`` can't match, True if it has to be matched to know"""
+        for path, kind in self.kinds:
+            node = _lookup(payload, path)
+            if node is _MISSING or (_is_json(node) and not isinstance(node, kind)):
+                return False
+        for path, keys in self.key_sets:
+            node = _lookup(payload, path)
+            if isinstance(node, dict) and node.keys() != keys:
+                return False
+        for path in self.required:
+            if _lookup(payload, path) is _MISSING:
+                return False
+        for path, value in self.literals:
+            node = _lookup(payload, path)
+            if node is _MISSING or (_is_json(node) and node != value):
+                return False
+        return True
+
+
+class TemplateSet:
+    """
+    find which of many registered templates a payload matches.
+
+    each template is analyzed at registration for features a matching payload must have: the container type and the
+    exact key set of plain dicts, the keys required by ``Contains`` and the literal values at fixed paths. templates
+    are bucketed by their literal at the path shared by the most templates (a ``"type"`` field, say), so a payload
+    only looks up its own value there; the survivors are checked against their features and only the remaining ones
+    are fully matched. the features assume the default dict, list and value comparators; objects other than dicts,
+    lists and JSON scalars in the payload are never filtered out.
+    """
+
+    def __init__(self, matcher: Optional[Matcher] = None):
+        self.matcher = matcher or Matcher()
+        self._templates: Dict[str, _Template] = {}
+        self._buckets: Optional[Dict[Path, Dict[Any, List[_Template]]]] = None
+        self._unbucketed: List[_Template] = []
+
+    def register(self, name: str, expected: Any, *, strict_keys=True, check_order=True) -> None:
+        previous = self._templates.get(name)
+        order = previous.order if previous is not None else len(self._templates)
+        self._templates[name] = _Template(name, order, expected, strict_keys, check_order)
+        self._buckets = None
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._templates
+
+    def _build(self) -> Dict[Path, Dict[Any, List[_Template]]]:
+        shared = Counter(path for template in self._templates.values() for path, _ in set(template.literals))
+        buckets: Dict[Path, Dict[Any, List[_Template]]] = {}
+        self._unbucketed = []
+        for template in self._templates.values():
+            if not template.literals:
+                self._unbucketed.append(template)
+                continue
+            path, value = max(template.literals, key=lambda literal: (shared[literal[0]], -len(literal[0])))
+            buckets.setdefault(path, {}).setdefault(value, []).append(template)
+        return buckets
+
+    def _candidates(self, payload: Any) -> List[_Template]:
+        if self._buckets is None:
+            self._buckets = self._build()
+        candidates = list(self._unbucketed)
+        for path, bucket in self._buckets.items():
+            value = _lookup(payload, path)
+            if is_literal(value):
+                candidates.extend(bucket.get(value, ()))
+            elif value is not _MISSING and not _is_json(value):
+                # undecided, or an object (an enum, a Decimal) that may compare equal to the literal of any bucket
+                candidates.extend(template for templates in bucket.values() for template in templates)
+        candidates.sort(key=lambda template: template.order)
+        return [template for template in candidates if template.admits(payload)]
+
+    def candidates(self, payload: Any) -> List[str]:
+        """names of the templates left to be fully matched after the prefilter"""
+        return [template.name for template in self._candidates(payload)]
+
+    @overload
+    def match(self, payload: Any, with_diffs: Literal[False] = False) -> List[str]:  # pragma: no cover
+        ...
+
+    @overload
+    def match(self, payload: Any, with_diffs: Literal[True]) -> Dict[str, list]:  # pragma: no cover
+        ...
+
+    def match(self, payload: Any, with_diffs=False) -> Union[List[str], Dict[str, list]]:
+        """
+        names of the templates ``payload`` matches, in registration order. with ``with_diffs`` returns the errors of
+        every template that went through the full match instead (empty for the ones that matched).
+        """
+        matched: List[str] = []
+        diffs: Dict[str, list] = {}
+        for template in self._candidates(payload):
+            errors = self.matcher.iter_match(
+                payload, template.expected, [], strict_keys=template.strict_keys, check_order=template.check_order
+            )
+            if with_diffs:
+                diffs[template.name] = list(errors)
+            elif next(errors, None) is None:
+                matched.append(template.name)
+        return diffs if with_diffs else matched
@@ -1,2 +1,46 @@
+from typing import Any
+
+
 def sentinel(name: str):
     return type(name, (object,), {"__repr__": lambda x: f"<{name}>"})()
+
+
+_LITERAL_TYPES = (str, int, float, bool, type(None))
+
+
+def is_literal(value) -> bool:
+    """plain JSON scalars, compared by value and usable as lookup keys"""
+    return type(value) in _LITERAL_TYPES
+
+
+class PathIndex(str):
+    """a list index in a match path, so it can be told apart from a dict key made of digits"""
+
+    __slots__ = ()
+
+    def __new__(cls, index: int):
+        return super().__new__(cls, index)
+
+
+class KeyIndex(str):
+    """a list element addressed by its identity key, rendered as ``[key=value]``"""
+
+    name: str
+    value: Any
+
+    def __new__(cls, name: str, value):
+        self = super().__new__(cls, f"[{name}={value}]")
+        self.name = name
+        self.value = value
+        return self
+
+
+def format_path(path) -> str:
+    """join a match path with dots, keyed elements are attached to their list: ``items[id=42].price``"""
+    formatted = ""
+    for part in path:
+        if isinstance(part, KeyIndex) or not formatted:
+            formatted += str(part)
+        else:
+            formatted += "." + str(part)
+    return formatted
@@ -0,0 +1,124 @@
+import pytest
+
+from pydiction import ANY_NOT_NONE, Contains, KeyedList
+from pydiction.aggregation import ErrorAggregator, normalize_path
+from pydiction.core import NOT_SET
+from pydiction.utils import PathIndex
+
+
+@pytest.mark.parametrize(
+    "path, pattern, indices",
+    (
+        ([], (), ()),
+        (["a", "b"], ("a", "b"), ()),
+        (["items", PathIndex(12), "price"], ("items", "*", "price"), (12,)),
+        ([PathIndex(0), "a", PathIndex(3)], ("*", "a", "*"), (0, 3)),
+        (["2023", "v"], ("2023", "v"), ()),
+    ),
+)
+def test_normalize_path(path, pattern, indices):
+    assert normalize_path(path) == (pattern, indices)
+
+
+def test_diff_aggregate_groups_list_elements(matcher):
+    actual = [{"id": i, "price": -1} for i in range(1000)]
+    expected = [{"id": ANY_NOT_NONE, "price": 1} for _ in range(1000)]
+
+    groups = matcher.get_declarative_diff(actual, expected, aggregate=True)
+
+    assert len(groups) == 1
+    group = groups[0]
+    assert group.path == "*.price"
+    assert group.message == "does not match"
+    assert group.count == 1000
+    assert group.examples == [(0,), (1,), (2,)]
+    assert group.samples == [(-1, 1)] * 3
+
+
+def test_diff_aggregate_separates_messages(matcher):
+    actual = [{"a": 1, "b": 2}, {"b": 2}, {"a": 2}]
+    expected = [{"a": 1}, {"a": 1}, {"a": 1}]
+
+    groups = matcher.get_declarative_diff(actual, expected, aggregate=True)
+
+    assert {(g.path, g.message): g.count for g in groups} == {
+        ("*.b", "not expected"): 2,
+        ("*.a", "not found"): 1,
+        ("*.a", "does not match"): 1,
+    }
+
+
+def test_diff_aggregate_without_errors(matcher):
+    assert matcher.get_declarative_diff({"a": 1}, Contains({"a": 1}), aggregate=True) == []
+    matcher.assert_declarative_object({"a": 1}, {"a": 1}, aggregate=True)
+
+
+def test_assert_aggregate_message(matcher):
+    actual = [{"price": 0} for _ in range(500)]
+    expected = [{"price": 1} for _ in range(500)]
+
+    with pytest.raises(AssertionError) as e:
+        matcher.assert_declarative_object(actual, expected, aggregate=True)
+
+    message = str(e.value)
+    assert message.count("\n") == 1
+    assert "('*.price', 'does not match', 0, 1) [500 occurrences, e.g. indices [0], [1], [2]]" in message
+
+
+def test_diff_aggregate_keeps_numeric_dict_keys(matcher):
+    groups = matcher.get_declarative_diff(
+        {"2023": {"v": 1}, "2024": {"v": 1}}, {"2023": {"v": 2}, "2024": {"v": 2}}, aggregate=True
+    )
+
+    assert sorted((g.path, g.count, g.examples) for g in groups) == [("2023.v", 1, [()]), ("2024.v", 1, [()])]
+
+
+def test_assert_aggregate_message_without_indices(matcher):
+    with pytest.raises(AssertionError) as e:
+        matcher.assert_declarative_object({"a": 1}, {"a": 2}, aggregate=True)
+
+    assert str(e.value) == "\n('a', 'does not match', 1, 2) [1 occurrences]"
+
+
+def test_contains_streams_errors(matcher):
+    actual = {"a": {"b": 1, "c": 2}, "d": [{"x": 1}]}
+    expected = Contains({"a": Contains({"b": 2, "c": 3}), "d": Contains([{"x": 2}])})
+
+    errors = matcher.iter_match(actual, expected, [])
+    assert next(errors) == (["a", "b"], "does not match", 1, 2)
+    assert [e[0] for e in errors] == [["a", "c"], ["d", "0"]]
+
+
+def test_aggregator_bounds():
+    aggregator = ErrorAggregator(max_examples=1, max_samples=2, max_groups=2)
+    aggregator.extend((["a", PathIndex(i)], "not found", NOT_SET, i) for i in range(100))
+    aggregator.add((["b"], "not found", NOT_SET, 1))
+    aggregator.add((["c"], "not found", NOT_SET, 1))
+    aggregator.add((["d"], "not found", NOT_SET, 1))
+
+    groups = aggregator.groups
+    assert [g.path for g in groups] == ["a.*", "b"]
+    assert groups[0].count == 100
+    assert groups[0].examples == [(0,)]
+    assert groups[0].samples == [(NOT_SET, 0), (NOT_SET, 1)]
+    assert aggregator.overflow == 2
+
+
+def test_iter_match_is_lazy(matcher):
+    actual = [i for i in range(100)]
+    expected = [-1 for _ in range(100)]
+
+    errors = matcher.iter_match(actual, expected, [])
+    assert next(errors) == (["0"], "does not match", 0, -1)
+    assert next(errors) == (["1"], "does not match", 1, -1)
+
+
+def test_diff_aggregate_keyed_list(matcher):
+    actual = [{"id": i, "price": 0} for i in range(10)]
+    expected = KeyedList([{"id": i, "price": 1} for i in range(10)])
+
+    (group,) = matcher.get_declarative_diff(actual, expected, aggregate=True)
+
+    assert group.path == "[id=*].price"
+    assert group.count == 10
+    assert group.examples == [(0,), (1,), (2,)]
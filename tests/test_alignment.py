@@ -0,0 +1,99 @@
+import pytest
+
+from pydiction import Contains, Expect, Matcher
+from pydiction.alignment import Hunk, align
+from pydiction.core import NOT_SET
+from pydiction.session import MatchSession
+
+matcher = Matcher(list_diff="align")
+
+
+def lcs_length(a, b):
+    lengths = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            lengths[i + 1][j + 1] = lengths[i][j] + 1 if x == y else max(lengths[i][j + 1], lengths[i + 1][j])
+    return lengths[-1][-1]
+
+
+@pytest.mark.parametrize(
+    "actual, expected",
+    (
+        ("abcabba", "cbabac"),
+        ("", "abc"),
+        ("abc", ""),
+        ("abcdef", "abcdef"),
+        ("xabcdef", "abcdefy"),
+        ("aaaa", "aa"),
+        ("abcd", "wxyz"),
+    ),
+)
+def test_align_is_minimal(actual, expected):
+    hunks = align(list(actual), list(expected))
+    i = j = 0
+    for hunk in hunks:
+        assert actual[i : hunk.actual_start] == expected[j : hunk.expected_start]
+        i, j = hunk.actual_end, hunk.expected_end
+    assert actual[i:] == expected[j:]
+    assert len(actual) - sum(hunk.actual_end - hunk.actual_start for hunk in hunks) == lcs_length(actual, expected)
+
+
+def test_align_hunks():
+    assert align([1, 2, 3, 4], [1, 3, 4]) == [Hunk(1, 2, 1, 1)]
+    assert [hunk.kind for hunk in align([0, 1, 9, 3], [1, 2, 3, 4])] == ["insert", "change", "delete"]
+
+
+def test_align_too_far_apart():
+    assert align(list(range(10)), list(range(10, 20)), max_distance=5) == [Hunk(0, 10, 0, 10)]
+
+
+def test_aligned_insertion_in_long_list():
+    expected = [{"id": i, "tags": ["a"]} for i in range(10_000)]
+    actual = expected[:3] + [{"id": "new"}] + expected[3:]
+    assert matcher.match(actual, expected, []) == [
+        ([], "Lists have different lengths", 10_001, 10_000),
+        (["3"], "not expected", {"id": "new"}, NOT_SET),
+    ]
+    assert len(Matcher().match(actual, expected, [])) > 9_000
+
+
+def test_aligned_change_recurses_into_pairs():
+    expected = [{"id": 1, "v": 1}, {"id": 2, "v": 2}, {"id": 3, "v": 3}]
+    actual = [{"id": 1, "v": 1}, {"id": 2, "v": 5}, {"id": 3, "v": 3}]
+    assert matcher.match(actual, expected, ["items"]) == [(["items", "1", "v"], "does not match", 5, 2)]
+
+
+def test_aligned_operator_items():
+    expected = [Contains({"id": i}) for i in range(20)] + [Expect(0).__gt__]
+    actual = [{"id": i, "extra": True} for i in range(20) if i != 7] + [5]
+    assert matcher.match(actual, expected, []) == [
+        ([], "Lists have different lengths", 20, 21),
+        (["7"], "not found", NOT_SET, expected[7]),
+    ]
+
+
+def test_aligned_nested_lists_and_options():
+    assert matcher.match({"a": [[1, 2], [3]]}, {"a": [[1, 2], [3]]}, []) == []
+    # not equal, but matching: lists inside dicts are compared ignoring order
+    assert matcher.match([0, {"a": [2, 1]}, {"b": 1}], [{"a": [1, 2]}, {"b": 1}], []) == [
+        ([], "Lists have different lengths", 3, 2),
+        (["0"], "not expected", 0, NOT_SET),
+    ]
+    # unordered comparisons are unchanged
+    assert matcher.match([2, 1], [1, 2], [], check_order=False) == []
+
+
+def test_list_diff_option():
+    with pytest.raises(ValueError):
+        Matcher(list_diff="myers")
+
+
+def test_session_with_aligned_lists():
+    actual = [[1, 2, 3]]
+    session = MatchSession(actual, [[1, 2, 3]], matcher)
+    actual[0].insert(0, 0)
+    session.update(["/0/0"])
+    assert session.errors == [
+        (["0"], "Lists have different lengths", 4, 3),
+        (["0", "0"], "not expected", 0, NOT_SET),
+    ]
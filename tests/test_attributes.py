@@ -0,0 +1,187 @@
+import dataclasses
+import fractions
+import pathlib
+import uuid
+from typing import List, NamedTuple, Optional
+
+import pytest
+
+from pydiction import ANY_NOT_NONE, Contains, DoesntContains, Matcher
+from pydiction.attributes import AttributeView, FieldsObject, as_mapping, fields_of
+from pydiction.core import NOT_SET
+
+
+@dataclasses.dataclass
+class Address:
+    city: str
+    zip: str
+
+
+@dataclasses.dataclass
+class User:
+    id: int
+    name: str
+    address: Address
+    tags: List[str] = dataclasses.field(default_factory=list)
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+class Slotted:
+    __slots__ = ("a", "__hidden")
+
+    def __init__(self, a, hidden=None):
+        self.a = a
+        if hidden is not None:
+            self.__hidden = hidden
+
+
+class SlottedChild(Slotted):
+    __slots__ = ("b",)
+
+    def __init__(self, a, b):
+        super().__init__(a)
+        self.b = b
+
+
+class AttrsField:
+    def __init__(self, name):
+        self.name = name
+
+
+class AttrsLike:
+    __attrs_attrs__ = (AttrsField("x"), AttrsField("y"))
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class Plain:
+    def __init__(self):
+        self.a = 1
+
+
+class Internal:
+    __slots__ = ("_value",)
+
+
+@pytest.mark.parametrize(
+    "cls, fields",
+    (
+        (User, ["id", "name", "address", "tags"]),
+        (Point, ["x", "y"]),
+        (Slotted, ["a", "__hidden"]),
+        (SlottedChild, ["a", "__hidden", "b"]),
+        (AttrsLike, ["x", "y"]),
+        (Plain, None),
+        (Internal, None),
+        (uuid.UUID, None),
+        (fractions.Fraction, None),
+        (pathlib.PurePosixPath, None),
+        (dict, None),
+        (str, None),
+        (int, None),
+    ),
+)
+def test_fields_of(cls, fields):
+    found = fields_of(cls)
+    assert (list(found) if found is not None else None) == fields
+    assert issubclass(cls, FieldsObject) is (fields is not None)
+
+
+def test_fields_are_resolved_once_per_class():
+    assert fields_of(Address) is fields_of(Address)
+
+
+def test_attribute_view():
+    view = AttributeView(Slotted(1))
+    assert dict(view) == {"a": 1}
+    assert "__hidden" not in view and "missing" not in view
+    with pytest.raises(KeyError):
+        view["__hidden"]
+    assert dict(AttributeView(Slotted(1, hidden=2))) == {"a": 1, "__hidden": 2}
+    assert as_mapping({"a": 1}) == {"a": 1}
+
+
+def make_user(**kwargs):
+    values = dict(id=1, name="John", address=Address("Paris", "75001"), tags=["a"])
+    values.update(kwargs)
+    return User(**values)
+
+
+def test_match_dataclass(matcher: Matcher):
+    expected = {"id": 1, "name": ANY_NOT_NONE, "address": {"city": "Paris", "zip": "75001"}, "tags": ["a"]}
+    matcher.assert_declarative_object(make_user(), expected)
+
+
+def test_match_dataclass_errors(matcher: Matcher):
+    user = make_user(address=Address("Lyon", "69001"))
+    errors = matcher.get_declarative_diff(user, {"id": 2, "address": {"city": "Paris", "zip": "69001"}})
+    assert sorted(errors, key=repr) == sorted(
+        [
+            (["name"], "not expected", "John", NOT_SET),
+            (["tags"], "not expected", ["a"], NOT_SET),
+            (["id"], "does not match", 1, 2),
+            (["address", "city"], "does not match", "Lyon", "Paris"),
+        ],
+        key=repr,
+    )
+
+
+def test_match_fields_contains(matcher: Matcher):
+    matcher.assert_declarative_object(make_user(), Contains({"id": 1, "address": Contains({"city": "Paris"})}))
+    matcher.assert_declarative_object(make_user(), DoesntContains({"id": 2}))
+    errors = matcher.get_declarative_diff(make_user(), DoesntContains({"id": 1}))
+    assert errors == [([], "should not contain id", 1, 1)]
+    errors = matcher.get_declarative_diff(make_user(), Contains({"address": Contains({"city": "Lyon"})}))
+    assert errors == [(["address", "city"], "does not match", "Paris", "Lyon")]
+
+
+def test_match_fields_in_lists(matcher: Matcher):
+    points = [Point(1, 2), Point(3, 4)]
+    matcher.assert_declarative_object(points, [{"x": 1, "y": 2}, {"x": 3, "y": 4}])
+    errors = matcher.get_declarative_diff(points, [{"x": 1, "y": 2}, {"x": 3, "y": 5}])
+    assert errors == [(["1", "y"], "does not match", 4, 5)]
+    matcher.assert_declarative_object(points, Contains([{"x": 3, "y": 4}]))
+
+
+@pytest.mark.parametrize(
+    "actual, expected, errors",
+    (
+        (SlottedChild(1, 2), {"a": 1, "b": 2}, []),
+        (AttrsLike(1, None), {"x": 1, "y": None}, []),
+        (Point(1, 2), {"x": 1}, [(["y"], "not expected", 2, NOT_SET)]),
+    ),
+)
+def test_match_slots_and_attrs(matcher: Matcher, actual, expected, errors):
+    assert matcher.get_declarative_diff(actual, expected) == errors
+
+
+def test_unset_slot_is_not_found(matcher: Matcher):
+    errors = matcher.get_declarative_diff(Slotted(1), {"a": 1, "__hidden": 2})
+    assert errors == [(["__hidden"], "not found", NOT_SET, 2)]
+
+
+def test_match_fields_does_not_build_dicts(matcher: Matcher, monkeypatch):
+    def fail(*_, **__):
+        raise AssertionError("asdict called")
+
+    monkeypatch.setattr(dataclasses, "asdict", fail)
+    matcher.assert_declarative_object(make_user(), Contains({"name": "John"}))
+
+
+def test_plain_objects_are_still_compared_by_value(matcher: Matcher):
+    value: Optional[Plain] = Plain()
+    errors = matcher.get_declarative_diff({"a": value}, {"a": {"a": 1}})
+    assert errors == [(["a"], "does not match", value, {"a": 1})]
+
+
+def test_stdlib_slotted_values_are_compared_by_value(matcher: Matcher):
+    value = uuid.UUID(int=1)
+    assert matcher.get_declarative_diff({"id": value}, {"id": {"int": 1, "is_safe": value.is_safe}})
+    assert matcher.get_declarative_diff({"id": value}, {"id": uuid.UUID(int=1)}) == []
+    assert as_mapping(value) is value
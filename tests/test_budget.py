@@ -0,0 +1,90 @@
+import time
+
+import pytest
+
+from pydiction import AllOf, Contains, Each, Length, Matcher, Matches
+from pydiction.budget import MAX_ERRORS, MAX_NODES, MAX_TIME, MAX_UNORDERED_LENGTH, Budget, BudgetedMatcher
+
+matcher = Matcher()
+
+
+def test_budget_unlimited():
+    result = matcher.match_with_budget({"a": [1, 2]}, {"a": [1, 3]}, Budget())
+    assert result.complete
+    assert result.errors == list(matcher.iter_match({"a": [1, 2]}, {"a": [1, 3]}, []))
+    assert result.usage.nodes == 4 and result.usage.errors == 1 and result.usage.exhausted is None
+
+
+def test_budget_max_nodes():
+    result = matcher.match_with_budget(list(range(100)), [-1] + list(range(1, 100)), Budget(max_nodes=10))
+    assert not result.complete
+    assert result.usage.exhausted == MAX_NODES and result.usage.nodes == 11
+    assert result.errors == [(["0"], "does not match", 0, -1)]
+
+
+def test_budget_max_time():
+    # 12! permutations would never finish
+    start = time.perf_counter()
+    result = matcher.match_with_budget(
+        list(range(12)), list(range(12, 0, -1)), Budget(max_time=0.05), check_order=False
+    )
+    assert time.perf_counter() - start < 1
+    assert not result.complete and result.errors == []
+    assert result.usage.exhausted == MAX_TIME and result.usage.seconds >= 0.05
+
+
+def test_budget_max_unordered_length_skips_list():
+    actual = {"big": list(range(12)), "small": [1, 2], "id": 1}
+    expected = {"big": list(range(12, 0, -1)), "small": [2, 3], "id": 2}
+    result = matcher.match_with_budget(actual, expected, Budget(max_unordered_length=8), check_order=False)
+    assert not result.complete and result.usage.exhausted == MAX_UNORDERED_LENGTH
+    assert [error[0] for error in result.errors] == [["small"], ["id"]]
+
+    # ordered comparisons aren't limited
+    result = matcher.match_with_budget(actual["big"], expected["big"], Budget(max_unordered_length=8))
+    assert result.complete and len(result.errors) == 11
+
+
+@pytest.mark.parametrize("count, complete", ((2, False), (3, True)))
+def test_budget_max_errors(count, complete):
+    result = matcher.match_with_budget({"a": 1, "b": 2, "c": 3}, {"a": 0, "b": 0, "c": 0}, Budget(max_errors=count))
+    assert len(result.errors) == min(count, 3)
+    assert result.complete is complete
+    assert result.usage.exhausted == (None if complete else MAX_ERRORS)
+
+
+def test_budget_counts_operators():
+    expected = Contains({"items": Each({"id": int})})
+    result = matcher.match_with_budget({"items": [{"id": i} for i in range(50)]}, expected, Budget(max_nodes=20))
+    assert not result.complete and result.usage.exhausted == MAX_NODES
+
+
+def test_budgeted_matcher_uses_registry():
+    class Custom(Matcher):
+        pass
+
+    custom = Custom()
+    custom.register(str, int, lambda actual, expected, path, matcher, **_: iter(()))
+    assert custom.match_with_budget("1", 1, Budget()).errors == []
+    assert BudgetedMatcher(Budget()).run("1", 1).errors
+
+
+@pytest.mark.parametrize("budget, limit", ((Budget(max_nodes=10), MAX_NODES), (Budget(max_time=0.01), MAX_TIME)))
+def test_budget_counts_predicate_elements(budget, limit):
+    start = time.perf_counter()
+    result = matcher.match_with_budget(["x"] * 3_000_000, Each(Matches(r"\d")), budget)
+    assert time.perf_counter() - start < 1
+    assert not result.complete and result.usage.exhausted == limit
+
+
+def test_budget_counts_all_of_predicates():
+    result = matcher.match_with_budget("abc", AllOf(Matches("a"), Length(max=5)), Budget())
+    assert result.complete and result.usage.nodes == 3
+
+
+def test_budget_contains_eq_uses_budgeted_matcher():
+    custom = Matcher()
+    custom.register(str, int, lambda actual, expected, path, matcher, **_: iter(()))
+    result = custom.match_with_budget([{"id": "1"}], [Contains({"id": 1})], Budget(), check_order=False)
+    assert result.complete and result.errors == []
+    assert result.usage.nodes == 3
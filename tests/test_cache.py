@@ -0,0 +1,175 @@
+import json
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from pydiction import ANY_NOT_NONE, Contains, Each, Expect, Matcher, Matches, OneOf
+from pydiction.cache import MatchCache, content_hash, fingerprint
+from pydiction.operators import Predicate
+from pydiction.serialization import DiffRecord
+
+EXPECTED = {"id": ANY_NOT_NONE, "name": Matches(r"[a-z]+"), "tags": Each(str), "kind": OneOf(["a", "b"])}
+
+
+class Check(Predicate):
+    def __call__(self, actual):
+        return self.expected(actual)
+
+
+def _match_in_worker(args):
+    directory, i = args
+    with MatchCache(directory) as cache:
+        return cache.match({"id": i % 5, "name": "x", "tags": [], "kind": "c"}, EXPECTED)
+
+
+def test_cache_hit_skips_match(tmp_path, monkeypatch):
+    cache = MatchCache(str(tmp_path))
+    actual = {"id": 1, "name": "John", "tags": ["a"], "kind": "a"}
+    expected_errors = [DiffRecord(("name",), "does not match pattern", "John", "[a-z]+")]
+
+    assert cache.match(actual, EXPECTED) == expected_errors
+    monkeypatch.setattr(cache.matcher, "match", lambda *args, **kwargs: pytest.fail("not cached"))
+    assert cache.match(json.loads(json.dumps(actual)), EXPECTED) == expected_errors
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.bypassed, stats.entries) == (1, 1, 0, 1)
+
+    # persisted for other instances (and processes)
+    other = MatchCache(str(tmp_path))
+    assert other.match(actual, EXPECTED) == expected_errors
+    assert other.stats.hits == 1
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    (
+        ({"a": Matches("x")}, {"a": Matches("y")}),
+        ({"a": Contains({"b": 1})}, {"a": Contains({"b": 1}, recursive=True)}),
+        ({"a": Check(lambda v: v > 1)}, {"a": Check(lambda v: v > 2)}),
+        ({"a": Expect(1).__gt__}, {"a": Expect(1).__ge__}),
+        ({"a": Expect(1).__gt__}, {"a": Expect(2).__gt__}),
+        ({"a": 1, "b": 2}, {"b": 2, "a": 1}),
+        ({"a": 1}, {"a": 1.0}),
+        ({"a": [1]}, {"a": (1,)}),
+    ),
+)
+def test_fingerprint_changes(first, second):
+    assert fingerprint(first) != fingerprint(second)
+    assert fingerprint(first) == fingerprint(first)
+
+
+def test_fingerprint_is_stable_across_processes():
+    code = (
+        "from pydiction import Contains, Matches, OneOf; from pydiction.cache import fingerprint; "
+        "print(fingerprint({'a': Contains({'b': Matches('x')}), 'c': OneOf({1, 'x', 2.5})}))"
+    )
+    digests = {
+        subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, env={"PYTHONHASHSEED": seed}, check=True
+        ).stdout.strip()
+        for seed in ("1", "2")
+    }
+    assert digests == {fingerprint({"a": Contains({"b": Matches("x")}), "c": OneOf({1, "x", 2.5})})}
+
+
+def test_cache_key_is_stable_across_processes(tmp_path):
+    code = (
+        "import sys; from pydiction import Each; from pydiction.cache import MatchCache; "
+        "print(MatchCache(sys.argv[1]).key({'a': [1]}, {'a': Each(int)}))"
+    )
+    result = subprocess.run([sys.executable, "-c", code, str(tmp_path)], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == MatchCache(str(tmp_path)).key({"a": [1]}, {"a": Each(int)})
+
+
+def test_cache_key(tmp_path):
+    cache = MatchCache(str(tmp_path))
+    key = cache.key({"a": 1}, {"a": 1})
+    assert key == cache.key({"a": 1}, {"a": 1})
+    assert key != cache.key({"a": 2}, {"a": 1})
+    assert key != cache.key({"a": 1}, {"a": 1}, check_order=False)
+    assert cache.key({"a": object()}, {"a": 1}) is None
+    assert cache.key({"a": 1}, {"a": object()}) is None
+
+    matcher = Matcher()
+    custom = MatchCache(str(tmp_path), matcher=matcher)
+    assert custom.key({"a": 1}, {"a": 1}) == key
+    matcher.register(str, int, lambda actual, expected, path, matcher, **_: iter(()))
+    assert custom.key({"a": 1}, {"a": 1}) != key
+
+
+def test_cache_bypass(tmp_path):
+    cache = MatchCache(str(tmp_path))
+    errors = cache.match({"a": {1, 2}}, {"a": {1, 2, 3}})
+    assert [(error.path, error.message) for error in errors] == [(("a",), "does not match")]
+    assert cache.stats.bypassed == 1 and cache.stats.entries == 0
+
+
+def test_cache_eviction(tmp_path):
+    cache = MatchCache(str(tmp_path), max_bytes=2_000)
+    for i in range(50):
+        cache.match({"id": i}, {"id": -1})
+    stats = cache.stats
+    assert stats.evictions > 0 and stats.size <= 2_000
+    assert stats.entries + stats.evictions == 50
+    # the most recent entries are kept
+    cache.match({"id": 49}, {"id": -1})
+    assert cache.stats.hits == 1
+
+
+def test_cache_match_file(tmp_path):
+    path = tmp_path / "actual.json"
+    path.write_text(json.dumps({"items": [{"id": 1}, {"id": 2}], "total": 2}))
+    cache = MatchCache(str(tmp_path / "cache"))
+    assert cache.match_file(str(path), {"items": Each({"id": int}), "total": 3}) == [
+        DiffRecord(("total",), "does not match", 2, 3)
+    ]
+    assert cache.match_file(str(path), {"items": Each({"id": int}), "total": 3})[0].actual == 2
+    assert cache.stats.hits == 1
+
+    path.write_text(json.dumps({"items": [], "total": 3}))
+    assert cache.match_file(str(path), {"items": Each({"id": int}), "total": 3}) == []
+    assert cache.stats.misses == 2
+
+
+def test_cache_assert_match(tmp_path):
+    cache = MatchCache(str(tmp_path))
+    cache.assert_match({"a": 1}, {"a": 1})
+    with pytest.raises(AssertionError, match="does not match"):
+        cache.assert_match({"a": 1}, {"a": 2})
+    cache.clear()
+    assert cache.stats.entries == 0
+
+
+def test_cache_concurrent_processes(tmp_path):
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(_match_in_worker, [(str(tmp_path), i) for i in range(40)]))
+    assert all(result == [DiffRecord(("kind",), "not one of", "c", results[0][0].expected)] for result in results)
+    assert MatchCache(str(tmp_path)).stats.entries == 5
+
+
+def test_content_hash():
+    assert content_hash({"a": [1, 2]}) == content_hash({"a": [1, 2]})
+    assert content_hash({"a": [1, 2]}) != content_hash({"a": [2, 1]})
+    with pytest.raises(TypeError):
+        content_hash({"a": object()})
+    assert content_hash({"a": 1, "b": [1.0, True, None]}) == content_hash({"b": [1.0, True, None], "a": 1})
+    assert len({content_hash(value) for value in (1, 1.0, True, "1")}) == 4
+
+
+class Name(str):
+    pass
+
+
+@pytest.mark.parametrize("value", ((1, 2), {"a": (1, 2)}, {1: "x"}, [Name("x")], {Name("a"): 1}))
+def test_content_hash_rejects_non_json(value):
+    with pytest.raises(TypeError):
+        content_hash(value)
+
+
+@pytest.mark.parametrize("bypassed, cached", (({"a": (1, 2)}, {"a": [1, 2]}), ({1: "x"}, {"1": "x"})))
+def test_cache_does_not_share_results_across_json_forms(tmp_path, bypassed, cached):
+    cache = MatchCache(str(tmp_path))
+    assert cache.match(bypassed, cached) != []
+    assert cache.match(cached, cached) == []
+    assert cache.stats.bypassed == 1 and cache.stats.misses == 1
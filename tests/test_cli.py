@@ -0,0 +1,132 @@
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from pydiction.cli import EXIT_ERROR, EXIT_MISMATCH, EXIT_OK, collect_pairs, main
+
+EXPECTED_PY = """
+from pydiction import ANY_NOT_NONE, Contains
+
+EXPECTED = Contains({"id": ANY_NOT_NONE, "status": "done"})
+"""
+
+
+@pytest.fixture
+def tree(tmp_path):
+    actual, expected = tmp_path / "actual", tmp_path / "expected"
+    (actual / "nested").mkdir(parents=True)
+    (expected / "nested").mkdir(parents=True)
+    (actual / "a.json").write_text(json.dumps({"id": 1, "tags": ["x", "y"]}))
+    (expected / "a.json").write_text(json.dumps({"id": 1, "tags": ["x", "y"]}))
+    (actual / "nested" / "b.json").write_text(json.dumps({"id": 2, "status": "done", "extra": True}))
+    (expected / "nested" / "b.py").write_text(EXPECTED_PY)
+    return actual, expected
+
+
+def run(*argv):
+    out = io.StringIO()
+    code = main([str(arg) for arg in argv], out)
+    return code, out.getvalue()
+
+
+def test_collect_pairs(tree):
+    actual, expected = tree
+    assert list(collect_pairs([str(actual), str(expected), "x.json", "y.py"])) == [
+        (str(actual / "a.json"), str(expected / "a.json")),
+        (str(actual / "nested" / "b.json"), str(expected / "nested" / "b.py")),
+        ("x.json", "y.py"),
+    ]
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+def test_cli_directories_pass(tree, jobs):
+    code, output = run(*tree, "--jobs", jobs)
+    assert code == EXIT_OK
+    assert output.count("PASS ") == 2
+    assert "2 files: 2 passed, 0 failed, 0 incomplete, 0 errors" in output
+
+
+def test_cli_mismatch(tree):
+    actual, expected = tree
+    (actual / "a.json").write_text(json.dumps({"id": 2, "tags": ["x", "y"], "more": 1}))
+    code, output = run(*tree, "-j", 1)
+    assert code == EXIT_MISMATCH
+    assert f"FAIL {actual / 'a.json'} (2 errors" in output
+    assert "('id', 'does not match', 2, 1)" in output
+    assert "('more', 'not expected', 1, <NOT_SET>)" in output
+
+
+def test_cli_max_errors_and_jsonl(tree):
+    actual, expected = tree
+    (actual / "a.json").write_text(json.dumps({"id": 2, "tags": ["x", "y"], "more": 1}))
+    code, output = run(actual / "a.json", expected / "a.json", "--max-errors", 1, "--format", "jsonl")
+    assert code == EXIT_MISMATCH
+    result, summary = map(json.loads, output.splitlines())
+    assert result["status"] == "failed" and result["truncated"] and result["error_count"] == 1
+    assert result["errors"][0]["message"] in ("not expected", "does not match")
+    assert summary["summary"]["failed"] == 1
+
+
+def test_cli_ignore_order_and_aggregate(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps([{"v": i} for i in range(5)]))
+    (tmp_path / "e.json").write_text(json.dumps([{"v": -1}] * 5))
+    code, output = run(tmp_path / "a.json", tmp_path / "e.json", "--aggregate")
+    assert code == EXIT_MISMATCH
+    assert "('*.v', 'does not match'" in output and "5 occurrences" in output
+
+    (tmp_path / "e.json").write_text(json.dumps([4, 3, 2, 1, 0]))
+    (tmp_path / "a.json").write_text(json.dumps([0, 1, 2, 3, 4]))
+    assert run(tmp_path / "a.json", tmp_path / "e.json")[0] == EXIT_MISMATCH
+    assert run(tmp_path / "a.json", tmp_path / "e.json", "--ignore-order")[0] == EXIT_OK
+
+
+def test_cli_budget(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps(list(range(12))))
+    (tmp_path / "e.json").write_text(json.dumps(list(range(12, 0, -1))))
+    code, output = run(tmp_path / "a.json", tmp_path / "e.json", "--ignore-order", "--max-unordered-length", 8)
+    assert code == EXIT_ERROR
+    assert "INCOMPLETE " in output and "max_unordered_length budget exhausted" in output
+    assert "1 files: 0 passed, 0 failed, 1 incomplete, 0 errors" in output
+
+    code, output = run(tmp_path / "a.json", tmp_path / "e.json", "--max-nodes", 5, "--format", "jsonl")
+    assert code == EXIT_MISMATCH
+    result = json.loads(output.splitlines()[0])
+    assert result["status"] == "failed" and result["truncated"] and result["exhausted"] == "max_nodes"
+
+    with pytest.raises(SystemExit) as e:
+        run(tmp_path / "a.json", tmp_path / "e.json", "--max-time", 0)
+    assert e.value.code == EXIT_ERROR
+
+
+def test_cli_list_diff(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps([0] + list(range(1, 100))))
+    (tmp_path / "e.json").write_text(json.dumps(list(range(1, 100))))
+    code, output = run(tmp_path / "a.json", tmp_path / "e.json", "--list-diff", "align")
+    assert code == EXIT_MISMATCH
+    assert "FAIL " in output and "(2 errors" in output and "('0', 'not expected', 0, <NOT_SET>)" in output
+
+
+def test_cli_errors(tree, tmp_path):
+    actual, expected = tree
+    (actual / "broken.json").write_text("{")
+    code, output = run(*tree, "-j", 1)
+    assert code == EXIT_ERROR
+    assert "ERROR " in output and "1 errors" in output
+
+    with pytest.raises(SystemExit) as e:
+        run(actual / "a.json")
+    assert e.value.code == EXIT_ERROR
+
+
+def test_python_m_pydiction(tree):
+    actual, expected = tree
+    result = subprocess.run(
+        [sys.executable, "-m", "pydiction", str(actual / "a.json"), str(expected / "a.json")],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == EXIT_OK, result.stderr
+    assert result.stdout.startswith("PASS ")
@@ -0,0 +1,97 @@
+import copy
+import sys
+import threading
+
+import pytest
+
+from pydiction import ANY_NOT_NONE, Contains, DoesntContains, Each, KeyedList, Matcher, Matches, OneOf
+from pydiction.dispatch import ComparatorRegistry
+from pydiction.operators import Expect
+
+LIMIT = Expect(5)
+
+TEMPLATE = {
+    "id": ANY_NOT_NONE,
+    "low": LIMIT.__lt__,
+    "high": LIMIT.__gt__,
+    "tags": Contains(["a", "b"]),
+    "blocked": DoesntContains(["x"]),
+    "items": KeyedList([{"id": 1, "name": Matches(r"item-\d+")}], strict=False),
+    "status": OneOf({"ok", "failed"}),
+    "codes": Each(Expect(0).__ge__),
+}
+
+
+def make_payload(i):
+    return {
+        "id": i,
+        "low": i % 10,
+        "high": (i * 7) % 10,
+        "tags": ["b", "a", "c"] if i % 3 else ["c"],
+        "blocked": ["y", "x"] if i % 5 == 0 else ["y"],
+        "items": [{"id": 1, "name": f"item-{i}" if i % 4 else "other"}, {"id": 2, "name": "x"}],
+        "status": "ok" if i % 6 else "unknown",
+        "codes": [0, 1, -1 if i % 7 == 0 else 2],
+    }
+
+
+@pytest.fixture
+def fast_switching():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_expectation_messages_do_not_depend_on_access_order():
+    matcher = Matcher()
+    limit = Expect(5)
+    greater, lower = limit.__gt__, limit.__lt__
+    assert matcher.match(1, greater, []) == [([], "not greater than (expected)", 1, 5)]
+    assert matcher.match(9, lower, []) == [([], "greater or equal (expected)", 9, 5)]
+    assert matcher.match(1, greater, []) == [([], "not greater than (expected)", 1, 5)]
+    assert limit.error_msg is None
+
+
+def test_expectation_explicit_error_msg():
+    assert Matcher().match(1, Expect(5, "too small").__gt__, []) == [([], "too small", 1, 5)]
+
+
+def test_contains_does_not_mutate_actual():
+    actual = [{"a": 1}, {"a": 2}, 3]
+    Matcher().match(actual, Contains([{"a": 2}, 3]), [])
+    assert actual == [{"a": 1}, {"a": 2}, 3]
+
+
+def test_match_many_matches_serial(fast_switching):
+    matcher = Matcher()
+    payloads = [make_payload(i) for i in range(2000)]
+    snapshot = copy.deepcopy(payloads)
+
+    serial = [matcher.match(payload, TEMPLATE, []) for payload in payloads]
+    for _ in range(3):
+        assert matcher.match_many([(payload, TEMPLATE) for payload in payloads], max_workers=8) == serial
+    assert payloads == snapshot
+    assert any(serial) and not all(serial)
+
+
+def test_registry_register_while_resolving(fast_switching):
+    registry = ComparatorRegistry()
+    registry.register(object, object, lambda *_, **__: [])
+    errors = []
+
+    def resolve():
+        try:
+            for _ in range(2000):
+                registry.resolve(int, str)
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    threads = [threading.Thread(target=resolve) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for i in range(200):
+        registry.register(type(f"T{i}", (), {}), object, lambda *_, **__: [])
+    for thread in threads:
+        thread.join()
+    assert errors == []
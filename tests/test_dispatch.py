@@ -0,0 +1,141 @@
+import datetime
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from pydiction import Contains, Matcher, register_comparator
+from pydiction.core import BaseOperator, default_registry
+from pydiction.dispatch import ComparatorRegistry
+
+
+def compare_decimal(matcher, actual, expected, path, **_):
+    if abs(Decimal(str(actual)) - expected) > Decimal("0.01"):
+        yield path, "not close to", actual, expected
+
+
+def compare_iso_datetime(matcher, actual, expected, path, **_):
+    if datetime.datetime.fromisoformat(actual) != expected:
+        yield path, "different datetime", actual, expected
+
+
+def test_matcher_register_comparators():
+    matcher = Matcher()
+    matcher.register(float, Decimal, compare_decimal)
+    matcher.register(str, datetime.datetime, compare_iso_datetime)
+
+    @matcher.register(str, uuid.UUID)
+    def compare_uuid(matcher, actual, expected, path, **_):
+        return [] if uuid.UUID(actual) == expected else [(path, "different uuid", actual, expected)]
+
+    id_ = uuid.uuid4()
+    now = datetime.datetime(2023, 9, 17, 12, 0)
+    actual = {"price": 10.004, "at": now.isoformat(), "id": str(id_).upper()}
+    matcher.assert_declarative_object(actual, {"price": Decimal("10.00"), "at": now, "id": id_})
+
+    errors = matcher.get_declarative_diff({"price": 10.5}, {"price": Decimal("10.00")})
+    assert errors == [(["price"], "not close to", 10.5, Decimal("10.00"))]
+
+
+def test_matcher_register_does_not_leak():
+    matcher = Matcher()
+    matcher.register(float, Decimal, compare_decimal)
+    assert matcher.registry is not default_registry
+    assert Matcher().registry is default_registry
+    assert Matcher().get_declarative_diff({"a": 10.004}, {"a": Decimal("10.00")}) != []
+
+
+def test_registry_mro_resolution():
+    class Base:
+        pass
+
+    class Child(Base):
+        pass
+
+    def base(*_, **__):
+        return []
+
+    def child(*_, **__):
+        return []
+
+    def object_child(*_, **__):
+        return []
+
+    registry = ComparatorRegistry()
+    registry.register(object, object, base)
+    registry.register(Base, Base, base)
+    registry.register(Child, Base, child)
+    registry.register(object, Child, object_child)
+
+    assert registry.resolve(Child, Base) is child
+    assert registry.resolve(Base, Base) is base
+    assert registry.resolve(Child, Child) is object_child
+    assert registry.resolve(int, str) is base
+
+
+def test_registry_cache_and_invalidation():
+    parent = ComparatorRegistry()
+    child = ComparatorRegistry(parent=parent)
+
+    def first(*_, **__):
+        return []
+
+    def second(*_, **__):
+        return []
+
+    parent.register(object, object, first)
+    assert child.resolve(int, int) is first
+    assert child._cache[(int, int)] is first
+
+    parent.register(int, int, second)
+    assert child.resolve(int, int) is second
+
+    child.register(int, int, first)
+    assert child.resolve(int, int) is first
+    assert parent.resolve(int, int) is second
+
+
+def test_registry_without_comparator():
+    with pytest.raises(LookupError):
+        ComparatorRegistry().resolve(int, int)
+
+
+def test_builtin_comparators_are_registered():
+    assert default_registry.resolve(dict, Contains) is default_registry.resolve(list, BaseOperator)
+    assert default_registry.resolve(dict, dict) is not default_registry.resolve(dict, list)
+
+
+def test_register_comparator_global():
+    class Money:
+        def __init__(self, cents):
+            self.cents = cents
+
+    @register_comparator(int, Money)
+    def compare_money(matcher, actual, expected, path, **_):
+        if actual != expected.cents:
+            yield path, "different amount", actual, expected.cents
+
+    matcher = Matcher()
+    matcher.assert_declarative_object({"total": 100}, {"total": Money(100)})
+    assert matcher.get_declarative_diff([1], [Money(2)]) == [(["0"], "different amount", 1, 2)]
+
+
+def test_registry_abstract_base_classes():
+    import abc
+
+    class Sized(abc.ABC):
+        @classmethod
+        def __subclasshook__(cls, subclass):
+            return True if hasattr(subclass, "__len__") else NotImplemented
+
+    def sized(matcher, actual, expected, path, **_):
+        if len(actual) != expected:
+            yield path, "wrong size", len(actual), expected
+
+    registry = ComparatorRegistry(parent=default_registry)
+    registry.register(Sized, int, sized)
+    matcher = Matcher(registry)
+    assert registry.resolve(str, int) is sized
+    assert registry.resolve(int, int) is not sized
+    assert matcher.match("abc", 3, []) == []
+    assert matcher.match([1], 3, []) == [([], "wrong size", 1, 3)]
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+from pydiction import ANY_NOT_NONE, Contains, ContainsAnywhere, DoesntContains, DocumentIndex, Matcher, Matches
+from pydiction.utils import PathIndex
+
+DOCUMENT = {
+    "service": "api",
+    "events": [
+        {"level": "error", "code": 500, "request": {"path": "/users", "method": "GET"}},
+        {"level": "info", "code": 200, "request": {"path": "/users/1", "method": "GET"}},
+        {"level": "error", "code": 502, "request": {"path": "/orders", "method": "POST"}, "tags": ["retry", "db"]},
+    ],
+    "summary": {"level": "error", "count": 2, "tags": ["db"]},
+}
+
+
+def brute_force(document, pattern, matcher):
+    found = []
+    stack = [([], document)]
+    while stack:
+        path, node = stack.pop()
+        if isinstance(node, (dict, list)):
+            if next(Contains(pattern, recursive=True).match(node, path, matcher), None) is None:
+                found.append(path)
+            children = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, value in children:
+                stack.append((path + [key if isinstance(node, dict) else PathIndex(key)], value))
+    return sorted(found)
+
+
+@pytest.fixture(scope="module")
+def index():
+    return DocumentIndex(DOCUMENT)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    (
+        {"level": "error"},
+        {"level": "error", "code": 502},
+        {"request": {"method": "GET"}},
+        {"level": ANY_NOT_NONE, "tags": ["db"]},
+        {"request": {"path": Matches(r"/users")}},
+        {"level": "error", "tags": DoesntContains(["retry"])},
+        {"level": "warning"},
+        {"missing": ANY_NOT_NONE},
+        ["db"],
+        [],
+    ),
+)
+def test_find_matches_brute_force(index, pattern):
+    matcher = Matcher()
+    assert sorted(matcher.find(index, pattern)) == brute_force(DOCUMENT, pattern, matcher)
+
+
+LEAVES = ("error", "info", "db", "retry", "GET", "/users", 500, 502, 2, True, "missing", 404)
+KEYS = ("level", "code", "tags", "request", "method", "path", "count", "missing")
+
+
+def random_pattern(rng, depth=0):
+    if depth < 2 and rng.random() < 0.5:
+        keys = rng.sample(KEYS, rng.randint(1, 2))
+        return {key: random_pattern(rng, depth + 1) for key in keys}
+    if depth < 2 and rng.random() < 0.5:
+        return [random_pattern(rng, depth + 1) for _ in range(rng.randint(1, 3))]
+    return rng.choice(LEAVES)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_find_random_patterns_brute_force(seed):
+    rng = random.Random(seed)
+    document = {"events": DOCUMENT["events"], "summary": DOCUMENT["summary"], "mixed": [0, {"d": [True, 1, "db"]}]}
+    index = DocumentIndex(document)
+    matcher = Matcher()
+    for _ in range(10):
+        pattern = random_pattern(rng)
+        if isinstance(pattern, (dict, list)):
+            assert sorted(matcher.find(index, pattern)) == brute_force(document, pattern, matcher), pattern
+
+
+def test_find_list_pattern_any_item():
+    assert DocumentIndex([0, {"d": [True, 1]}]).find(["a", 1]) == [["1", "d"]]
+
+
+@pytest.mark.parametrize(
+    "pattern, paths",
+    (
+        ("error", [["events", "0", "level"], ["events", "2", "level"], ["summary", "level"]]),
+        (502, [["events", "2", "code"]]),
+        (Matches(r"/users/\d+"), [["events", "1", "request", "path"]]),
+        ("nothing", []),
+    ),
+)
+def test_find_values(index, pattern, paths):
+    assert sorted(Matcher().find(index, pattern)) == paths
+
+
+def test_find_narrows_candidates(index):
+    assert len(index._candidates({"level": "error", "code": 502})) == 1
+    assert len(index._candidates({"request": ANY_NOT_NONE})) == 3
+    assert index.find({"level": "error", "code": 502}) == [["events", "2"]]
+
+
+def test_contains_anywhere(matcher: Matcher):
+    template = {"service": "api", "events": ContainsAnywhere({"code": 502}), "summary": ANY_NOT_NONE}
+    matcher.assert_declarative_object(DOCUMENT, template)
+
+    errors = matcher.get_declarative_diff(DOCUMENT, ContainsAnywhere({"code": 404}))
+    assert errors == [([], "not found anywhere", DOCUMENT, {"code": 404})]
+
+
+def test_contains_anywhere_shared_index(matcher: Matcher, index):
+    for pattern in ({"method": "POST"}, "retry", {"summary": {"count": 2}}):
+        assert matcher.match(index, ContainsAnywhere(pattern), []) == []
+    assert matcher.match(index, ContainsAnywhere({"method": "PUT"}), []) != []
+
+
+def test_index_scalar_and_unhashable_leaves():
+    assert DocumentIndex(5).find(5) == [[]]
+    index = DocumentIndex({"a": {1, 2}, "b": [{"c": 1}]})
+    assert index.find({"c": 1}) == [["b", "0"]]
+    assert index.find({1, 2}) == []
@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+from pydiction import ANY_NOT_NONE, Contains, Each, KeyedList, Matcher, OneOf
+from pydiction.core import NOT_SET
+from pydiction.lazy_json import LazyArray, LazyJSONFile, LazyObject, _Document
+
+DOCUMENT = {
+    "id": 1,
+    "name": "café \"quoted\" [not] {a container}",
+    "nested": {"a": [1, 2.5, True, None, {"b": "c"}], "empty": {}, "empty_list": []},
+    "escaped\\key": "\\\\",
+    "items": [{"id": i, "tags": ["x", "y"]} for i in range(50)],
+}
+
+
+@pytest.fixture
+def json_file(tmp_path):
+    path = tmp_path / "doc.json"
+    path.write_text(json.dumps(DOCUMENT, indent=2, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+def lazy(value):
+    return _Document(json.dumps(value).encode()).root()
+
+
+@pytest.mark.parametrize("value", (DOCUMENT, [], {}, [[[]]], "x", 1.5, None, [{"a": [{"b": {}}]}]))
+def test_lazy_views_roundtrip(value):
+    root = lazy(value)
+    if isinstance(root, (LazyObject, LazyArray)):
+        assert root.materialize() == value
+        assert root == value
+    else:
+        assert root == value
+
+
+def test_lazy_object_decodes_on_access(json_file):
+    with LazyJSONFile(json_file) as root:
+        assert isinstance(root, LazyObject)
+        assert sorted(root) == sorted(DOCUMENT)
+        assert root["name"] == DOCUMENT["name"]
+        assert root["escaped\\key"] == "\\\\"
+        nested = root["nested"]
+        assert isinstance(nested, LazyObject)
+        assert isinstance(nested["a"], LazyArray)
+        assert nested["a"][1:4] == [2.5, True, None]
+        assert len(root["items"]) == 50
+        assert "missing" not in root
+
+
+def test_lazy_object_index_is_not_built_until_needed():
+    root = lazy({"a": {"b": 1}, "c": 2})
+    inner = root["a"]
+    assert inner._offsets is None
+    assert inner["b"] == 1
+    assert inner._offsets is not None
+
+
+def test_match_file(json_file):
+    matcher = Matcher()
+    expected = {
+        "id": 1,
+        "name": ANY_NOT_NONE,
+        "nested": {"a": [1, 2.5, True, None, {"b": "c"}], "empty": {}, "empty_list": []},
+        "escaped\\key": ANY_NOT_NONE,
+        "items": Each(Contains({"id": ANY_NOT_NONE})),
+    }
+    assert matcher.match_file(json_file, expected) == []
+
+
+def test_match_file_errors_are_materialized(json_file):
+    matcher = Matcher()
+    expected = {
+        "id": 2,
+        "nested": {"a": [1, 2.5, False], "empty": {"x": 1}},
+        "items": KeyedList([{"id": 3, "tags": ["x", "z"]}], strict=False),
+    }
+    errors = matcher.match_file(json_file, expected)
+    assert sorted(map(repr, errors)) == sorted(map(repr, matcher.match(DOCUMENT, expected, [])))
+    not_expected = [error[0] for error in errors if error[1] == "not expected"]
+    assert sorted(not_expected) == [["escaped\\key"], ["name"], ["nested", "empty_list"]]
+    assert all(not isinstance(error[2], (LazyObject, LazyArray)) for error in errors)
+
+
+def test_match_file_unordered_lists(json_file):
+    matcher = Matcher()
+    expected = Contains({"nested": {"a": [None, 1, True, 2.5, {"b": "c"}], "empty": {}, "empty_list": []}})
+    assert matcher.match_file(json_file, expected) == []
+    assert matcher.match_file(json_file, Contains({"id": OneOf({1, 2})})) == []
+
+
+def test_lazy_view_against_operator():
+    errors = Matcher().match(lazy({"a": [1, 2]}), {"a": Contains([3])}, [])
+    assert errors[0][0] == ["a", "0"]
+
+
+def test_lazy_object_missing_key():
+    errors = Matcher().match(lazy({"a": 1}), {"b": 1}, [])
+    assert sorted(errors, key=repr) == [(["a"], "not expected", 1, NOT_SET), (["b"], "not found", NOT_SET, 1)]
+
+
+@pytest.mark.parametrize("text", (b"", b'{"a": 1', b'{"a" 1}', b"[1 2]", b'"abc', b"{} {}"))
+def test_invalid_documents(tmp_path, text):
+    path = tmp_path / "bad.json"
+    path.write_bytes(text)
+    with pytest.raises(ValueError):
+        with LazyJSONFile(str(path)) as root:
+            root.materialize() if hasattr(root, "materialize") else None
+            list(root.items()) if isinstance(root, LazyObject) else list(root)
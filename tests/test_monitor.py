@@ -0,0 +1,203 @@
+import threading
+import time
+
+import pytest
+
+from pydiction import ANY_NOT_NONE
+from pydiction.monitor import DROP_OLDEST, OVERFLOW_PATH, ContractMonitor
+from pydiction.operators import Predicate
+
+TEMPLATE = {"id": ANY_NOT_NONE, "name": "John"}
+
+
+def test_monitor_counts_passed_and_failed():
+    monitor = ContractMonitor(workers=2)
+    monitor.register("user", TEMPLATE)
+    with monitor:
+        assert monitor.submit("user", {"id": 1, "name": "John"})
+        assert monitor.submit("user", {"id": None, "name": "John"})
+        assert monitor.submit("user", {"id": 2, "name": "Jane", "extra": 1})
+
+    snapshot = monitor.snapshot()
+    assert snapshot["submitted"] == 3
+    assert snapshot["dropped"] == 0
+    stats = snapshot["templates"]["user"]
+    assert stats["checked"] == 3
+    assert stats["passed"] == 1
+    assert stats["failed"] == 2
+    assert stats["errors"] == {"id": 1, "name": 1, "extra": 1}
+
+
+def test_monitor_unknown_template_is_counted():
+    with ContractMonitor() as monitor:
+        assert not monitor.submit("missing", {})
+    snapshot = monitor.snapshot()
+    assert snapshot["unknown"] == 1
+    assert snapshot["templates"] == {}
+
+
+def test_monitor_drop_newest():
+    monitor = ContractMonitor(maxsize=2)
+    monitor.register("user", TEMPLATE)
+    results = [monitor.submit("user", {"id": i, "name": "John"}) for i in range(5)]
+    assert results == [True, True, False, False, False]
+    assert monitor.snapshot()["dropped"] == 3
+
+    monitor.start()
+    monitor.stop()
+    assert monitor.snapshot()["templates"]["user"]["checked"] == 2
+
+
+def test_monitor_drop_oldest():
+    monitor = ContractMonitor(maxsize=2, drop_policy=DROP_OLDEST)
+    monitor.register("user", TEMPLATE)
+    results = [monitor.submit("user", {"id": i, "name": "John"}) for i in range(5)]
+    assert results == [True] * 5
+    assert monitor.snapshot()["dropped"] == 3
+    assert [item[1]["id"] for item in list(monitor._queue.queue)] == [3, 4]
+
+
+def test_monitor_sampling():
+    monitor = ContractMonitor(sample_rate=0.0)
+    monitor.register("user", TEMPLATE)
+    assert not monitor.submit("user", {})
+    assert monitor.snapshot()["sampled_out"] == 1
+
+
+def test_monitor_errored_predicate():
+    def boom(_):
+        raise ValueError()
+
+    monitor = ContractMonitor()
+    monitor.register("user", {"id": boom})
+    with monitor:
+        monitor.submit("user", {"id": 1})
+    stats = monitor.snapshot()["templates"]["user"]
+    assert stats["errored"] == 1
+    assert stats["exceptions"] == {"ValueError": 1}
+
+
+def test_monitor_max_paths():
+    monitor = ContractMonitor(max_paths=1)
+    monitor.register("user", {"a": 1, "b": 1, "c": 1})
+    with monitor:
+        monitor.submit("user", {"a": 2, "b": 2, "c": 2})
+    errors = monitor.snapshot()["templates"]["user"]["errors"]
+    assert len(errors) == 2
+    assert errors[OVERFLOW_PATH] == 2
+
+
+def test_monitor_list_indices_share_a_path():
+    monitor = ContractMonitor(max_paths=2)
+    monitor.register("items", [{"id": 1}] * 5)
+    with monitor:
+        monitor.submit("items", [{"id": 2}] * 5)
+        monitor.submit("items", [{"id": 1}] * 4 + [{"id": 1, "x": 1}])
+    errors = monitor.snapshot()["templates"]["items"]["errors"]
+    assert errors == {"*.id": 5, "*.x": 1}
+
+
+def test_monitor_numeric_dict_keys_are_not_indices():
+    monitor = ContractMonitor()
+    monitor.register("years", {"2023": 1, "2024": 1})
+    with monitor:
+        monitor.submit("years", {"2023": 2, "2024": 2})
+    assert monitor.snapshot()["templates"]["years"]["errors"] == {"2023": 1, "2024": 1}
+
+
+def test_monitor_stop_with_drop_oldest_submitters():
+    monitor = ContractMonitor(maxsize=1, drop_policy=DROP_OLDEST, workers=2)
+    monitor.register("user", TEMPLATE)
+    monitor.start()
+    running = threading.Event()
+    running.set()
+
+    def submit():
+        while running.is_set():
+            monitor.submit("user", {"id": 1, "name": "John"})
+
+    submitters = [threading.Thread(target=submit) for _ in range(4)]
+    for thread in submitters:
+        thread.start()
+
+    stopper = threading.Thread(target=monitor.stop)
+    stopper.start()
+    stopper.join(timeout=10)
+    running.clear()
+    for thread in submitters:
+        thread.join()
+
+    assert not stopper.is_alive()
+    assert monitor._threads == []
+
+
+class Slow(Predicate):
+    def __call__(self, actual):
+        time.sleep(0.05)
+        return True
+
+
+def test_monitor_stop_without_drain_discards_pending():
+    monitor = ContractMonitor(maxsize=20)
+    monitor.register("slow", Slow(None))
+    for i in range(20):
+        assert monitor.submit("slow", i)
+
+    start = time.perf_counter()
+    monitor.start()
+    monitor.stop(drain=False)
+    assert time.perf_counter() - start < 0.5
+    snapshot = monitor.snapshot()
+    assert snapshot["templates"].get("slow", {"checked": 0})["checked"] <= 1
+    assert snapshot["dropped"] >= 19 and snapshot["pending"] == 0
+
+
+def test_monitor_rejects_submit_after_stop():
+    monitor = ContractMonitor(maxsize=1, drop_policy=DROP_OLDEST)
+    monitor.register("user", TEMPLATE)
+    monitor.start()
+    monitor.stop()
+    assert not monitor.submit("user", {"id": 1, "name": "John"})
+    assert monitor._queue.empty()
+
+
+def test_monitor_flush_resets_and_exports():
+    exported = []
+    monitor = ContractMonitor(on_flush=exported.append)
+    monitor.register("user", TEMPLATE)
+    with monitor:
+        monitor.submit("user", {"id": None, "name": "John"})
+        monitor.drain()
+        snapshot = monitor.flush()
+
+    assert exported == [snapshot]
+    assert snapshot["templates"]["user"]["failed"] == 1
+    assert monitor.snapshot()["templates"] == {}
+    assert monitor.snapshot()["submitted"] == 0
+
+
+def test_monitor_concurrent_submitters():
+    monitor = ContractMonitor(maxsize=10_000, workers=4)
+    monitor.register("user", TEMPLATE)
+
+    def submit():
+        for i in range(200):
+            monitor.submit("user", {"id": i or None, "name": "John"})
+
+    with monitor:
+        threads = [threading.Thread(target=submit) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    snapshot = monitor.snapshot()
+    assert snapshot["submitted"] == 800
+    assert snapshot["templates"]["user"]["checked"] == 800
+    assert snapshot["templates"]["user"]["failed"] == 4
+
+
+@pytest.mark.parametrize("kwargs", ({"drop_policy": "block"}, {"sample_rate": 2}))
+def test_monitor_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        ContractMonitor(**kwargs)
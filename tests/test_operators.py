@@ -1,6 +1,19 @@
+import re
+
 import pytest
 
-from pydiction.operators import ANY_NOT_NONE, Expect, ExpectNot
+from pydiction import Each
+from pydiction.operators import (
+    ANY,
+    ANY_NOT_NONE,
+    Expect,
+    ExpectNot,
+    Length,
+    Matches,
+    OneOf,
+    StartsWith,
+    compile_pattern,
+)
 
 TEST_KEY = "test"
 
@@ -115,3 +128,99 @@ def test_any_not_none():
     assert ANY_NOT_NONE is not None
     assert 1 == ANY_NOT_NONE
     assert ANY_NOT_NONE == 1
+
+
+@pytest.mark.parametrize(
+    "actual, expected",
+    (
+        ("abc-123", Matches(r"[a-z]+-\d+")),
+        ("xx abc", Matches("abc", mode="search")),
+        ("ABC", Matches("abc", re.IGNORECASE, mode="fullmatch")),
+        ("abc", StartsWith("ab")),
+        ("abc", StartsWith(("x", "a"))),
+        ("b", OneOf({"a", "b"})),
+        (1, OneOf([1, 2])),
+        ([1, 2], Length(2)),
+        ("abc", Length(min=1, max=3)),
+        ({}, Length(max=0)),
+    ),
+)
+def test_predicate_operators(matcher, actual, expected):
+    matcher.assert_declarative_object({TEST_KEY: actual}, {TEST_KEY: expected})
+
+
+@pytest.mark.parametrize(
+    "actual, expected, message",
+    (
+        ("abc", Matches(r"\d+"), "does not match pattern"),
+        (1, Matches(r"\d+"), "does not match pattern"),
+        ("xx abc", Matches("abc"), "does not match pattern"),
+        ("abc", StartsWith("b"), "does not start with"),
+        (None, StartsWith("b"), "does not start with"),
+        ("c", OneOf({"a", "b"}), "not one of"),
+        ([1], OneOf({"a", "b"}), "not one of"),
+        ([1, 2], Length(3), "length out of range"),
+        ("abc", Length(min=4), "length out of range"),
+        (1, Length(max=4), "length out of range"),
+    ),
+)
+def test_predicate_operators_negative(matcher, actual, expected, message):
+    errors = matcher.get_declarative_diff({TEST_KEY: actual}, {TEST_KEY: expected})
+    assert errors == [([TEST_KEY], message, actual, expected.expected)]
+
+
+def test_patterns_are_compiled_once():
+    assert Matches("x+")._match.__self__ is Matches("x+")._match.__self__
+    assert compile_pattern("x+") is compile_pattern("x+")
+
+
+@pytest.mark.parametrize("kwargs", ({"mode": "find"},))
+def test_matches_invalid_mode(kwargs):
+    with pytest.raises(ValueError):
+        Matches("x", **kwargs)
+
+
+def test_length_invalid_arguments():
+    with pytest.raises(ValueError):
+        Length(1, min=0)
+
+
+@pytest.mark.parametrize(
+    "expected, failing",
+    (
+        (Matches(r"id-\d+"), [2, 3]),
+        (StartsWith("id-"), [2, 3]),
+        (OneOf({"id-1", "x"}), [1, 3]),
+        (Length(4), [2, 3]),
+        (lambda x: x in ("id-1", None), [1, 2]),
+    ),
+)
+def test_each(matcher, expected, failing):
+    actual = ["id-1", "id-2", "x", None]
+    errors = matcher.get_declarative_diff({TEST_KEY: actual}, {TEST_KEY: Each(expected)})
+    assert [error[0] for error in errors] == [[TEST_KEY, str(i)] for i in failing]
+    assert [error[2] for error in errors] == [actual[i] for i in failing]
+
+
+def test_each_template(matcher):
+    actual = [{"id": 1}, {"id": 2}]
+    errors = matcher.get_declarative_diff(actual, Each({"id": OneOf({1})}))
+    assert errors == [(["1", "id"], "not one of", 2, frozenset({1}))]
+
+
+def test_each_not_a_list(matcher):
+    errors = matcher.get_declarative_diff("abc", Each(Matches("a")))
+    assert errors[0][1] == "Each can only be used with lists"
+
+
+@pytest.mark.parametrize("value", (None, 0, "", {"a": 1}, [1], object()))
+def test_any_sentinels_compare_like_mock_any(value):
+    from unittest import mock
+
+    assert ANY == value and not ANY != value
+    assert value == ANY and not value != ANY
+    assert (ANY_NOT_NONE == value) is (value is not None)
+    assert (value != ANY_NOT_NONE) is (value is None)
+    assert ANY == mock.ANY and mock.ANY == ANY
+    assert ANY_NOT_NONE == mock.ANY and mock.ANY == ANY_NOT_NONE
+    assert {"a": value} == {"a": ANY} == {"a": mock.ANY}
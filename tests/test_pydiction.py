@@ -1,9 +1,13 @@
 import datetime
+import subprocess
+import sys
 
 import pytest
 
-from pydiction import ANY, ANY_NOT_NONE, Contains, DoesntContains
+from pydiction import ANY, ANY_NOT_NONE, Contains, DoesntContains, KeyedList
+from pydiction.core import NOT_SET
 from pydiction.operators import Expect
+from pydiction.utils import KeyIndex, format_path
 
 
 def test_matcher_with_equal_dicts(matcher):
@@ -556,3 +560,89 @@ def test_1(matcher):
         # },
     }
     matcher.assert_declarative_object(a, e)
+
+
+def test_keyed_list_ignores_order(matcher):
+    actual = [{"id": 2, "price": 20}, {"id": 1, "price": 10}]
+    expected = KeyedList([{"id": 1, "price": 10}, {"id": 2, "price": ANY_NOT_NONE}])
+    matcher.assert_declarative_object(actual, expected)
+
+
+def test_keyed_list_key_paths(matcher):
+    actual = {"items": [{"id": 42, "price": 1}, {"id": 7, "price": 2}, {"id": 7, "price": 3}, {"price": 4}]}
+    expected = {"items": KeyedList([{"id": 42, "price": 2}, {"id": 43, "price": 1}])}
+
+    errors = matcher.get_declarative_diff(actual, expected)
+
+    assert {(format_path(path), message) for path, message, *_ in errors} == {
+        ("items.3", "missing key id"),
+        ("items[id=7]", "duplicate key"),
+        ("items[id=42].price", "does not match"),
+        ("items[id=43]", "not found"),
+        ("items[id=7]", "not expected"),
+    }
+    with pytest.raises(AssertionError, match=r"'items\[id=42\]\.price', 'does not match', 1, 2"):
+        matcher.assert_declarative_object(actual, expected)
+
+
+def test_keyed_list_not_strict(matcher):
+    actual = [{"id": 1}, {"id": 2}]
+    matcher.assert_declarative_object(actual, KeyedList([{"id": 2}], strict=False))
+    with pytest.raises(AssertionError):
+        matcher.assert_declarative_object(actual, KeyedList([{"id": 2}]))
+
+
+def test_keyed_list_callable_key(matcher):
+    actual = [("a", 1), ("b", 2)]
+    expected = KeyedList([("b", 2), ("a", 1)], key=lambda item: item[0])
+    matcher.assert_declarative_object(actual, expected)
+
+    errors = matcher.get_declarative_diff([("a", 1), ("b", 3)], expected)
+    assert [(format_path(e[0]), e[1]) for e in errors] == [("[<lambda>=b]", "does not match")]
+
+
+def test_keyed_list_callable_key_missing(matcher):
+    def item_id(item):
+        return item["id"]
+
+    errors = matcher.get_declarative_diff([{"id": 1}, {"name": "x"}], KeyedList([{"id": 1}], key=item_id))
+    assert errors == [(["1"], "missing key item_id", {"name": "x"}, NOT_SET)]
+
+
+def test_keyed_list_unhashable_and_wrong_type(matcher):
+    errors = matcher.get_declarative_diff([{"id": [1]}], KeyedList([]))
+    assert errors == [(["0"], "unhashable key id", [1], NOT_SET)]
+    errors = matcher.get_declarative_diff({"id": 1}, KeyedList([]))
+    assert errors[0][1] == "KeyedList can only be used with lists"
+
+
+@pytest.mark.parametrize("items", ([{"id": 1}, {"id": 1}], [{"name": "a"}]))
+def test_keyed_list_invalid_expected(items):
+    with pytest.raises(ValueError):
+        KeyedList(items)
+
+
+def test_keyed_list_large(matcher):
+    actual = [{"id": i, "v": i} for i in range(100_000)]
+    expected = KeyedList([{"id": i, "v": i} for i in reversed(range(100_000))])
+    actual[500]["v"] = -1
+
+    errors = matcher.get_declarative_diff(actual, expected)
+
+    assert errors == [([KeyIndex("id", 500), "v"], "does not match", -1, 500)]
+
+
+def test_import_does_not_load_heavy_modules():
+    code = "import sys, pydiction; print(sorted({'unittest', 'asyncio', 'inspect'} & set(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    assert output.strip() == "[]"
+
+
+def test_lazy_attributes():
+    import pydiction
+    from pydiction.session import MatchSession
+
+    assert pydiction.MatchSession is MatchSession
+    assert "LazyJSONFile" in dir(pydiction)
+    with pytest.raises(AttributeError):
+        pydiction.Missing
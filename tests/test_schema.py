@@ -0,0 +1,121 @@
+import pytest
+
+from pydiction.core import NOT_SET
+from pydiction.schema import JSONType, compile_schema
+
+USER_SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "title": "user",
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer", "minimum": 1},
+        "name": {"type": "string", "pattern": "^[a-z]+$", "maxLength": 8},
+        "score": {"type": "number", "exclusiveMinimum": 0, "maximum": 1},
+        "role": {"enum": ["admin", "user"]},
+        "tags": {"type": "array", "items": {"type": "string"}, "maxItems": 2},
+        "address": {
+            "type": "object",
+            "properties": {"city": {"type": "string"}, "zip": {"type": "string"}},
+            "required": ["city", "zip"],
+            "additionalProperties": False,
+        },
+        "nickname": {"type": ["string", "null"], "minLength": 2},
+    },
+    "required": ["id", "name"],
+    "additionalProperties": False,
+}
+
+
+def test_valid_instance(matcher):
+    instance = {
+        "id": 1,
+        "name": "john",
+        "score": 0.5,
+        "role": "admin",
+        "tags": ["a"],
+        "address": {"city": "Paris", "zip": "75001"},
+        "nickname": None,
+    }
+    assert matcher.match(instance, compile_schema(USER_SCHEMA), []) == []
+    assert matcher.match({"id": 2.0, "name": "a"}, compile_schema(USER_SCHEMA), []) == []
+
+
+def test_invalid_instance_paths(matcher):
+    instance = {
+        "id": 0,
+        "name": "John",
+        "score": 0,
+        "role": "guest",
+        "tags": ["a", 2, "c"],
+        "address": {"city": "Paris", "country": "FR"},
+        "nickname": "j",
+        "extra": True,
+    }
+    errors = {(tuple(error[0]), error[1]) for error in matcher.match(instance, compile_schema(USER_SCHEMA), [])}
+    assert errors == {
+        (("id",), "not greater or equal"),
+        (("name",), "does not match pattern"),
+        (("score",), "not greater than (expected)"),
+        (("role",), "not one of"),
+        (("tags",), "length out of range"),
+        (("address", "country"), "not expected"),
+        (("address", "zip"), "not found"),
+        (("nickname",), "length out of range"),
+        (("extra",), "not expected"),
+    }
+
+
+def test_type_errors_stop_further_checks(matcher):
+    assert matcher.match({"id": "1", "name": 5}, compile_schema(USER_SCHEMA), []) == [
+        (["id"], "wrong type", "1", "integer"),
+        (["name"], "wrong type", 5, "string"),
+    ]
+    assert matcher.match({"name": "a"}, compile_schema(USER_SCHEMA), [])[0][:3] == (["id"], "not found", NOT_SET)
+    assert matcher.match([], compile_schema(USER_SCHEMA), []) == [([], "wrong type", [], "object")]
+
+
+@pytest.mark.parametrize(
+    "schema, valid, invalid",
+    (
+        ({}, [1, "a", None, {}], []),
+        (True, [1], []),
+        ({"const": 3}, [3, 3.0], [4, True, "3"]),
+        ({"const": True}, [True], [1, 1.0]),
+        ({"const": {"a": [1, False]}}, [{"a": [1.0, False]}], [{"a": [True, 0]}, {"a": [1, False], "b": 1}]),
+        ({"enum": [1, "a", None]}, [1, 1.0, "a", None], [True, "b", [1]]),
+        ({"enum": [False, {"a": 1}, [1, 2]]}, [False, {"a": 1}, [1, 2]], [0, {"a": True}, [2, 1], [1, 2, 3]]),
+        ({"minimum": 2}, [2, "a", True], [1, 1.5]),
+        ({"maxLength": 2}, ["ab", 123, [1, 2, 3]], ["abc"]),
+        ({"pattern": "b"}, ["abc", 1], ["ac"]),
+        ({"items": {"type": "integer"}}, [[1, 2], "x"], [[1, "2"]]),
+        ({"minItems": 1}, [[1], "x"], [[]]),
+        ({"required": ["a"]}, [{"a": None, "b": 1}, 5], [{"b": 1}]),
+        ({"properties": {"a": {"type": "string"}}}, [{}, {"a": "x"}], [{"a": 1}]),
+        ({"additionalProperties": {"type": "integer"}, "properties": {"a": {}}}, [{"a": "x", "b": 1}], [{"b": "x"}]),
+        ({"allOf": [{"type": "integer"}, {"maximum": 3}]}, [3], [4, 1.5]),
+        ({"type": "integer"}, [1, 1.0], [True, 1.5, "1"]),
+        ({"type": "number"}, [1, 1.5], [True, None]),
+        ({"type": ["null", "boolean"]}, [None, False], [0]),
+    ),
+)
+def test_keywords(matcher, schema, valid, invalid):
+    plan = compile_schema(schema)
+    for instance in valid:
+        assert matcher.match(instance, plan, []) == [], instance
+    for instance in invalid:
+        assert matcher.match(instance, plan, []) != [], instance
+
+
+def test_compiled_plans_are_cached():
+    assert compile_schema(USER_SCHEMA) is compile_schema(dict(reversed(list(USER_SCHEMA.items()))))
+
+
+@pytest.mark.parametrize("schema", ({"oneOf": [{}]}, {"$ref": "#/x"}, {"items": [{}, {}]}, False, {"type": "date"}))
+def test_unsupported(schema):
+    with pytest.raises(ValueError):
+        compile_schema(schema)
+
+
+def test_json_type():
+    assert JSONType(["string", "null"])(None)
+    assert not JSONType("object")([])
@@ -0,0 +1,121 @@
+import io
+
+import pytest
+
+from pydiction import ANY_NOT_NONE, Contains, KeyedList
+from pydiction.core import NOT_SET
+from pydiction.operators import Expect
+from pydiction.serialization import (
+    DiffRecord,
+    DiffWriter,
+    ValuePreview,
+    compare_diffs,
+    decode_value,
+    encode_value,
+    read_diff,
+)
+from pydiction.utils import KeyIndex, PathIndex, format_path
+
+
+@pytest.mark.parametrize("value", (None, True, 0, 1.5, "abc", -3))
+def test_encode_json_values_roundtrip(value):
+    assert decode_value(encode_value(value)) == value
+
+
+def test_encode_not_set_roundtrip():
+    assert decode_value(encode_value(NOT_SET)) is NOT_SET
+
+
+def test_encode_long_string_is_bounded():
+    preview = decode_value(encode_value("x" * 1000, max_length=10))
+    assert preview == ValuePreview("str", "x" * 10, True)
+
+
+def test_encode_large_container_is_bounded():
+    preview = decode_value(encode_value(list(range(100_000)), max_length=50))
+    assert preview.type == "list"
+    assert len(preview.repr) <= 50
+
+
+def test_encode_operator():
+    preview = decode_value(encode_value(Contains({"a": 1})))
+    assert preview.type == "Contains"
+    assert "Contains" in preview.repr
+    assert not preview.truncated
+
+
+def test_write_and_read_diff(matcher):
+    actual = {"a": 1, "b": [1, 2], "2023": "x" * 500, "d": None}
+    expected = {"a": Expect(2).__eq__, "b": [1, 3], "2023": "y", "c": ANY_NOT_NONE, "d": ANY_NOT_NONE}
+    fp = io.StringIO()
+
+    count = matcher.write_declarative_diff(actual, expected, fp, max_length=20)
+
+    fp.seek(0)
+    records = list(read_diff(fp))
+    assert count == len(records) == len(matcher.match(actual, expected, []))
+    by_path = {record.path: record for record in records}
+    assert by_path[("a",)].message == "not equals"
+    assert by_path[("a",)].expected == 2
+    assert by_path[("b",)].message == "different elements (ignoring order)"
+    assert by_path[("b",)].actual == ValuePreview("list", "[1, 2]")
+    assert not isinstance(by_path[("2023",)].path[0], PathIndex)
+    assert by_path[("2023",)].actual == ValuePreview("str", "x" * 20, True)
+    assert by_path[("c",)].actual is NOT_SET
+    assert by_path[("d",)].expected.type == "_ANY_NOT_NONE"
+
+
+def test_list_indices_roundtrip(matcher):
+    fp = io.StringIO()
+    matcher.write_declarative_diff([{"a": 1}, {"a": 2}], [{"a": 1}, {"a": 3}], fp)
+    fp.seek(0)
+    (record,) = read_diff(fp)
+    assert record == DiffRecord(("1", "a"), "does not match", 2, 3)
+    assert isinstance(record.path[0], PathIndex)
+
+
+def test_writer_streams_lines():
+    fp = io.StringIO()
+    writer = DiffWriter(fp, metadata={"run": 1})
+    writer.write((["a"], "not found", NOT_SET, 1))
+    assert fp.getvalue().count("\n") == 2
+    writer.write_all([(["b"], "not found", NOT_SET, 1)] * 3)
+    assert writer.count == 4
+    assert fp.getvalue().count("\n") == 5
+
+
+def test_non_string_keys():
+    fp = io.StringIO()
+    DiffWriter(fp).write(([1, ("a",)], "not found", NOT_SET, 1))
+    fp.seek(0)
+    (record,) = read_diff(fp)
+    assert record.path == (ValuePreview("int", "1"), ValuePreview("tuple", "('a',)"))
+
+
+def test_read_diff_unknown_version():
+    with pytest.raises(ValueError):
+        list(read_diff(io.StringIO('{"$pydiction_diff": 99}\n')))
+
+
+def test_compare_diffs(matcher):
+    expected = {"a": 1, "b": 2, "c": 3}
+    old, new = io.StringIO(), io.StringIO()
+    matcher.write_declarative_diff({"a": 0, "b": 0, "c": 3}, expected, old)
+    matcher.write_declarative_diff({"a": 0, "b": 2, "c": 0}, expected, new)
+    old.seek(0)
+    new.seek(0)
+
+    fixed, introduced = compare_diffs(read_diff(old), read_diff(new))
+
+    assert [record.path for record in fixed] == [("b",)]
+    assert [record.path for record in introduced] == [("c",)]
+
+
+def test_key_index_roundtrip(matcher):
+    fp = io.StringIO()
+    matcher.write_declarative_diff([{"id": "x", "v": 1}], KeyedList([{"id": "x", "v": 2}]), fp)
+    fp.seek(0)
+    (record,) = read_diff(fp)
+    assert isinstance(record.path[0], KeyIndex)
+    assert (record.path[0].name, record.path[0].value) == ("id", "x")
+    assert format_path(record.path) == "[id=x].v"
@@ -0,0 +1,167 @@
+import copy
+
+import pytest
+
+from pydiction import ANY_NOT_NONE, Contains, Matcher
+from pydiction.session import MatchSession, parse_pointer
+
+
+def full_match(actual, expected):
+    return sorted(map(repr, Matcher().match(actual, expected, [])))
+
+
+def session_errors(session):
+    return sorted(map(repr, session.errors))
+
+
+EXPECTED = {
+    "status": "done",
+    "progress": {"done": 10, "total": 10},
+    "meta": Contains({"owner": "me"}),
+    "steps": [{"name": "fetch", "ok": True}, {"name": "build", "ok": True}],
+}
+
+
+def make_actual():
+    return {
+        "status": "running",
+        "progress": {"done": 3, "total": 10},
+        "meta": {"owner": "you", "region": "eu"},
+        "steps": [{"name": "fetch", "ok": True}, {"name": "build", "ok": False}],
+    }
+
+
+class CountingMatcher(Matcher):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def iter_match(self, *args, **kwargs):
+        self.calls += 1
+        return super().iter_match(*args, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "pointer, parts",
+    (("", []), ("/a", ["a"]), ("/a/0/b", ["a", "0", "b"]), ("/a~1b/c~0d", ["a/b", "c~d"])),
+)
+def test_parse_pointer(pointer, parts):
+    assert parse_pointer(pointer) == parts
+
+
+def test_parse_pointer_invalid():
+    with pytest.raises(ValueError):
+        parse_pointer("a/b")
+
+
+def test_session_initial_errors():
+    actual = make_actual()
+    session = MatchSession(actual, EXPECTED)
+    assert session_errors(session) == full_match(actual, EXPECTED)
+
+
+@pytest.mark.parametrize(
+    "mutate, changed",
+    (
+        (lambda a: a.update(status="done"), [["status"]]),
+        (lambda a: a["progress"].update(done=10), ["/progress/done"]),
+        (lambda a: a["meta"].update(owner="me"), ["/meta"]),
+        (lambda a: a["meta"].update(owner="me"), ["/meta/owner"]),
+        (lambda a: a["meta"].pop("owner"), ["/meta/owner"]),
+        (lambda a: a.pop("status"), [["status"]]),
+        (lambda a: a.update(extra=1), [["extra"]]),
+        (lambda a: a.update(progress=5), [["progress"]]),
+        (lambda a: a["steps"][1].update(ok=True), ["/steps/1/ok"]),
+        (lambda a: a["progress"].update(done=10, total=11), ["/progress/done", "/progress/total", "/progress"]),
+    ),
+)
+def test_session_update_matches_full_rematch(mutate, changed):
+    actual = make_actual()
+    session = MatchSession(actual, EXPECTED)
+    mutate(actual)
+    session.update(changed)
+    assert session_errors(session) == full_match(actual, EXPECTED)
+
+
+def test_session_update_ordered_list():
+    actual = [{"v": 1}, {"v": 2}, {"v": 3}]
+    expected = [{"v": 1}, {"v": 2}, {"v": 3}]
+    session = MatchSession(actual, expected)
+    assert session.errors == []
+
+    actual[1]["v"] = 5
+    session.update(["/1/v"])
+    assert session_errors(session) == full_match(actual, expected)
+
+    actual.append({"v": 4})
+    session.update(["/3"])
+    assert session_errors(session) == full_match(actual, expected)
+
+    actual.pop()
+    actual[1]["v"] = 2
+    session.update(["/3", "/1"])
+    assert session.errors == []
+
+
+def test_session_update_from_patch():
+    actual = make_actual()
+    session = MatchSession(actual, EXPECTED)
+
+    actual["status"] = "done"
+    actual["steps"].insert(0, {"name": "init", "ok": True})
+    actual["progress"]["done"] = 10
+    del actual["progress"]["total"]
+    session.update_from_patch(
+        [
+            {"op": "test", "path": "/status", "value": "running"},
+            {"op": "replace", "path": "/status", "value": "done"},
+            {"op": "add", "path": "/steps/0", "value": {"name": "init", "ok": True}},
+            {"op": "replace", "path": "/progress/done", "value": 10},
+            {"op": "remove", "path": "/progress/total"},
+        ]
+    )
+    assert session_errors(session) == full_match(actual, EXPECTED)
+
+
+def test_session_update_from_patch_move():
+    actual = {"a": {"x": 1}, "b": {}}
+    expected = {"a": {}, "b": {"x": ANY_NOT_NONE}}
+    session = MatchSession(actual, expected)
+
+    actual["b"]["x"] = actual["a"].pop("x")
+    session.update_from_patch([{"op": "move", "from": "/a/x", "path": "/b/x"}])
+    assert session.errors == []
+
+
+def test_session_update_only_rematches_changed_subtree():
+    actual = {"items": [{"id": i, "v": 0} for i in range(1000)], "status": "a"}
+    expected = {"items": Contains([]), "status": "b"}
+    matcher = CountingMatcher()
+    session = MatchSession(actual, expected, matcher)
+    assert matcher.calls > 0
+
+    matcher.calls = 0
+    actual["status"] = "b"
+    session.update([["status"]])
+    assert matcher.calls == 1
+    assert session.errors == []
+
+
+def test_session_root_update():
+    actual = {"a": 1}
+    session = MatchSession(actual, {"a": 2})
+    actual["a"] = 2
+    session.update([[]])
+    assert session.errors == []
+
+
+def test_session_matches_full_rematch_after_many_updates():
+    actual = [copy.deepcopy(make_actual()) for _ in range(5)]
+    expected = [EXPECTED] * 5
+    session = MatchSession(actual, expected)
+
+    for i in range(5):
+        actual[i]["status"] = "done"
+        actual[i]["meta"]["owner"] = "me"
+        session.update([f"/{i}/status", f"/{i}/meta/owner"])
+        assert session_errors(session) == full_match(actual, expected)
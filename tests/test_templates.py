@@ -0,0 +1,121 @@
+import dataclasses
+import decimal
+import enum
+import random
+
+import pytest
+
+from pydiction import ANY_NOT_NONE, Contains, DoesntContains, Each, Matcher, OneOf
+from pydiction.templates import TemplateSet
+
+EVENT_TYPES = [f"event-{i}" for i in range(50)]
+
+
+def make_templates():
+    templates = {}
+    for i, event_type in enumerate(EVENT_TYPES):
+        templates[f"{event_type}/v1"] = {"type": event_type, "version": 1, "data": ANY_NOT_NONE}
+        templates[f"{event_type}/v2"] = {"type": event_type, "version": 2, "data": {"id": ANY_NOT_NONE}}
+        templates[f"{event_type}/any"] = Contains({"type": event_type})
+        templates[f"{event_type}/items"] = Contains({"type": event_type, "items": Each(OneOf({1, 2}))})
+    templates["ping"] = Contains({"ping": True})
+    templates["list"] = [1, 2, 3]
+    templates["not-deleted"] = Contains({"meta": DoesntContains({"deleted": True})})
+    templates["open"] = Contains({"source": {"region": "eu"}}, check_pairs=False)
+    return templates
+
+
+def make_payload(rng):
+    choice = rng.random()
+    if choice < 0.05:
+        return rng.choice([[1, 2, 3], [1, 2], "ping", None, 5])
+    payload = {"type": rng.choice(EVENT_TYPES + ["unknown"]), "version": rng.choice([1, 2, 3, True])}
+    if rng.random() < 0.8:
+        payload["data"] = rng.choice([{"id": 1}, {"id": None}, {"id": 1, "x": 2}, "raw", None])
+    if rng.random() < 0.3:
+        payload["items"] = rng.choice([[1, 2], [1, 3], {}])
+    if rng.random() < 0.1:
+        payload["ping"] = rng.choice([True, 1, "yes"])
+    if rng.random() < 0.1:
+        payload["meta"] = rng.choice([{"deleted": True}, {"deleted": False}, {}])
+    if rng.random() < 0.1:
+        payload["source"] = {"region": "us"}
+    return payload
+
+
+@pytest.fixture(scope="module")
+def templates():
+    return make_templates()
+
+
+@pytest.fixture(scope="module")
+def template_set(templates):
+    template_set = TemplateSet()
+    for name, expected in templates.items():
+        template_set.register(name, expected)
+    return template_set
+
+
+def brute_force(templates, payload):
+    matcher = Matcher()
+    return [name for name, expected in templates.items() if not matcher.match(payload, expected, [])]
+
+
+def test_template_set_matches_brute_force(templates, template_set):
+    rng = random.Random(7)
+    for _ in range(1000):
+        payload = make_payload(rng)
+        assert template_set.match(payload) == brute_force(templates, payload), payload
+
+
+def test_template_set_prefilter_narrows_candidates(template_set):
+    payload = {"type": "event-3", "version": 2, "data": {"id": 1}}
+    assert template_set.candidates(payload) == ["event-3/v2", "event-3/any", "not-deleted"]
+    assert template_set.match(payload) == ["event-3/v2", "event-3/any", "not-deleted"]
+    assert template_set.candidates({"type": "unknown"}) == ["not-deleted"]
+
+
+def test_template_set_with_diffs(template_set):
+    payload = {"type": "event-3", "version": 2, "data": {"id": 1}, "items": [3]}
+    diffs = template_set.match(payload, with_diffs=True)
+    assert diffs == {
+        "event-3/any": [],
+        "event-3/items": [(["items", "0"], "not one of", 3, frozenset({1, 2}))],
+        "not-deleted": [],
+    }
+
+
+def test_template_set_register_replaces(templates):
+    template_set = TemplateSet()
+    template_set.register("a", {"type": "a"})
+    template_set.register("b", {"type": "b"})
+    assert template_set.match({"type": "a"}) == ["a"]
+    template_set.register("a", {"type": "c"})
+    assert len(template_set) == 2 and "a" in template_set
+    assert template_set.match({"type": "c"}) == ["a"]
+    assert template_set.match({"type": "a"}) == []
+
+
+def test_template_set_does_not_filter_objects():
+    @dataclasses.dataclass
+    class Event:
+        type: str
+        data: dict
+
+    template_set = TemplateSet()
+    template_set.register("created", {"type": "created", "data": {"id": 1}})
+    template_set.register("deleted", {"type": "deleted", "data": ANY_NOT_NONE})
+    assert template_set.match(Event("created", {"id": 1})) == ["created"]
+    assert template_set.match({"type": "created", "data": Event("x", {})}) == []
+
+
+def test_template_set_objects_at_bucket_path():
+    class Kind(str, enum.Enum):
+        CREATED = "created"
+
+    template_set = TemplateSet()
+    template_set.register("created", {"type": "created", "id": ANY_NOT_NONE})
+    template_set.register("one", {"type": 1, "id": ANY_NOT_NONE})
+    assert template_set.match({"type": Kind.CREATED, "id": 7}) == ["created"]
+    assert template_set.match({"type": decimal.Decimal(1), "id": 7}) == ["one"]
+    assert template_set.candidates({"type": [], "id": 7}) == []